@@ -0,0 +1,83 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+# Project:  GDAL/OGR Test Suite
+# Purpose:  Benchmarking of gdal_calc
+#
+###############################################################################
+#
+# SPDX-License-Identifier: MIT
+###############################################################################
+
+import tracemalloc
+
+import gdaltest
+import pytest
+
+from osgeo import gdal
+
+pytest.importorskip("numpy")
+gdal_calc = gdaltest.importorskip("osgeo_utils.gdal_calc")
+
+# Must be set to run the test_XXX functions under the benchmark fixture
+pytestmark = pytest.mark.usefixtures("decorate_with_benchmark")
+
+
+@pytest.fixture()
+def source_ds_filename(tmp_vsimem):
+    filename = str(tmp_vsimem / "source.tif")
+    if "debug" in gdal.VersionInfo(""):
+        size = 1024
+    else:
+        size = 4096
+    ds = gdal.GetDriverByName("GTiff").Create(
+        filename, size, size, 2, gdal.GDT_UInt16, options=["TILED=YES"]
+    )
+    ds.GetRasterBand(1).Fill(100)
+    ds.GetRasterBand(1).SetNoDataValue(0)
+    ds.GetRasterBand(2).Fill(200)
+    ds.GetRasterBand(2).SetNoDataValue(0)
+    ds = None
+    return filename
+
+
+def _run_calc(source_ds_filename, hideNoData, num_threads):
+    return gdal_calc.Calc(
+        calc="(A.astype(float) - B) / (A.astype(float) + B)",
+        A=source_ds_filename,
+        A_band=1,
+        B=source_ds_filename,
+        B_band=2,
+        format="MEM",
+        type="Float32",
+        hideNoData=hideNoData,
+        num_threads=num_threads,
+        quiet=True,
+    )
+
+
+@pytest.fixture()
+def peak_python_memory(benchmark, source_ds_filename, hideNoData, num_threads):
+    """Record the peak of memory allocated by Python/numpy per megapixel,
+    in addition to the time measured by the benchmark fixture.
+
+    This is done by a separate run before the benchmarked rounds, so that
+    tracing allocations does not slow down the measured ones.
+    """
+
+    tracemalloc.start()
+    try:
+        ds = _run_calc(source_ds_filename, hideNoData, num_threads)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    mpixels = ds.RasterXSize * ds.RasterYSize / 1e6
+    benchmark.extra_info["peak_python_memory_per_mpixel"] = peak / mpixels
+
+
+@pytest.mark.parametrize("num_threads", [None, "ALL_CPUS"])
+@pytest.mark.parametrize("hideNoData", [True, False])
+@pytest.mark.usefixtures("peak_python_memory")
+def test_gdal_calc(source_ds_filename, hideNoData, num_threads):
+    _run_calc(source_ds_filename, hideNoData, num_threads)
@@ -0,0 +1,59 @@
+#!/usr/bin/env pytest
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+# Project:  GDAL/OGR Test Suite
+# Purpose:  Benchmarking of the conversion of feature fields to Python objects
+#
+###############################################################################
+#
+# SPDX-License-Identifier: MIT
+###############################################################################
+
+import pytest
+
+from osgeo import ogr
+
+# Must be set to run the test_XXX functions under the benchmark fixture
+pytestmark = pytest.mark.usefixtures("decorate_with_benchmark")
+
+
+@pytest.fixture(scope="module")
+def source_layer():
+    ds = ogr.GetDriverByName("MEM").CreateDataSource("")
+    lyr = ds.CreateLayer("test")
+    field_types = [ogr.OFTInteger, ogr.OFTInteger64, ogr.OFTReal, ogr.OFTString]
+    for i in range(20):
+        lyr.CreateField(ogr.FieldDefn(f"field{i}", field_types[i % 4]))
+    f = ogr.Feature(lyr.GetLayerDefn())
+    for i in range(20):
+        if i % 4 == 3:
+            f.SetField(i, f"value{i}")
+        else:
+            f.SetField(i, i)
+    for i in range(20000):
+        f.SetFID(-1)
+        lyr.CreateFeature(f)
+    yield lyr
+    ds = None
+
+
+def test_ogr_feature_getfield(source_layer):
+    for f in source_layer:
+        for i in range(f.GetFieldCount()):
+            f.GetField(i)
+
+
+def test_ogr_feature_items(source_layer):
+    for f in source_layer:
+        f.items()
+
+
+def test_ogr_feature_values(source_layer):
+    for f in source_layer:
+        f.values()
+
+
+def test_ogr_feature_as_tuple(source_layer):
+    for f in source_layer:
+        f.as_tuple()
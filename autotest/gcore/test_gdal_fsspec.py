@@ -223,3 +223,144 @@ def test_gdal_fsspec_usable_by_pyarrow_dataset(tmp_vsimem):
     assert ds.dataset(tmp_vsimem_file, filesystem=fs_vsimem) is not None
 
     assert ds.dataset(str(tmp_vsimem), filesystem=fs_vsimem) is not None
+
+
+def test_gdal_fsspec_cat_file(tmp_vsimem):
+
+    filename = str(tmp_vsimem / "test.bin")
+    data = bytes(range(256))
+    gdal.FileFromMemBuffer(filename, data)
+
+    fs = fsspec.filesystem("gdalvsi")
+    assert fs.cat_file(filename) == data
+    assert fs.cat_file("vsi://" + filename, 10, 20) == data[10:20]
+    assert fs.cat_file(filename, -10) == data[-10:]
+    assert fs.cat_file(filename, 250, 1000) == data[250:]
+    assert fs.cat_file(filename, 1000, 2000) == b""
+
+    with pytest.raises(FileNotFoundError):
+        fs.cat_file(str(tmp_vsimem / "i_do_not_exist.bin"))
+
+
+def test_gdal_fsspec_cat_ranges(tmp_vsimem):
+
+    filename1 = str(tmp_vsimem / "test1.bin")
+    data1 = bytes(range(256))
+    gdal.FileFromMemBuffer(filename1, data1)
+
+    filename2 = str(tmp_vsimem / "test2.bin")
+    data2 = bytes(range(255, -1, -1))
+    gdal.FileFromMemBuffer(filename2, data2)
+
+    non_existing = str(tmp_vsimem / "i_do_not_exist.bin")
+
+    fs = fsspec.filesystem("gdalvsi")
+    # Unsorted, overlapping and duplicated ranges
+    ret = fs.cat_ranges(
+        [filename1, filename2, filename1, filename1, non_existing, filename1],
+        [100, 0, 10, 95, 0, 10],
+        [110, 5, 20, 105, 1, 20],
+    )
+    assert ret[0:4] == [data1[100:110], data2[0:5], data1[10:20], data1[95:105]]
+    assert isinstance(ret[4], FileNotFoundError)
+    assert ret[5] == data1[10:20]
+
+    assert fs.cat_ranges([filename1, filename2], 250, None) == [
+        data1[250:],
+        data2[250:],
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        fs.cat_ranges([non_existing], [0], [1], on_error="raise")
+
+
+@pytest.fixture()
+def vsimem_tree(tmp_vsimem):
+
+    root = str(tmp_vsimem / "tree")
+    gdal.MkdirRecursive(root + "/a/b", 0o755)
+    gdal.Mkdir(root + "/empty", 0o755)
+    gdal.FileFromMemBuffer(root + "/f1.txt", "1")
+    gdal.FileFromMemBuffer(root + "/a/f2.txt", "22")
+    gdal.FileFromMemBuffer(root + "/a/b/f3.bin", "333")
+    return root
+
+
+def test_gdal_fsspec_find(vsimem_tree):
+
+    root = vsimem_tree
+    fs = fsspec.filesystem("gdalvsi")
+    assert fs.find(root) == [root + "/a/b/f3.bin", root + "/a/f2.txt", root + "/f1.txt"]
+    assert fs.find(root, maxdepth=2) == [root + "/a/f2.txt", root + "/f1.txt"]
+    assert fs.find(root, maxdepth=2, withdirs=True) == [
+        root,
+        root + "/a",
+        root + "/a/b",
+        root + "/a/f2.txt",
+        root + "/empty",
+        root + "/f1.txt",
+    ]
+    ret = fs.find(root, detail=True)
+    assert ret[root + "/a/b/f3.bin"]["size"] == 3
+    assert ret[root + "/a/b/f3.bin"]["type"] == "file"
+
+    assert fs.find(root + "/f1.txt") == [root + "/f1.txt"]
+    assert fs.find(root + "/i_do_not_exist") == []
+
+    assert fs.glob(root + "/**/*.txt") == [root + "/a/f2.txt", root + "/f1.txt"]
+
+
+def test_gdal_fsspec_walk(vsimem_tree):
+
+    root = vsimem_tree
+    fs = fsspec.filesystem("gdalvsi")
+    ret = [(path, sorted(dirs), sorted(files)) for path, dirs, files in fs.walk(root)]
+    assert ret == [
+        (root, ["a", "empty"], ["f1.txt"]),
+        (root + "/a", ["b"], ["f2.txt"]),
+        (root + "/a/b", [], ["f3.bin"]),
+        (root + "/empty", [], []),
+    ]
+
+    assert [path for path, _, _ in fs.walk(root, maxdepth=1)] == [root]
+
+    # Pruning of directories
+    ret = []
+    for path, dirs, _ in fs.walk(root):
+        ret.append(path)
+        if "a" in dirs:
+            dirs.remove("a")
+    assert ret == [root, root + "/empty"]
+
+    for path, dirs, files in fs.walk(root, detail=True):
+        if path == root:
+            assert files["f1.txt"]["size"] == 1
+            assert dirs["a"]["type"] == "directory"
+
+    assert list(fs.walk(root + "/i_do_not_exist")) == []
+    with pytest.raises(FileNotFoundError):
+        list(fs.walk(root + "/i_do_not_exist", on_error="raise"))
+
+
+def test_gdal_fsspec_listings_cache(vsimem_tree):
+
+    root = vsimem_tree
+    fs = gdal_fsspec.VSIFileSystem(use_listings_cache=True, skip_instance_cache=True)
+    assert fs.find(root) == [root + "/a/b/f3.bin", root + "/a/f2.txt", root + "/f1.txt"]
+
+    # Modification made outside of the file system object are not seen
+    gdal.FileFromMemBuffer(root + "/a/b/f4.bin", "4444")
+    assert root + "/a/b/f4.bin" not in fs.find(root)
+    assert root + "/a/b/f4.bin" not in fs.ls(root + "/a/b", detail=False)
+    assert root + "/a/b/f4.bin" in fs.find(root, refresh=True)
+
+    # Modifications through the file system object invalidate the cache
+    fs.rm(root + "/a/f2.txt")
+    assert fs.find(root) == [
+        root + "/a/b/f3.bin",
+        root + "/a/b/f4.bin",
+        root + "/f1.txt",
+    ]
+
+    fs.invalidate_cache()
+    assert len(fs.dircache) == 0
@@ -12,6 +12,7 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import io
 import os
 import sys
 import time
@@ -1939,6 +1940,131 @@ def test_vsifile_buffering(tmp_path):
         assert f.read() == b"xxghi"
 
 
+###############################################################################
+# Test VSIFile line iteration, interleaved with other operations
+
+
+def test_vsifile_iterate_lines(tmp_vsimem):
+
+    filename = tmp_vsimem / "test.txt"
+
+    long_line = b"x" * 100000
+    data = b"a\nb\r\nc\n\rd\r\re\n" + long_line + b"\r\nlast"
+    with gdal.VSIFile(filename, "wb") as f:
+        f.write(data)
+
+    with gdal.VSIFile(filename, "rb") as f:
+        assert list(f) == [b"a", b"b", b"c", b"d", b"", b"e", long_line, b"last"]
+        assert f.tell() == len(data)
+
+    with gdal.VSIFile(filename, "rb") as f:
+        assert next(f) == b"a"
+        assert f.tell() == 2
+        assert f.read(3) == b"b\r\n"
+        assert next(f) == b"c"
+        assert f.tell() == 8
+        f.seek(-3, os.SEEK_CUR)
+        assert next(f) == b"c"
+        buf = bytearray(2)
+        assert f.readinto(buf) == 2
+        assert buf == b"d\r"
+        assert f.read() == data[10:]
+        with pytest.raises(StopIteration):
+            next(f)
+
+    with gdal.VSIFile(filename, "r") as f:
+        assert next(f) == "a"
+
+    with gdal.VSIFile(filename, "rb+") as f:
+        assert next(f) == b"a"
+        f.write(b"B")
+        assert f.tell() == 3
+        f.seek(0)
+        assert f.read(4) == b"a\nB\r"
+
+
+###############################################################################
+# Test iterating over lines with bytes invalid in the encoding
+
+
+def test_vsifile_iterate_lines_invalid_encoding(tmp_vsimem):
+
+    filename = tmp_vsimem / "test.txt"
+
+    with gdal.VSIFile(filename, "wb") as f:
+        f.write(b"caf\xe9\n\xff\xfeok\n")
+
+    with gdal.VSIFile(filename, "r") as f:
+        lines = list(f)
+    assert lines == ["caf\udce9", "\udcff\udcfeok"]
+    assert lines[0].encode("utf-8", errors="surrogateescape") == b"caf\xe9"
+
+
+###############################################################################
+# Test VSIFReadMultiRangeL()
+
+
+def test_vsifile_read_multi_range(tmp_vsimem):
+
+    filename = str(tmp_vsimem / "test.bin")
+    data = bytes(range(256))
+    gdal.FileFromMemBuffer(filename, data)
+
+    f = gdal.VSIFOpenL(filename, "rb")
+    try:
+        assert gdal.VSIFReadMultiRangeL([1, 10, 200], [2, 5, 56], f) == [
+            data[1:3],
+            data[10:15],
+            data[200:256],
+        ]
+        assert gdal.VSIFReadMultiRangeL([], [], f) == []
+        # Beyond end of file
+        assert gdal.VSIFReadMultiRangeL([250], [10], f) is None
+        with pytest.raises(Exception, match="same number of elements"):
+            gdal.VSIFReadMultiRangeL([0], [1, 2], f)
+    finally:
+        gdal.VSIFCloseL(f)
+
+
+###############################################################################
+# Test VSIFile.readinto()
+
+
+def test_vsifile_readinto(tmp_vsimem):
+
+    filename = tmp_vsimem / "test.bin"
+
+    data = bytes(range(256)) * 1000
+    with gdal.VSIFile(filename, "wb") as f:
+        f.write(data)
+
+    with gdal.VSIFile(filename, "rb") as f:
+        buf = bytearray(10)
+        assert f.readinto(buf) == 10
+        assert buf == data[0:10]
+        assert f.readinto(memoryview(buf)[2:4]) == 2
+        assert buf == data[0:2] + data[10:12] + data[4:10]
+        assert f.tell() == 12
+        f.seek(-5, os.SEEK_END)
+        assert f.readinto(buf) == 5
+        assert buf[0:5] == data[-5:]
+        assert f.readinto(buf) == 0
+
+        with pytest.raises(TypeError):
+            f.readinto(b"read-only")
+
+    with gdal.VSIFile(filename, "rb") as f, io.BufferedReader(f) as reader:
+        assert reader.read(3) == data[0:3]
+        assert reader.read() == data[3:]
+
+    np = pytest.importorskip("numpy")
+
+    with gdal.VSIFile(filename, "rb") as f:
+        ar = np.zeros(1000, dtype=np.uint16)
+        assert f.readinto(ar) == 2000
+        assert ar.tobytes() == data[0:2000]
+
+
 ###############################################################################
 def test_vsifile_mkdir_recursive_huge_filename(tmp_vsimem):
 
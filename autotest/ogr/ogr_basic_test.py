@@ -769,6 +769,94 @@ def test_ogr_basic_feature_iterator():
     assert count == 10
 
 
+def test_ogr_basic_layer_iter_batches():
+
+    ds = ogr.Open("data/poly.shp")
+    lyr = ds.GetLayer(0)
+
+    expected = [
+        (f.GetFID(), *f.as_tuple(), f.GetGeometryRef().ExportToIsoWkb(ogr.wkbNDR))
+        for f in lyr
+    ]
+
+    batches = list(lyr.iter_batches(batch_size=3))
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert [row for batch in batches for row in batch] == expected
+
+    # Again, to check that reading is reset
+    assert [row for batch in lyr.iter_batches() for row in batch] == expected
+
+    rows = [
+        row
+        for batch in lyr.iter_batches(
+            fields=["PRFEDEA", "AREA"], geometry_format=None, include_fid=False
+        )
+        for row in batch
+    ]
+    assert rows == [(x[3], x[1]) for x in expected]
+
+    rows = [row for batch in lyr.iter_batches(as_dict=True) for row in batch]
+    assert rows[0] == {
+        "OGC_FID": expected[0][0],
+        "AREA": expected[0][1],
+        "EAS_ID": expected[0][2],
+        "PRFEDEA": expected[0][3],
+        "wkb_geometry": expected[0][4],
+    }
+
+    rows = [row for batch in lyr.iter_batches(geometry_format="WKT") for row in batch]
+    lyr.ResetReading()
+    assert rows[0][-1] == lyr.GetNextFeature().GetGeometryRef().ExportToIsoWkt()
+
+    rows = [row for batch in lyr.iter_batches(geometry_format="OGR") for row in batch]
+    assert isinstance(rows[0][-1], ogr.Geometry)
+    assert rows[0][-1].ExportToIsoWkb(ogr.wkbNDR) == expected[0][-1]
+    assert rows[0][-1].GetSpatialReference() is not None
+
+    lyr.SetAttributeFilter("EAS_ID = 170")
+    rows = [row for batch in lyr.iter_batches() for row in batch]
+    assert rows == [x for x in expected if x[2] == 170]
+    lyr.SetAttributeFilter(None)
+
+    with pytest.raises(KeyError):
+        list(lyr.iter_batches(fields=["non_existing"]))
+
+    with pytest.raises(ValueError):
+        list(lyr.iter_batches(batch_size=0))
+
+    with pytest.raises(ValueError):
+        list(lyr.iter_batches(geometry_format="invalid"))
+
+
+def test_ogr_basic_layer_iter_batches_no_geometry_field():
+
+    ds = ogr.GetDriverByName("MEM").CreateDataSource("")
+    lyr = ds.CreateLayer("test", geom_type=ogr.wkbNone)
+    lyr.CreateField(ogr.FieldDefn("int", ogr.OFTInteger))
+    lyr.CreateField(ogr.FieldDefn("bool", ogr.OFTInteger))
+    fld_defn = ogr.FieldDefn("bool", ogr.OFTInteger)
+    fld_defn.SetSubType(ogr.OFSTBoolean)
+    lyr.AlterFieldDefn(1, fld_defn, ogr.ALTER_SUBTYPE_FLAG)
+    for i in range(5):
+        f = ogr.Feature(lyr.GetLayerDefn())
+        if i != 2:
+            f["int"] = i
+        f["bool"] = i % 2 == 0
+        lyr.CreateFeature(f)
+
+    assert list(lyr.iter_batches(batch_size=2)) == [
+        [(0, 0, True), (1, 1, False)],
+        [(2, None, True), (3, 3, False)],
+        [(4, 4, True)],
+    ]
+    assert list(lyr.iter_batches(as_dict=True, include_fid=False)) == [
+        [{"int": i if i != 2 else None, "bool": i % 2 == 0} for i in range(5)]
+    ]
+
+    lyr = ds.CreateLayer("empty")
+    assert list(lyr.iter_batches()) == []
+
+
 def test_ogr_basic_dataset_copy_layer_dst_srswkt():
 
     ds = ogr.GetDriverByName("MEM").CreateDataSource("")
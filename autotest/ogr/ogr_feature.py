@@ -1003,3 +1003,84 @@ def test_ogr_feature_list_to_json():
     assert dst_f["field_integer64list"] == "[ 123456789012345, 2 ]"
     assert dst_f["field_reallist"] == "[ 1.5, 2.5 ]"
     assert dst_f["field_stringlist"] == '[ "a", "b" ]'
+
+
+###############################################################################
+# Test Feature.items(), values() and as_tuple()
+
+
+def test_ogr_feature_items_values_as_tuple():
+
+    src_feat = mk_src_feature()
+    defn = ogr.FeatureDefn("test")
+    src_defn = src_feat.GetDefnRef()
+    for i in range(src_defn.GetFieldCount()):
+        defn.AddFieldDefn(src_defn.GetFieldDefn(i))
+    field_def = ogr.FieldDefn("field_boolean", ogr.OFTInteger)
+    field_def.SetSubType(ogr.OFSTBoolean)
+    defn.AddFieldDefn(field_def)
+    field_def = ogr.FieldDefn("field_booleanlist", ogr.OFTIntegerList)
+    field_def.SetSubType(ogr.OFSTBoolean)
+    defn.AddFieldDefn(field_def)
+    defn.AddFieldDefn(ogr.FieldDefn("field_null", ogr.OFTString))
+    defn.AddFieldDefn(ogr.FieldDefn("field_unset", ogr.OFTString))
+
+    feat = ogr.Feature(defn)
+    feat.SetFrom(src_feat)
+    feat["field_boolean"] = True
+    feat["field_booleanlist"] = [True, False]
+    feat.SetFieldNull("field_null")
+
+    expected = [feat.GetField(i) for i in range(feat.GetFieldCount())]
+    assert expected[-4:] == [True, [True, False], None, None]
+    assert feat.values() == expected
+    assert feat.as_tuple() == tuple(expected)
+    assert feat.items() == dict(zip(feat.keys(), expected))
+    assert list(feat.items().keys()) == feat.keys()
+    assert feat.ExportToJson(as_object=True)["properties"] == feat.items()
+
+    # No fields
+    feat = ogr.Feature(ogr.FeatureDefn())
+    assert feat.values() == []
+    assert feat.as_tuple() == ()
+    assert feat.items() == {}
+
+
+def test_ogr_feature_items_layer_definition_changes():
+
+    ds = ogr.GetDriverByName("MEM").CreateDataSource("")
+    lyr = ds.CreateLayer("test")
+    lyr.CreateField(ogr.FieldDefn("a", ogr.OFTInteger))
+    lyr.CreateField(ogr.FieldDefn("b", ogr.OFTReal))
+    f = ogr.Feature(lyr.GetLayerDefn())
+    f["a"] = 1
+    f["b"] = 2.5
+    lyr.CreateFeature(f)
+
+    assert lyr.GetFeature(0).items() == {"a": 1, "b": 2.5}
+
+    lyr.AlterFieldDefn(
+        1, ogr.FieldDefn("c", ogr.OFTString), ogr.ALTER_NAME_FLAG | ogr.ALTER_TYPE_FLAG
+    )
+    assert lyr.GetFeature(0).items() == {"a": 1, "c": "2.5"}
+
+    lyr.DeleteField(0)
+    assert lyr.GetFeature(0).items() == {"c": "2.5"}
+
+    lyr.CreateField(ogr.FieldDefn("d", ogr.OFTInteger64))
+    f = lyr.GetFeature(0)
+    f["d"] = 1234567890123
+    assert f.items() == {"c": "2.5", "d": 1234567890123}
+    assert f.as_tuple() == ("2.5", 1234567890123)
+
+
+def test_ogr_feature_items_duplicated_field_names():
+
+    defn = ogr.FeatureDefn()
+    defn.AddFieldDefn(ogr.FieldDefn("a", ogr.OFTInteger))
+    defn.AddFieldDefn(ogr.FieldDefn("a", ogr.OFTString))
+    feat = ogr.Feature(defn)
+    feat.SetField(0, 1)
+    feat.SetField(1, "x")
+    assert feat.items() == {"a": 1}
+    assert feat.as_tuple() == (1, "x")
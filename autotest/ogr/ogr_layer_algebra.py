@@ -593,3 +593,111 @@ def test_algebra_erase_5(A, empty, C):
     assert C.GetFeatureCount() == A.GetFeatureCount(), (
         "Layer.Erase returned " + str(C.GetFeatureCount()) + " features"
     )
+
+
+###############################################################################
+# Test NUM_THREADS option
+
+
+@pytest.mark.parametrize("method", ["Intersection", "Clip", "Erase"])
+@pytest.mark.parametrize("options", [[], ["PROMOTE_TO_MULTI=YES"]])
+def test_algebra_NUM_THREADS(mem_ds, method, options):
+
+    A = mem_ds.CreateLayer("A")
+    A.CreateField(ogr.FieldDefn("A", ogr.OFTInteger))
+    for i in range(1000):
+        x = (i % 40) * 1.5
+        y = (i // 40) * 1.5
+        feat = ogr.Feature(A.GetLayerDefn())
+        feat.SetField("A", i)
+        if i % 97 != 0:
+            feat.SetGeometryDirectly(
+                ogr.Geometry(
+                    wkt=f"POLYGON(({x} {y},{x} {y + 2},{x + 2} {y + 2},{x + 2} {y},{x} {y}))"
+                )
+            )
+        A.CreateFeature(feat)
+
+    B = mem_ds.CreateLayer("B")
+    B.CreateField(ogr.FieldDefn("B", ogr.OFTInteger))
+    for i in range(50):
+        x = (i % 7) * 8.3
+        y = (i // 7) * 5.1
+        feat = ogr.Feature(B.GetLayerDefn())
+        feat.SetField("B", i)
+        feat.SetGeometryDirectly(ogr.Geometry(wkt=f"POINT({x} {y})").Buffer(3))
+        B.CreateFeature(feat)
+
+    C_serial = mem_ds.CreateLayer("C_serial")
+    C_threads = mem_ds.CreateLayer("C_threads")
+    assert getattr(A, method)(B, C_serial, options=options) == ogr.OGRERR_NONE
+    assert (
+        getattr(A, method)(B, C_threads, options=options + ["NUM_THREADS=4"])
+        == ogr.OGRERR_NONE
+    )
+    assert C_threads.GetFeatureCount() == C_serial.GetFeatureCount()
+    assert C_serial.GetFeatureCount() > 0
+    assert is_same(C_serial, C_threads)
+
+    # With a spatial filter on the method layer
+    B.SetSpatialFilterRect(10, 10, 40, 20)
+    C_serial = mem_ds.CreateLayer("C_serial_filter")
+    C_threads = mem_ds.CreateLayer("C_threads_filter")
+    assert getattr(A, method)(B, C_serial, options=options) == ogr.OGRERR_NONE
+    assert (
+        getattr(A, method)(B, C_threads, options=options + ["NUM_THREADS=4"])
+        == ogr.OGRERR_NONE
+    )
+    assert is_same(C_serial, C_threads)
+
+
+###############################################################################
+# Test NUM_THREADS option with a user-defined result schema, where method
+# fields must be converted to string
+
+
+def test_algebra_NUM_THREADS_result_field_conversion(mem_ds):
+
+    A = mem_ds.CreateLayer("A")
+    A.CreateField(ogr.FieldDefn("A", ogr.OFTInteger))
+    for i in range(1000):
+        x = (i % 40) * 0.5
+        y = (i // 40) * 0.5
+        feat = ogr.Feature(A.GetLayerDefn())
+        feat.SetField("A", i)
+        feat.SetGeometryDirectly(
+            ogr.Geometry(
+                wkt=f"POLYGON(({x} {y},{x} {y + 2},{x + 2} {y + 2},{x + 2} {y},{x} {y}))"
+            )
+        )
+        A.CreateFeature(feat)
+
+    B = mem_ds.CreateLayer("B")
+    B.CreateField(ogr.FieldDefn("date", ogr.OFTDate))
+    B.CreateField(ogr.FieldDefn("list", ogr.OFTIntegerList))
+    for i in range(4):
+        feat = ogr.Feature(B.GetLayerDefn())
+        feat.SetField("date", f"2024/01/{i + 10}")
+        feat.SetFieldIntegerList(1, [i, i + 1])
+        x = (i % 2) * 10 + 5
+        y = (i // 2) * 10 + 5
+        feat.SetGeometryDirectly(ogr.Geometry(wkt=f"POINT({x} {y})").Buffer(6))
+        B.CreateFeature(feat)
+
+    results = []
+    for options in ([], ["NUM_THREADS=4"]):
+        C = mem_ds.CreateLayer("C" + str(len(results)))
+        C.CreateField(ogr.FieldDefn("A", ogr.OFTInteger))
+        C.CreateField(ogr.FieldDefn("date", ogr.OFTString))
+        C.CreateField(ogr.FieldDefn("list", ogr.OFTString))
+        assert A.Intersection(B, C, options=options) == ogr.OGRERR_NONE
+        results.append(C)
+
+    C_serial, C_threads = results
+    assert C_serial.GetFeatureCount() > 1000
+    assert is_same(C_serial, C_threads)
+    C_threads.ResetReading()
+    for f in C_threads:
+        assert f["date"] in [f"2024/01/{i + 10}" for i in range(4)]
+        i = int(f["date"][-2:]) - 10
+        assert f["list"] == f"(2:{i},{i + 1})"
@@ -16,6 +16,7 @@ import glob
 import os
 import os.path
 import shutil
+import sqlite3
 import struct
 import sys
 
@@ -361,6 +362,382 @@ def test_handle_utf8_filename(script_path, tmp_path):
     assert "<title>test_utf8_漢字.vrt</title>" in openlayers_html
 
 
+def _get_tiles_checksums(tiles_dir):
+    checksums = {}
+    for filename in glob.glob(f"{tiles_dir}/*/*/*.png"):
+        ds = gdal.Open(filename)
+        checksums[os.path.relpath(filename, tiles_dir)] = [
+            ds.GetRasterBand(i + 1).Checksum() for i in range(ds.RasterCount)
+        ]
+    return checksums
+
+
+@pytest.mark.require_driver("PNG")
+def test_gdal2tiles_py_legacy_processes_and_resume(script_path, tmp_path):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_dir = str(tmp_path / "out")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy -z 0-3 {input_tif} {ref_dir}",
+    )
+    ref_checksums = _get_tiles_checksums(ref_dir)
+    assert len(ref_checksums) == 1 + 4 + 16 + 64
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --processes=2 -z 0-3 {input_tif} {out_dir}",
+    )
+    assert _get_tiles_checksums(out_dir) == ref_checksums
+
+    # Missing base and overview tiles must be generated again, and the
+    # overview tiles built from the existing tiles
+    for filename in ("3/2/5.png", "3/3/5.png", "2/1/2.png", "0/0/0.png"):
+        os.unlink(os.path.join(out_dir, filename))
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --resume --processes=2 -z 0-3 {input_tif} {out_dir}",
+    )
+    assert _get_tiles_checksums(out_dir) == ref_checksums
+
+
+@pytest.mark.require_driver("PNG")
+def test_gdal2tiles_py_legacy_manifest(script_path, tmp_path):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_dir = str(tmp_path / "out")
+    manifest = str(tmp_path / "manifest.bin")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy -z 0-3 {input_tif} {ref_dir}",
+    )
+    ref_checksums = _get_tiles_checksums(ref_dir)
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --processes=2 --manifest={manifest} -z 0-3 {input_tif} {out_dir}",
+    )
+    assert _get_tiles_checksums(out_dir) == ref_checksums
+
+    # With a manifest, --resume does not check the existence of the tiles
+    for filename in ("3/2/5.png", "3/5/5.png"):
+        os.unlink(os.path.join(out_dir, filename))
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --resume --manifest={manifest} -z 0-3 {input_tif} {out_dir}",
+    )
+    checksums = _get_tiles_checksums(out_dir)
+    assert "3/2/5.png" not in checksums
+    assert "3/5/5.png" not in checksums
+
+    # Only the tiles intersecting the changed extent, and their ancestors,
+    # are generated again
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --resume --manifest={manifest} --changed-extent -80 45 -60 60 "
+        f"--processes=2 -z 0-3 {input_tif} {out_dir}",
+    )
+    checksums = _get_tiles_checksums(out_dir)
+    assert "3/5/5.png" not in checksums
+    del ref_checksums["3/5/5.png"]
+    assert checksums == ref_checksums
+
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --changed-extent -80 45 -60 60 -z 0-3 {input_tif} {out_dir}",
+        return_stderr=True,
+    )
+    assert "--changed-extent requires --resume and --manifest" in err
+
+
+@pytest.mark.require_driver("PNG")
+def test_gdal2tiles_py_legacy_manifest_changed_extent_world_edge(script_path, tmp_path):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_dir = str(tmp_path / "out")
+    manifest = str(tmp_path / "manifest.bin")
+    options = "-q --legacy -p geodetic --tmscompatible -z 0-2"
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"{options} {input_tif} {ref_dir}",
+    )
+    ref_checksums = _get_tiles_checksums(ref_dir)
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"{options} --manifest={manifest} {input_tif} {out_dir}",
+    )
+    for filename in ("2/0/3.png", "2/7/3.png"):
+        os.unlink(os.path.join(out_dir, filename))
+
+    # An extent beyond the world edge does not intersect any tile
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "gdal2tiles",
+        f"{options} --resume --manifest={manifest} --changed-extent -250 45 -200 60 "
+        f"{input_tif} {out_dir}",
+        return_stderr=True,
+    )
+    assert "ERROR ret code" not in err, err
+    checksums = _get_tiles_checksums(out_dir)
+    assert "2/0/3.png" not in checksums
+    assert "2/7/3.png" not in checksums
+
+    # An extent crossing the world edge is clamped to the tiles of the grid
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "gdal2tiles",
+        f"{options} --resume --manifest={manifest} --changed-extent -200 45 -60 60 "
+        f"{input_tif} {out_dir}",
+        return_stderr=True,
+    )
+    assert "ERROR ret code" not in err, err
+    checksums = _get_tiles_checksums(out_dir)
+    del ref_checksums["2/7/3.png"]
+    assert checksums == ref_checksums
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize("processes", [1, 2])
+def test_gdal2tiles_py_legacy_metatile(script_path, tmp_path, processes):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_dir = str(tmp_path / "out")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy -z 0-3 {input_tif} {ref_dir}",
+    )
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --metatile=4 --processes={processes} -z 0-3 {input_tif} {out_dir}",
+    )
+
+    ref_tiles = sorted(
+        os.path.relpath(filename, ref_dir)
+        for filename in glob.glob(f"{ref_dir}/*/*/*.png")
+    )
+    out_tiles = sorted(
+        os.path.relpath(filename, out_dir)
+        for filename in glob.glob(f"{out_dir}/*/*/*.png")
+    )
+    assert out_tiles == ref_tiles
+
+    # Tiles are sliced from a single read of their metatile, so pixels near
+    # their edges may slightly differ from the ones of tiles read one by one.
+    for tile in ref_tiles:
+        with gdal.Open(os.path.join(ref_dir, tile)) as ref_ds, gdal.Open(
+            os.path.join(out_dir, tile)
+        ) as out_ds:
+            assert out_ds.RasterCount == ref_ds.RasterCount
+            for i in range(ref_ds.RasterCount):
+                ref_mean = ref_ds.GetRasterBand(i + 1).ComputeStatistics(False)[2]
+                out_mean = out_ds.GetRasterBand(i + 1).ComputeStatistics(False)[2]
+                assert out_mean == pytest.approx(ref_mean, abs=2), (tile, i)
+
+
+def test_gdal2tiles_py_legacy_metatile_errors(script_path, tmp_path):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --metatile=3 {input_tif} {tmp_path}/out",
+        return_stderr=True,
+    )
+    assert "--metatile should be a power of two" in err
+
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --metatile=2 -p raster {input_tif} {tmp_path}/out",
+        return_stderr=True,
+    )
+    assert "--metatile is not supported with the raster profile" in err
+
+
+def _get_mbtiles_checksums(filename):
+    checksums = {}
+    with sqlite3.connect(filename) as conn:
+        for tz, tx, ty, data in conn.execute("SELECT * FROM tiles"):
+            gdal.FileFromMemBuffer("/vsimem/tile.png", bytes(data))
+            ds = gdal.Open("/vsimem/tile.png")
+            checksums[os.path.join(str(tz), str(tx), "%d.png" % ty)] = [
+                ds.GetRasterBand(i + 1).Checksum() for i in range(ds.RasterCount)
+            ]
+            ds = None
+            gdal.Unlink("/vsimem/tile.png")
+    return checksums
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize("processes", [1, 2])
+def test_gdal2tiles_py_legacy_mbtiles(script_path, tmp_path, processes):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    ref_dir = str(tmp_path / "ref")
+    out_filename = str(tmp_path / "out.mbtiles")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy -z 0-2 {input_tif} {ref_dir}",
+    )
+    ref_checksums = _get_tiles_checksums(ref_dir)
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --processes={processes} -z 0-2 {input_tif} {out_filename}",
+    )
+    assert _get_mbtiles_checksums(out_filename) == ref_checksums
+    assert not os.path.exists(str(tmp_path / "out.mbtiles.aux.xml"))
+
+    with sqlite3.connect(out_filename) as conn:
+        metadata = dict(conn.execute("SELECT name, value FROM metadata"))
+        assert metadata["format"] == "png"
+        assert metadata["minzoom"] == "0"
+        assert metadata["maxzoom"] == "2"
+        conn.execute(
+            "DELETE FROM tiles WHERE (zoom_level = 2 AND tile_column = 1) "
+            "OR zoom_level = 0"
+        )
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --resume --processes={processes} -z 0-2 {input_tif} {out_filename}",
+    )
+    assert _get_mbtiles_checksums(out_filename) == ref_checksums
+
+    if gdal.GetDriverByName("MBTiles") is not None:
+        with gdal.Open(out_filename) as ds:
+            assert ds.RasterXSize == 1024
+
+
+@pytest.mark.require_driver("PNG")
+def test_gdal2tiles_py_legacy_pmtiles(script_path, tmp_path):
+
+    input_tif = test_py_scripts.get_data_path("gdrivers") + "small_world.tif"
+    out_filename = str(tmp_path / "out.pmtiles")
+
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --processes=2 -z 0-2 {input_tif} {out_filename}",
+    )
+
+    with open(out_filename, "rb") as f:
+        header = struct.unpack("<7sB11Q6B4iB2i", f.read(127))
+    assert header[0:2] == (b"PMTiles", 3)
+    # Number of addressed tiles, tile entries and tile contents
+    assert header[10:13] == (1 + 4 + 16,) * 3
+    # Tile type (PNG), min and max zoom levels
+    assert header[16:19] == (2, 0, 2)
+    # Tile data section ends at the metadata one
+    assert header[8] + header[9] == header[4]
+    assert header[6] + header[7] == os.path.getsize(out_filename)
+
+
+@pytest.mark.require_driver("PNG")
+def test_gdal2tiles_py_legacy_split_pyramid(script_path, tmp_path):
+
+    # Small raster tiled over more zoom levels than the maximum depth of the
+    # subtrees (8, or 4 when writing to a tile container), so that the overview
+    # tiles above the split level are generated from the subtree roots
+    input_tif = str(tmp_path / "small.tif")
+    ds = gdal.GetDriverByName("GTiff").Create(input_tif, 256, 256, 3)
+    ds.SetGeoTransform([2.0, 0.6 / 256, 0, 49.2, 0, -0.6 / 256])
+    ds.SetProjection(osr.SRS_WKT_WGS84_LAT_LONG)
+    for i in range(3):
+        ds.GetRasterBand(i + 1).WriteRaster(
+            0, 0, 256, 256, bytes((x * (i + 1)) % 256 for x in range(256)) * 256
+        )
+    ds = None
+
+    checksums = {}
+    for processes in (1, 2):
+        out_dir = str(tmp_path / f"out_{processes}")
+        test_py_scripts.run_py_script_as_external_script(
+            script_path,
+            "gdal2tiles",
+            f"-q --legacy --processes={processes} -z 0-10 {input_tif} {out_dir}",
+        )
+        checksums[processes] = _get_tiles_checksums(out_dir)
+
+    assert set(int(key.split(os.sep)[0]) for key in checksums[1]) == set(range(11))
+    assert checksums[2] == checksums[1]
+
+    out_filename = str(tmp_path / "out.mbtiles")
+    test_py_scripts.run_py_script_as_external_script(
+        script_path,
+        "gdal2tiles",
+        f"-q --legacy --processes=2 -z 0-10 {input_tif} {out_filename}",
+    )
+    assert _get_mbtiles_checksums(out_filename) == checksums[1]
+
+
+@pytest.mark.require_driver("PNG")
+@pytest.mark.parametrize("exclude", [True, False])
+def test_gdal2tiles_py_legacy_sparse_input(script_path, tmp_path, exclude):
+
+    # Sparse input, with data only in its top-left block
+    sparse_filename = str(tmp_path / "sparse.tif")
+    ds = gdal.GetDriverByName("GTiff").Create(
+        sparse_filename,
+        2048,
+        2048,
+        options=["SPARSE_OK=YES", "TILED=YES"],
+    )
+    ds.SetGeoTransform([-10, 10.0 / 1024, 0, 10, 0, -10.0 / 1024])
+    ds.SetProjection(osr.SRS_WKT_WGS84_LAT_LONG)
+    ds.GetRasterBand(1).SetNoDataValue(0)
+    ds.GetRasterBand(1).WriteRaster(0, 0, 256, 256, b"\xff" * (256 * 256))
+    ds = None
+
+    # Same content, without sparse blocks
+    dense_filename = str(tmp_path / "dense.tif")
+    gdal.Translate(dense_filename, sparse_filename, creationOptions=["TILED=YES"])
+
+    for filename in (sparse_filename, dense_filename):
+        test_py_scripts.run_py_script_as_external_script(
+            script_path,
+            "gdal2tiles",
+            "-q --legacy -z 2-6 -w none "
+            + ("-x " if exclude else "")
+            + filename
+            + " "
+            + str(tmp_path / os.path.basename(filename)[:-4]),
+        )
+
+    sparse_tiles = _get_tiles_checksums(str(tmp_path / "sparse"))
+    dense_tiles = _get_tiles_checksums(str(tmp_path / "dense"))
+    assert sparse_tiles
+    assert sparse_tiles == dense_tiles
+
+
 @pytest.mark.require_driver("PNG")
 def test_exclude_transparent_tiles(script_path, tmp_path):
 
@@ -27,7 +27,7 @@ from itertools import product
 
 import numpy as np
 
-from osgeo import gdal
+from osgeo import gdal, ogr
 from osgeo.gdal_array import flip_code
 from osgeo_utils import gdal2xyz
 from osgeo_utils.auxiliary.raster_creation import create_flat_raster
@@ -198,3 +198,138 @@ def test_gdal2xyz_py_vsistdout(script_path, tmp_path):
     with gdal.Open(out_filename) as ds:
         assert ds.GetGeoTransform() == (440720.0, 60.0, 0.0, 3751320.0, 0.0, -60.0)
         assert ds.GetRasterBand(1).Checksum() == 4672
+
+
+###############################################################################
+# Test that the output doesn't depend on the number of lines read at once
+
+
+@pytest.mark.parametrize("skip", [1, (2, 3)])
+def test_gdal2xyz_py_chunks(tmp_vsimem, skip):
+
+    src_ds = gdal.Open(test_py_scripts.get_data_path("gcore") + "rgbsmall.tif")
+    bands = [src_ds.GetRasterBand(i + 1) for i in range(src_ds.RasterCount)]
+    gt = src_ds.GetGeoTransform()
+    srcwin = (1, 2, src_ds.RasterXSize - 1, src_ds.RasterYSize - 2)
+    x_skip, y_skip = skip if isinstance(skip, tuple) else (skip, skip)
+    src_nodata = np.array([0, 0, 0], dtype=np.uint8)
+
+    chunks = list(
+        gdal2xyz.iter_xyz_chunks(
+            bands,
+            gt,
+            srcwin,
+            x_skip=x_skip,
+            y_skip=y_skip,
+            np_dt=np.uint8,
+            src_nodata=src_nodata,
+            max_chunk_points=50,
+        )
+    )
+    assert len(chunks) > 1
+    assert chunks[-1][0] == 1.0
+    geo_x = np.concatenate([chunk[1] for chunk in chunks])
+    geo_y = np.concatenate([chunk[2] for chunk in chunks])
+    data = np.concatenate([chunk[3] for chunk in chunks], axis=1)
+
+    ref_geo_x, ref_geo_y, ref_data, _ = gdal2xyz.gdal2xyz(
+        src_ds,
+        None,
+        srcwin=srcwin,
+        skip=skip,
+        band_nums=None,
+        skip_nodata=True,
+        src_nodata=0,
+        return_np_arrays=True,
+        progress_callback=None,
+    )
+    np.testing.assert_array_equal(geo_x, ref_geo_x)
+    np.testing.assert_array_equal(geo_y, ref_geo_y)
+    np.testing.assert_array_equal(data, ref_data)
+    assert not np.any(np.all(data == 0, axis=0))
+
+    # check consistency with the text output
+    out_filename = str(tmp_vsimem / "out.xyz")
+    gdal2xyz.gdal2xyz(
+        src_ds,
+        out_filename,
+        srcwin=srcwin,
+        skip=skip,
+        band_nums=None,
+        skip_nodata=True,
+        src_nodata=0,
+        progress_callback=None,
+    )
+    with gdal.VSIFile(out_filename, "rb") as f:
+        lines = f.read().decode("UTF-8").splitlines()
+    assert len(lines) == len(geo_x)
+    values = lines[-1].split(" ")
+    assert float(values[0]) == pytest.approx(geo_x[-1], abs=1e-3)
+    assert float(values[1]) == pytest.approx(geo_y[-1], abs=1e-3)
+    assert [int(v) for v in values[2:]] == data[:, -1].tolist()
+
+
+###############################################################################
+# Test .npy output
+
+
+def test_gdal2xyz_py_npy(script_path, tmp_path):
+
+    out_npy = str(tmp_path / "out.npy")
+
+    arguments = "-allbands -skipnodata -srcnodata 0 0 0"
+    arguments += " " + test_py_scripts.get_data_path("gcore") + "rgbsmall.tif "
+    arguments += out_npy
+
+    test_py_scripts.run_py_script(script_path, "gdal2xyz", arguments)
+
+    arr = np.load(out_npy, mmap_mode="r")
+    assert arr.dtype.names == ("x", "y", "band_1", "band_2", "band_3")
+
+    geo_x, geo_y, data, _ = gdal2xyz.gdal2xyz(
+        test_py_scripts.get_data_path("gcore") + "rgbsmall.tif",
+        None,
+        band_nums=None,
+        skip_nodata=True,
+        src_nodata=0,
+        return_np_arrays=True,
+        progress_callback=None,
+    )
+    assert arr.shape == (len(geo_x),)
+    np.testing.assert_array_equal(arr["x"], geo_x)
+    np.testing.assert_array_equal(arr["y"], geo_y)
+    for i in range(3):
+        np.testing.assert_array_equal(arr[f"band_{i + 1}"], data[i])
+
+
+###############################################################################
+# Test Parquet output
+
+
+@pytest.mark.require_driver("Parquet")
+def test_gdal2xyz_py_parquet(tmp_vsimem):
+
+    pytest.importorskip("pyarrow")
+
+    out_filename = str(tmp_vsimem / "out.parquet")
+    src_filename = test_py_scripts.get_data_path("gcore") + "byte.tif"
+
+    gdal2xyz.gdal2xyz(
+        src_filename,
+        out_filename,
+        layer_creation_options=["COMPRESSION=NONE"],
+        progress_callback=None,
+    )
+
+    geo_x, geo_y, data, _ = gdal2xyz.gdal2xyz(
+        src_filename, None, return_np_arrays=True, progress_callback=None
+    )
+
+    with ogr.Open(out_filename) as ds:
+        lyr = ds.GetLayer(0)
+        assert lyr.GetGeomType() == ogr.wkbNone
+        assert lyr.GetFeatureCount() == len(geo_x)
+        f = lyr.GetNextFeature()
+        assert f["x"] == geo_x[0]
+        assert f["y"] == geo_y[0]
+        assert f["band_1"] == data[0][0]
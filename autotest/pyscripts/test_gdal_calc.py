@@ -844,3 +844,247 @@ def test_gdal_calc_py_hidenodata(tmp_vsimem):
     out_arr = out_ds.GetRasterBand(1).ReadAsMaskedArray()
     assert not np.any(out_arr.mask)
     np.testing.assert_array_equal(out_arr, data + 1)
+
+
+@pytest.mark.parametrize("num_threads", [2, "ALL_CPUS"])
+def test_gdal_calc_py_threads(tmp_vsimem, num_threads):
+    """test num_threads option"""
+
+    input1 = tmp_vsimem / "in1.tif"
+    input2 = tmp_vsimem / "in2.tif"
+    data = np.arange(100 * 50, dtype=np.int16).reshape(50, 100) % 97
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input1, 100, 50, 1, gdal.GDT_Int16, options=["BLOCKYSIZE=4"]
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data)
+        ds.GetRasterBand(1).SetNoDataValue(5)
+
+    with gdal.GetDriverByName("GTiff").Create(input2, 100, 50, 1, gdal.GDT_Int16) as ds:
+        ds.GetRasterBand(1).WriteArray(data[::-1])
+
+    # mix a filename, a Dataset object and a list of files
+    with gdal.Open(input2) as ds_in2:
+        out_ds = gdal_calc.Calc(
+            calc="A + B + sum(C, axis=0)",
+            A=input1,
+            B=ds_in2,
+            C=[input1, input2],
+            format="MEM",
+            NoDataValue=-1,
+            type="Int32",
+            num_threads=num_threads,
+            quiet=True,
+        )
+
+    expected = data.astype(np.int32) + data[::-1] + data + data[::-1]
+    expected[data == 5] = -1
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), expected)
+
+
+def test_gdal_calc_py_threads_error(tmp_vsimem):
+    """test that an evaluation error in a worker thread is propagated"""
+
+    input = tmp_vsimem / "in.tif"
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input, 10, 10, 1, options=["BLOCKYSIZE=1"]
+    ) as ds:
+        ds.GetRasterBand(1).Fill(1)
+
+    with pytest.raises(NameError):
+        gdal_calc.Calc(
+            calc="A + undefined_name",
+            A=input,
+            format="MEM",
+            num_threads=2,
+            quiet=True,
+        )
+
+
+def test_gdal_calc_py_nodata_propagation(tmp_vsimem):
+    """test nodata propagation into results of various types"""
+
+    input = tmp_vsimem / "in.tif"
+    data = np.arange(9, dtype=np.int16).reshape(3, 3)
+
+    with gdal.GetDriverByName("GTiff").Create(input, 3, 3, 1, gdal.GDT_Int16) as ds:
+        ds.GetRasterBand(1).WriteArray(data)
+        ds.GetRasterBand(1).SetNoDataValue(4)
+
+    # output nodata value not representable in the type of the result
+    out_ds = gdal_calc.Calc(A=input, calc="A", format="MEM", type="UInt16", quiet=True)
+    expected = data.astype(np.uint16)
+    expected[1, 1] = 65535
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), expected)
+
+    # scalar result
+    out_ds = gdal_calc.Calc(
+        A=input, calc="7", format="MEM", NoDataValue=-1, type="Int16", quiet=True
+    )
+    expected = np.full((3, 3), 7)
+    expected[1, 1] = -1
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), expected)
+
+    # result returned from the user namespace must not be modified
+    user_array = np.ones((3, 3))
+    out_ds = gdal_calc.Calc(
+        A=input,
+        calc="user_array",
+        format="MEM",
+        NoDataValue=-1,
+        type="Float64",
+        user_namespace={"user_array": user_array},
+        quiet=True,
+    )
+    expected = np.ones((3, 3))
+    expected[1, 1] = -1
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), expected)
+    np.testing.assert_array_equal(user_array, np.ones((3, 3)))
+
+
+def test_gdal_calc_py_syntax_error(tmp_vsimem):
+    """test that the calculation is parsed before creating the output"""
+
+    input = tmp_vsimem / "in.tif"
+    out = tmp_vsimem / "out.tif"
+
+    with gdal.GetDriverByName("GTiff").Create(input, 3, 3, 1) as ds:
+        ds.GetRasterBand(1).Fill(1)
+
+    with pytest.raises(SyntaxError):
+        gdal_calc.Calc(A=input, calc="A +", outfile=out, quiet=True)
+    assert gdal.VSIStatL(out) is None
+
+
+def test_gdal_calc_py_get_processing_window_size():
+
+    # full-width windows, aligned on all the block grids
+    assert gdal_calc.get_processing_window_size(
+        [(256, 256), (512, 512)], (40000, 40000), 64 * 1024 * 1024
+    ) == (40000, 1536)
+    # strips
+    assert gdal_calc.get_processing_window_size([(100, 1)], (100, 50), 1000) == (
+        100,
+        10,
+    )
+    assert gdal_calc.get_processing_window_size([(100, 1)], (100, 50), 10**9) == (
+        100,
+        50,
+    )
+    # partial rows of blocks
+    assert gdal_calc.get_processing_window_size(
+        [(256, 256)], (40000, 40000), 256 * 256 * 3
+    ) == (768, 256)
+    # at least one block
+    assert gdal_calc.get_processing_window_size([(256, 256)], (40000, 40000), 10) == (
+        256,
+        256,
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"window_size": (7, 3)},
+        {"max_memory": 0.01},
+        {"max_memory": 0.01, "num_threads": 2},
+    ],
+)
+def test_gdal_calc_py_window_size(tmp_vsimem, options):
+    """test window_size and max_memory options"""
+
+    input = tmp_vsimem / "in.tif"
+    data = np.arange(100 * 50, dtype=np.int16).reshape(50, 100) % 97
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input, 100, 50, 1, gdal.GDT_Int16, options=["BLOCKYSIZE=1"]
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data)
+        ds.GetRasterBand(1).SetNoDataValue(5)
+
+    out_ds = gdal_calc.Calc(
+        calc="A * 2",
+        A=input,
+        format="MEM",
+        NoDataValue=-1,
+        quiet=True,
+        **options,
+    )
+
+    expected = data * 2
+    expected[data == 5] = -1
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), expected)
+
+
+def test_gdal_calc_py_lazy(tmp_vsimem):
+    """test lazy option"""
+
+    input1 = tmp_vsimem / "in1.tif"
+    input2 = tmp_vsimem / "in2.tif"
+    data = np.arange(20 * 10, dtype=np.float32).reshape(10, 20)
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input1, 20, 10, 1, gdal.GDT_Float32
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data)
+        ds.GetRasterBand(1).SetNoDataValue(5)
+        ds.SetGeoTransform((2, 1, 0, 49, 0, -1))
+
+    with gdal.GetDriverByName("GTiff").Create(
+        input2, 20, 10, 1, gdal.GDT_Float32
+    ) as ds:
+        ds.GetRasterBand(1).WriteArray(data * 2)
+        ds.GetRasterBand(1).SetNoDataValue(5)
+        ds.SetGeoTransform((2, 1, 0, 49, 0, -1))
+
+    out_ds = gdal_calc.Calc(
+        calc=["where(A > 100, A + B, B)", "maximum(A, B) * 2"],
+        A=input1,
+        B=input2,
+        NoDataValue=-1,
+        lazy=True,
+    )
+    assert out_ds.GetDriver().ShortName == "VRT"
+    assert out_ds.RasterCount == 2
+    assert out_ds.GetGeoTransform() == (2, 1, 0, 49, 0, -1)
+
+    expected = np.where(data > 100, data + data * 2, data * 2)
+    expected[data == 5] = -1
+    assert out_ds.GetRasterBand(1).GetNoDataValue() == -1
+    np.testing.assert_array_equal(out_ds.GetRasterBand(1).ReadAsArray(), expected)
+
+    expected = np.maximum(data, data * 2) * 2
+    expected[data == 5] = -1
+    np.testing.assert_array_equal(out_ds.GetRasterBand(2).ReadAsArray(), expected)
+
+    # only the requested window is computed
+    np.testing.assert_array_equal(
+        out_ds.GetRasterBand(2).ReadAsArray(10, 5, 2, 2), expected[5:7, 10:12]
+    )
+
+    # hideNoData
+    out_ds = gdal_calc.Calc(
+        calc="A + B", A=input1, B=input2, hideNoData=True, lazy=True
+    )
+    assert out_ds.GetRasterBand(1).GetNoDataValue() is None
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), data + data * 2)
+
+    # output type
+    out_ds = gdal_calc.Calc(calc="A", A=input2, type="Int16", lazy=True)
+    assert out_ds.GetRasterBand(1).DataType == gdal.GDT_Int16
+    np.testing.assert_array_equal(out_ds.ReadAsArray(), data * 2)
+
+
+def test_gdal_calc_py_lazy_errors(tmp_vsimem):
+
+    input = tmp_vsimem / "in.tif"
+
+    with gdal.GetDriverByName("GTiff").Create(input, 3, 3, 1) as ds:
+        ds.GetRasterBand(1).Fill(1)
+
+    with pytest.raises(Exception, match="lazy mode"):
+        gdal_calc.Calc(calc="A", A=input, outfile=tmp_vsimem / "out.tif", lazy=True)
+
+    with pytest.raises(Exception, match="does not evaluate to a band"):
+        gdal_calc.Calc(calc="1", A=input, lazy=True)
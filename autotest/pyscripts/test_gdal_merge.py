@@ -12,6 +12,7 @@
 ###############################################################################
 
 
+import json
 import os
 
 import gdaltest
@@ -260,3 +261,101 @@ def test_gdal_merge_5(script_path, tmp_path):
         assert ds.GetRasterBand(2).Checksum() == cs, "Wrong checksum"
         assert ds.GetRasterBand(3).Checksum() == 0, "Wrong checksum"
         assert ds.GetRasterBand(4).Checksum() == cs, "Wrong checksum"
+
+
+###############################################################################
+# Test that processing by chunks, possibly in several threads, gives the same
+# result as the default mode
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        "",
+        "-separate",
+        "-n 63",
+        "-init 10 -ps 0.05 0.2",
+        "-ul_lr 2.55 48.75 3.45 47.65",
+    ],
+)
+@pytest.mark.parametrize("chunk_options", ["-chunk_size 8", "-threads 2 -chunk_size 4"])
+def test_gdal_merge_chunks(script_path, tmp_path, sample_tifs, options, chunk_options):
+
+    ref_tif = str(tmp_path / "ref.tif")
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"-q {options} -o {ref_tif} {' '.join(sample_tifs)}",
+    )
+
+    output_tif = str(tmp_path / "out.tif")
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"-q {options} {chunk_options} -co BLOCKYSIZE=4 -o {output_tif} {' '.join(sample_tifs)}",
+    )
+
+    with gdal.Open(ref_tif) as ref_ds, gdal.Open(output_tif) as ds:
+        assert ds.RasterCount == ref_ds.RasterCount
+        assert ds.GetGeoTransform() == ref_ds.GetGeoTransform()
+        for i in range(ds.RasterCount):
+            assert (
+                ds.GetRasterBand(i + 1).Checksum()
+                == ref_ds.GetRasterBand(i + 1).Checksum()
+            )
+
+
+###############################################################################
+# Test -header_cache
+
+
+@pytest.mark.parametrize("chunk_options", ["", "-threads 2"])
+def test_gdal_merge_header_cache(script_path, tmp_path, sample_tifs, chunk_options):
+
+    cache_json = str(tmp_path / "cache.json")
+    output_tif = str(tmp_path / "out.tif")
+
+    for _ in range(2):
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_merge",
+            f"-q {chunk_options} -header_cache {cache_json} -o {output_tif} {' '.join(sample_tifs)}",
+        )
+
+        with gdal.Open(output_tif) as ds:
+            assert ds.RasterXSize == 20 and ds.RasterYSize == 20
+            assert ds.GetRasterBand(1).Checksum() == 3508
+
+        with open(cache_json) as f:
+            cache = json.load(f)
+        assert set(cache.keys()) == set(sample_tifs)
+        assert cache[sample_tifs[1]]["geotransform"] == [3, 0.1, 0, 49, 0, -0.1]
+
+        os.unlink(output_tif)
+
+
+###############################################################################
+# Test -composite first
+
+
+@pytest.mark.parametrize("options", ["", "-n 63", "-init 10"])
+def test_gdal_merge_composite_first(script_path, tmp_path, sample_tifs, options):
+
+    # "first valid wins" is equivalent to the default mode with the inputs
+    # in reverse order
+    ref_tif = str(tmp_path / "ref.tif")
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"-q {options} -ul_lr 2 49 4 47 -o {ref_tif} {' '.join(reversed(sample_tifs))}",
+    )
+
+    output_tif = str(tmp_path / "out.tif")
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_merge",
+        f"-q {options} -ul_lr 2 49 4 47 -composite first -chunk_size 16 -o {output_tif} {' '.join(sample_tifs)}",
+    )
+
+    with gdal.Open(ref_tif) as ref_ds, gdal.Open(output_tif) as ds:
+        assert ds.GetRasterBand(1).Checksum() == ref_ds.GetRasterBand(1).Checksum()
@@ -502,3 +502,137 @@ def test_gdal_retile_different_srs(script_path, tmp_path, srs1, srs2, expected_e
     )
     assert expected_err in err
     assert len(glob.glob(os.path.join(str(out_dir), "*.tif"))) == 0
+
+
+###############################################################################
+# Test gdal_retile.py -threads
+
+
+def test_gdal_retile_threads(script_path, tmp_path):
+
+    drv = gdal.GetDriverByName("GTiff")
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS("WGS84")
+    in_files = []
+    for i, (ulx, uly) in enumerate([(0, 15), (15, 30), (15, 15)]):
+        in_tif = str(tmp_path / f"in{i + 1}.tif")
+        with drv.Create(in_tif, 100, 100, 1) as ds:
+            ds.SetSpatialRef(srs)
+            ds.SetGeoTransform([ulx, 0.15, 0, uly, 0, -0.15])
+            ds.GetRasterBand(1).Fill(21 * i)
+            ds.GetRasterBand(1).WriteRaster(10 * i, 0, 10, 100, b"\xff" * 1000)
+        in_files.append(in_tif)
+
+    checksums = {}
+    csvs = {}
+    for threads in (1, 3):
+        out_dir = tmp_path / f"out_threads_{threads}"
+        out_dir.mkdir()
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_retile",
+            f"-threads {threads} -levels 2 -r bilinear -ps 20 20 -tileIndex index.shp "
+            f"-csv index.csv -targetDir {out_dir} " + " ".join(in_files),
+        )
+        checksums[threads] = {}
+        for filename in glob.glob(f"{out_dir}/**/*.tif", recursive=True):
+            with gdal.Open(filename) as ds:
+                checksums[threads][os.path.relpath(filename, out_dir)] = (
+                    ds.GetRasterBand(1).Checksum()
+                )
+        with open(out_dir / "index.csv") as f:
+            csvs[threads] = f.read()
+
+    assert checksums[1]
+    assert any(filename.startswith("2") for filename in checksums[1])
+    assert checksums[3] == checksums[1]
+    assert csvs[3] == csvs[1]
+
+
+###############################################################################
+# Test gdal_retile.py with a dataset pool smaller than the number of
+# overlapping source tiles
+
+
+def test_gdal_retile_small_dataset_pool(script_path, tmp_path):
+
+    drv = gdal.GetDriverByName("GTiff")
+    in_files = []
+    for i in range(4):
+        in_tif = str(tmp_path / f"in{i}.tif")
+        with drv.Create(in_tif, 10, 10, 1) as ds:
+            ds.SetGeoTransform([10 * (i % 2), 1, 0, 10 * (i // 2), 0, -1])
+            ds.GetRasterBand(1).Fill(i + 1)
+        in_files.append(in_tif)
+
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    test_py_scripts.run_py_script(
+        script_path,
+        "gdal_retile",
+        "--config GDAL_MAX_DATASET_POOL_SIZE 2 --config GDAL_MAX_DATASET_POOL_RAM_USAGE 1 "
+        + f"-levels 1 -ps 20 20 -targetDir {out_dir} "
+        + " ".join(in_files),
+    )
+
+    with gdal.Open(str(out_dir / "in0_1_1.tif")) as ds:
+        assert ds.RasterXSize == 20
+        assert ds.RasterYSize == 20
+        assert (
+            ds.GetRasterBand(1).ReadRaster(0, 0, 20, 1) == b"\x03" * 10 + b"\x04" * 10
+        )
+        assert (
+            ds.GetRasterBand(1).ReadRaster(0, 19, 20, 1) == b"\x01" * 10 + b"\x02" * 10
+        )
+    with gdal.Open(str(out_dir / "1" / "in0_1_1.tif")) as ds:
+        assert ds.RasterXSize == 10
+        assert ds.GetRasterBand(1).ReadRaster(0, 0, 10, 1) == b"\x03" * 5 + b"\x04" * 5
+
+
+###############################################################################
+# Test gdal_retile.py -streamPyramid
+
+
+@pytest.mark.parametrize(
+    "options", ["", "-threads 2", "-pyramidOnly", "-useDirForEachRow -overlap 3"]
+)
+def test_gdal_retile_stream_pyramid(script_path, tmp_path, options):
+
+    drv = gdal.GetDriverByName("GTiff")
+    srs = osr.SpatialReference()
+    srs.SetWellKnownGeogCS("WGS84")
+    in_files = []
+    for i, (ulx, uly) in enumerate([(0, 15), (15, 30), (15, 15)]):
+        in_tif = str(tmp_path / f"in{i + 1}.tif")
+        with drv.Create(in_tif, 100, 100, 1) as ds:
+            ds.SetSpatialRef(srs)
+            ds.SetGeoTransform([ulx, 0.15, 0, uly, 0, -0.15])
+            ds.GetRasterBand(1).Fill(21 * i)
+            ds.GetRasterBand(1).WriteRaster(10 * i, 0, 10, 100, b"\xff" * 1000)
+        in_files.append(in_tif)
+
+    checksums = {}
+    csvs = {}
+    for stream in ("", "-streamPyramid"):
+        out_dir = tmp_path / f"out{stream}"
+        out_dir.mkdir()
+        test_py_scripts.run_py_script(
+            script_path,
+            "gdal_retile",
+            f"{stream} {options} -levels 3 -r bilinear -ps 20 20 -csv index.csv "
+            f"-targetDir {out_dir} " + " ".join(in_files),
+        )
+        checksums[stream] = {}
+        for filename in glob.glob(f"{out_dir}/**/*.tif", recursive=True):
+            with gdal.Open(filename) as ds:
+                checksums[stream][os.path.relpath(filename, out_dir)] = (
+                    ds.GetRasterBand(1).Checksum()
+                )
+        csvs[stream] = {}
+        for filename in glob.glob(f"{out_dir}/**/index.csv", recursive=True):
+            with open(filename) as f:
+                csvs[stream][os.path.relpath(filename, out_dir)] = f.read()
+
+    assert any(filename.startswith("3") for filename in checksums[""])
+    assert checksums["-streamPyramid"] == checksums[""]
+    assert csvs["-streamPyramid"] == csvs[""]
@@ -676,3 +676,66 @@ def test_ogrmerge_input_file_leading_space(script_path, tmp_path):
     ds = ogr.Open(out_shp)
     lyr = ds.GetLayer(0)
     assert lyr.GetFeatureCount() == 10
+
+
+###############################################################################
+# Test -threads
+
+
+@pytest.mark.require_driver("GPKG")
+@pytest.mark.parametrize(
+    "options", ["", "-single", "-single -field_strategy Intersection"]
+)
+def test_ogrmerge_threads(script_path, tmp_path, options):
+
+    src_filenames = []
+    for i in range(5):
+        src_filename = str(tmp_path / f"in{i}.gpkg")
+        src_ds = gdal.VectorTranslate(
+            src_filename,
+            test_py_scripts.get_data_path("ogr") + "poly.shp",
+            where=f"EAS_ID >= {160 + 2 * i}",
+        )
+        src_lyr = src_ds.GetLayer(0)
+        if i % 2:
+            src_lyr.CreateField(ogr.FieldDefn(f"extra{i}", ogr.OFTInteger))
+            for f in list(src_lyr):
+                f[f"extra{i}"] = i
+                src_lyr.SetFeature(f)
+        src_ds = None
+        src_filenames.append(src_filename)
+
+    out_gpkg = str(tmp_path / "out.gpkg")
+    out_threads_gpkg = str(tmp_path / "out_threads.gpkg")
+
+    test_py_scripts.run_py_script(
+        script_path,
+        "ogrmerge",
+        f"-f GPKG -o {out_gpkg} {options} " + " ".join(src_filenames),
+    )
+    _, err = test_py_scripts.run_py_script(
+        script_path,
+        "ogrmerge",
+        f"-f GPKG -o {out_threads_gpkg} {options} -threads 3 "
+        + " ".join(src_filenames),
+        return_stderr=True,
+    )
+    assert "ERROR" not in err
+
+    ds = ogr.Open(out_gpkg)
+    ds_threads = ogr.Open(out_threads_gpkg)
+    assert ds_threads.GetLayerCount() == ds.GetLayerCount()
+    for lyr in ds:
+        lyr_threads = ds_threads.GetLayerByName(lyr.GetName())
+        assert lyr_threads.GetGeomType() == lyr.GetGeomType()
+        assert lyr_threads.GetSpatialRef().IsSame(lyr.GetSpatialRef())
+        defn = lyr.GetLayerDefn()
+        defn_threads = lyr_threads.GetLayerDefn()
+        assert [
+            defn_threads.GetFieldDefn(i).GetName()
+            for i in range(defn_threads.GetFieldCount())
+        ] == [defn.GetFieldDefn(i).GetName() for i in range(defn.GetFieldCount())]
+        assert lyr_threads.GetFeatureCount() == lyr.GetFeatureCount()
+        for f, f_threads in zip(lyr, lyr_threads):
+            assert f_threads.items() == f.items()
+            assert f_threads.GetGeometryRef().Equals(f.GetGeometryRef())
@@ -19,13 +19,21 @@
 #include "ograpispy.h"
 #include "ogr_wkb.h"
 #include "ogrlayer_private.h"
+#include "gdal_thread_pool.h"
 
+#include "cpl_error_internal.h"
+#include "cpl_quad_tree.h"
 #include "cpl_time.h"
+#include "cpl_worker_thread_pool.h"
+#include <algorithm>
 #include <cassert>
 #include <cmath>
+#include <functional>
 #include <limits>
+#include <map>
 #include <memory>
 #include <set>
+#include <vector>
 
 /************************************************************************/
 /*                              OGRLayer()                              */
@@ -5304,6 +5312,355 @@ static OGRGeometry *promote_to_multi(OGRGeometry *poGeom)
         return poGeom;
 }
 
+static int get_num_threads(CSLConstList papszOptions)
+{
+    return GDALGetNumThreads(CSLFetchNameValueDef(papszOptions, "NUM_THREADS",
+                                                  "1"),
+                             GDAL_DEFAULT_MAX_THREAD_COUNT);
+}
+
+namespace
+{
+
+/************************************************************************/
+/*                          OverlayMethodIndex                          */
+/************************************************************************/
+
+/** In-memory copy of the features of a method layer, indexed by a quad tree
+ * of their envelopes, that can be queried concurrently by several threads.
+ */
+class OverlayMethodIndex
+{
+    std::vector<OGRFeatureUniquePtr> m_apoFeatures{};
+    std::unique_ptr<CPLQuadTree, decltype(&CPLQuadTreeDestroy)> m_poTree{
+        nullptr, CPLQuadTreeDestroy};
+    const OGRGeometry *m_poFilter = nullptr;
+
+    // Attributes of the method features converted to the result layer
+    // definition, when some of them need a type conversion.
+    const int *m_panMethodMap = nullptr;
+    std::vector<int> m_anResultFieldsMap{};
+    std::map<const OGRFeature *, OGRFeatureUniquePtr> m_oMapResultFields{};
+
+    CPL_DISALLOW_COPY_ASSIGN(OverlayMethodIndex)
+
+  public:
+    OverlayMethodIndex() = default;
+
+    bool Load(OGRLayer *poLayer, const OGRGeometry *poFilter,
+              OGRFeatureDefn *poDefnResult = nullptr,
+              const int *panMethodMap = nullptr);
+
+    const OGRGeometry *Select(OGRFeature *poFeature,
+                              std::vector<const OGRFeature *> &apoSelected,
+                              bool &bError) const;
+
+    void SetFieldsTo(const OGRFeature *poMethodFeature,
+                     OGRFeature *poDstFeature) const;
+};
+
+/** Load the features of the method layer, which must have poFilter as its
+ * spatial filter.
+ *
+ * If poDefnResult and panMethodMap are set, SetFieldsTo() can then be used
+ * to copy the attributes of the method features to result features.
+ */
+bool OverlayMethodIndex::Load(OGRLayer *poLayer, const OGRGeometry *poFilter,
+                              OGRFeatureDefn *poDefnResult,
+                              const int *panMethodMap)
+{
+    m_poFilter = poFilter;
+    m_panMethodMap = panMethodMap;
+
+    // OGRFeature::SetFieldsFrom() uses the temporary buffer of the source
+    // feature when converting some field types to string, so converting the
+    // shared method features from several threads is not safe. In that case,
+    // the conversion is done once here.
+    bool bConvertFields = false;
+    if (poDefnResult && panMethodMap)
+    {
+        const OGRFeatureDefn *poDefnMethod = poLayer->GetLayerDefn();
+        const int nResultFieldCount = poDefnResult->GetFieldCount();
+        m_anResultFieldsMap.resize(nResultFieldCount, -1);
+        for (int iField = 0; iField < poDefnMethod->GetFieldCount(); iField++)
+        {
+            const int iDstField = panMethodMap[iField];
+            if (iDstField < 0 || iDstField >= nResultFieldCount)
+                continue;
+            m_anResultFieldsMap[iDstField] = iDstField;
+            if (poDefnMethod->GetFieldDefn(iField)->GetType() !=
+                poDefnResult->GetFieldDefn(iDstField)->GetType())
+            {
+                bConvertFields = true;
+            }
+        }
+    }
+
+    OGREnvelope sGlobalEnvelope;
+    std::vector<OGREnvelope> asEnvelopes;
+    poLayer->ResetReading();
+    while (auto poFeature = OGRFeatureUniquePtr(poLayer->GetNextFeature()))
+    {
+        // Features without geometry are never selected by a spatial filter
+        const OGRGeometry *poGeom = poFeature->GetGeometryRef();
+        if (!poGeom || poGeom->IsEmpty())
+            continue;
+        OGREnvelope sEnvelope;
+        poGeom->getEnvelope(&sEnvelope);
+        sGlobalEnvelope.Merge(sEnvelope);
+        asEnvelopes.push_back(sEnvelope);
+        if (bConvertFields)
+        {
+            OGRFeatureUniquePtr poResultFields(new OGRFeature(poDefnResult));
+            poResultFields->SetFieldsFrom(poFeature.get(), panMethodMap);
+            m_oMapResultFields[poFeature.get()] = std::move(poResultFields);
+        }
+        m_apoFeatures.push_back(std::move(poFeature));
+    }
+
+    CPLRectObj sGlobalBounds;
+    sGlobalBounds.minx = sGlobalEnvelope.MinX;
+    sGlobalBounds.miny = sGlobalEnvelope.MinY;
+    sGlobalBounds.maxx = sGlobalEnvelope.MaxX;
+    sGlobalBounds.maxy = sGlobalEnvelope.MaxY;
+    m_poTree.reset(CPLQuadTreeCreate(&sGlobalBounds, nullptr));
+    if (!m_poTree)
+        return false;
+    CPLQuadTreeSetMaxDepth(
+        m_poTree.get(),
+        CPLQuadTreeGetAdvisedMaxDepth(static_cast<int>(std::min<size_t>(
+            INT_MAX, m_apoFeatures.size()))));
+    for (size_t i = 0; i < m_apoFeatures.size(); ++i)
+    {
+        CPLRectObj sBounds;
+        sBounds.minx = asEnvelopes[i].MinX;
+        sBounds.miny = asEnvelopes[i].MinY;
+        sBounds.maxx = asEnvelopes[i].MaxX;
+        sBounds.maxy = asEnvelopes[i].MaxY;
+        CPLQuadTreeInsertWithBounds(
+            m_poTree.get(), reinterpret_cast<void *>(static_cast<uintptr_t>(i)),
+            &sBounds);
+    }
+    return true;
+}
+
+/** Select the method features that would be returned by the method layer
+ * after set_filter_from(), in the order of the method layer.
+ *
+ * @return the geometry of poFeature, or nullptr if it should be skipped, as
+ * set_filter_from() does. bError is set if a GEOS call failed.
+ */
+const OGRGeometry *
+OverlayMethodIndex::Select(OGRFeature *poFeature,
+                           std::vector<const OGRFeature *> &apoSelected,
+                           bool &bError) const
+{
+    apoSelected.clear();
+    bError = false;
+
+    const OGRGeometry *poGeom = poFeature->GetGeometryRef();
+    if (!poGeom)
+        return nullptr;
+
+    OGRGeometryUniquePtr poIntersection;
+    const OGRGeometry *poFilterGeom = poGeom;
+    if (m_poFilter)
+    {
+        CPLErrorReset();
+        if (!poGeom->Intersects(m_poFilter))
+        {
+            bError = CPLGetLastErrorType() != CE_None;
+            return nullptr;
+        }
+        poIntersection.reset(poGeom->Intersection(m_poFilter));
+        if (!poIntersection)
+        {
+            bError = CPLGetLastErrorType() != CE_None;
+            return nullptr;
+        }
+        poFilterGeom = poIntersection.get();
+    }
+
+    OGREnvelope sEnvelope;
+    poFilterGeom->getEnvelope(&sEnvelope);
+    CPLRectObj aoi;
+    aoi.minx = sEnvelope.MinX;
+    aoi.miny = sEnvelope.MinY;
+    aoi.maxx = sEnvelope.MaxX;
+    aoi.maxy = sEnvelope.MaxY;
+    int nCandidates = 0;
+    std::unique_ptr<void *, decltype(&CPLFree)> pahCandidates(
+        CPLQuadTreeSearch(m_poTree.get(), &aoi, &nCandidates), CPLFree);
+    std::vector<size_t> anCandidates;
+    anCandidates.reserve(nCandidates);
+    for (int i = 0; i < nCandidates; ++i)
+    {
+        anCandidates.push_back(static_cast<size_t>(
+            reinterpret_cast<uintptr_t>(pahCandidates.get()[i])));
+    }
+    std::sort(anCandidates.begin(), anCandidates.end());
+
+    // Same test as OGRLayer::FilterGeometry()
+    OGRPreparedGeometryUniquePtr poPreparedFilterGeom(
+        OGRCreatePreparedGeometry(OGRGeometry::ToHandle(
+            const_cast<OGRGeometry *>(poFilterGeom))));
+    for (const size_t i : anCandidates)
+    {
+        const OGRFeature *poMethodFeature = m_apoFeatures[i].get();
+        const OGRGeometry *poMethodGeom = poMethodFeature->GetGeometryRef();
+        const bool bIntersects =
+            poPreparedFilterGeom
+                ? OGRPreparedGeometryIntersects(
+                      poPreparedFilterGeom.get(),
+                      OGRGeometry::ToHandle(
+                          const_cast<OGRGeometry *>(poMethodGeom)))
+                : poFilterGeom->Intersects(poMethodGeom);
+        if (bIntersects)
+            apoSelected.push_back(poMethodFeature);
+    }
+    return poGeom;
+}
+
+/** Copy the attributes of a method feature returned by Select() to a result
+ * feature, as OGRFeature::SetFieldsFrom() with the method field map would do.
+ * Can be called concurrently by several threads.
+ */
+void OverlayMethodIndex::SetFieldsTo(const OGRFeature *poMethodFeature,
+                                     OGRFeature *poDstFeature) const
+{
+    const auto oIter = m_oMapResultFields.find(poMethodFeature);
+    if (oIter != m_oMapResultFields.end())
+        poDstFeature->SetFieldsFrom(oIter->second.get(),
+                                    m_anResultFieldsMap.data());
+    else
+        poDstFeature->SetFieldsFrom(poMethodFeature, m_panMethodMap);
+}
+
+}  // namespace
+
+/************************************************************************/
+/*                    process_features_in_threads()                     */
+/************************************************************************/
+
+/** Process the features of pLayerInput with several threads.
+ *
+ * processFeature() is called concurrently on input features, and must append
+ * the features resulting from an input feature to a vector, and return an
+ * error code if processing should stop. The resulting features are inserted
+ * into pLayerResult by the calling thread, in the order of the input
+ * features, so that the result layer is the same as with a single thread.
+ */
+static OGRErr process_features_in_threads(
+    OGRLayer *pLayerInput, OGRLayer *pLayerResult, int nThreads,
+    bool bSkipFailures,
+    const std::function<OGRErr(OGRFeature *,
+                               std::vector<OGRFeatureUniquePtr> &)>
+        &processFeature,
+    GDALProgressFunc pfnProgress, void *pProgressArg)
+{
+    struct Result
+    {
+        OGRErr eErr = OGRERR_NONE;
+        std::vector<OGRFeatureUniquePtr> apoFeatures{};
+    };
+
+    CPLWorkerThreadPool *poThreadPool = GDALGetGlobalThreadPool(nThreads);
+    auto poQueue = poThreadPool ? poThreadPool->CreateJobQueue() : nullptr;
+
+    // Input features are read and processed by batches of several features
+    // per thread, to amortize the synchronization
+    constexpr int FEATURES_PER_JOB = 64;
+    const size_t nBatchSize = static_cast<size_t>(nThreads) * FEATURES_PER_JOB;
+    const double progress_max =
+        static_cast<double>(pLayerInput->GetFeatureCount(FALSE));
+    double progress_counter = 0;
+    CPLErrorAccumulator oErrorAccumulator;
+
+    pLayerInput->ResetReading();
+    bool bEOF = false;
+    while (!bEOF)
+    {
+        std::vector<OGRFeatureUniquePtr> apoInput;
+        while (apoInput.size() < nBatchSize)
+        {
+            OGRFeatureUniquePtr poFeature(pLayerInput->GetNextFeature());
+            if (!poFeature)
+            {
+                bEOF = true;
+                break;
+            }
+            apoInput.push_back(std::move(poFeature));
+        }
+
+        std::vector<Result> aoResults(apoInput.size());
+        const auto processFeatures = [&apoInput, &aoResults, &processFeature,
+                                      &oErrorAccumulator](size_t iStart,
+                                                          size_t iEnd)
+        {
+            auto oContext = oErrorAccumulator.InstallForCurrentScope();
+            for (size_t i = iStart; i < iEnd; ++i)
+            {
+                aoResults[i].eErr = processFeature(apoInput[i].get(),
+                                                   aoResults[i].apoFeatures);
+                // next features would not be inserted
+                if (aoResults[i].eErr != OGRERR_NONE)
+                    break;
+            }
+        };
+        for (size_t iStart = 0; iStart < apoInput.size();
+             iStart += FEATURES_PER_JOB)
+        {
+            const size_t iEnd =
+                std::min(iStart + FEATURES_PER_JOB, apoInput.size());
+            if (!poQueue || !poQueue->SubmitJob([&processFeatures, iStart, iEnd]
+                                                { processFeatures(iStart, iEnd); }))
+            {
+                processFeatures(iStart, iEnd);
+            }
+        }
+        if (poQueue)
+            poQueue->WaitCompletion();
+        oErrorAccumulator.ReplayErrors();
+        oErrorAccumulator.ClearErrors();
+        if (bSkipFailures)
+            CPLErrorReset();
+
+        for (auto &oResult : aoResults)
+        {
+            if (pfnProgress)
+            {
+                double p = progress_counter / progress_max;
+                if (p > 0 && !pfnProgress(p, "", pProgressArg))
+                {
+                    CPLError(CE_Failure, CPLE_UserInterrupt, "User terminated");
+                    return OGRERR_FAILURE;
+                }
+                progress_counter += 1.0;
+            }
+
+            for (auto &poFeature : oResult.apoFeatures)
+            {
+                const OGRErr ret = pLayerResult->CreateFeature(poFeature.get());
+                if (ret != OGRERR_NONE)
+                {
+                    if (!bSkipFailures)
+                        return ret;
+                    CPLErrorReset();
+                }
+            }
+            if (oResult.eErr != OGRERR_NONE)
+                return oResult.eErr;
+        }
+    }
+
+    if (pfnProgress && !pfnProgress(1.0, "", pProgressArg))
+    {
+        CPLError(CE_Failure, CPLE_UserInterrupt, "User terminated");
+        return OGRERR_FAILURE;
+    }
+    return OGRERR_NONE;
+}
+
 /************************************************************************/
 /*                            Intersection()                            */
 /************************************************************************/
@@ -5358,6 +5715,13 @@ static OGRGeometry *promote_to_multi(OGRGeometry *poGeom)
  *     features with lower dimension geometry, but only if the result layer
  *     has an unknown geometry type.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This method is the same as the C function OGR_L_Intersection().
@@ -5409,6 +5773,7 @@ OGRErr OGRLayer::Intersection(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         CSLFetchNameValueDef(papszOptions, "PRETEST_CONTAINMENT", "NO"));
     bool bKeepLowerDimGeom = CPLTestBool(CSLFetchNameValueDef(
         papszOptions, "KEEP_LOWER_DIMENSION_GEOMETRIES", "YES"));
+    const int nThreads = get_num_threads(papszOptions);
 
     // check for GEOS
     if (!OGRGeometryFactory::haveGEOS())
@@ -5445,6 +5810,127 @@ OGRErr OGRLayer::Intersection(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         }
     }
 
+    if (nThreads > 1)
+    {
+        OverlayMethodIndex oMethodIndex;
+        if (!oMethodIndex.Load(pLayerMethod, pGeometryMethodFilter,
+                               poDefnResult, mapMethod))
+        {
+            ret = OGRERR_FAILURE;
+            goto done;
+        }
+
+        const auto processFeature =
+            [&](OGRFeature *x, std::vector<OGRFeatureUniquePtr> &apoResult)
+        {
+            // is it worth to proceed?
+            if (bEnvelopeSet)
+            {
+                OGRGeometry *x_geom = x->GetGeometryRef();
+                if (!x_geom)
+                    return OGRERR_NONE;
+                OGREnvelope x_env;
+                x_geom->getEnvelope(&x_env);
+                if (x_env.MaxX < sEnvelopeMethod.MinX ||
+                    x_env.MaxY < sEnvelopeMethod.MinY ||
+                    sEnvelopeMethod.MaxX < x_env.MinX ||
+                    sEnvelopeMethod.MaxY < x_env.MinY)
+                {
+                    return OGRERR_NONE;
+                }
+            }
+
+            std::vector<const OGRFeature *> apoMethodFeatures;
+            bool bError = false;
+            const OGRGeometry *x_geom =
+                oMethodIndex.Select(x, apoMethodFeatures, bError);
+            if (bError)
+            {
+                if (!bSkipFailures)
+                    return OGRERR_FAILURE;
+                CPLErrorReset();
+            }
+            if (!x_geom)
+                return OGRERR_NONE;
+
+            OGRPreparedGeometryUniquePtr x_prepared_geom;
+            if (bUsePreparedGeometries)
+            {
+                x_prepared_geom.reset(OGRCreatePreparedGeometry(
+                    OGRGeometry::ToHandle(const_cast<OGRGeometry *>(x_geom))));
+                if (!x_prepared_geom)
+                    return OGRERR_FAILURE;
+            }
+
+            for (const OGRFeature *y : apoMethodFeatures)
+            {
+                const OGRGeometry *y_geom = y->GetGeometryRef();
+                OGRGeometryH hYGeom =
+                    OGRGeometry::ToHandle(const_cast<OGRGeometry *>(y_geom));
+                OGRGeometryUniquePtr z_geom;
+
+                if (x_prepared_geom)
+                {
+                    CPLErrorReset();
+                    if (bPretestContainment &&
+                        OGRPreparedGeometryContains(x_prepared_geom.get(),
+                                                    hYGeom))
+                    {
+                        if (CPLGetLastErrorType() == CE_None)
+                            z_geom.reset(y_geom->clone());
+                    }
+                    else if (!(OGRPreparedGeometryIntersects(
+                                 x_prepared_geom.get(), hYGeom)))
+                    {
+                        if (CPLGetLastErrorType() == CE_None)
+                        {
+                            continue;
+                        }
+                    }
+                    if (CPLGetLastErrorType() != CE_None)
+                    {
+                        if (!bSkipFailures)
+                            return OGRERR_FAILURE;
+                        CPLErrorReset();
+                        continue;
+                    }
+                }
+                if (!z_geom)
+                {
+                    CPLErrorReset();
+                    z_geom.reset(x_geom->Intersection(y_geom));
+                    if (CPLGetLastErrorType() != CE_None || z_geom == nullptr)
+                    {
+                        if (!bSkipFailures)
+                            return OGRERR_FAILURE;
+                        CPLErrorReset();
+                        continue;
+                    }
+                    if (z_geom->IsEmpty() ||
+                        (!bKeepLowerDimGeom &&
+                         (x_geom->getDimension() == y_geom->getDimension() &&
+                          z_geom->getDimension() < x_geom->getDimension())))
+                    {
+                        continue;
+                    }
+                }
+                OGRFeatureUniquePtr z(new OGRFeature(poDefnResult));
+                z->SetFieldsFrom(x, mapInput);
+                oMethodIndex.SetFieldsTo(y, z.get());
+                if (bPromoteToMulti)
+                    z_geom.reset(promote_to_multi(z_geom.release()));
+                z->SetGeometryDirectly(z_geom.release());
+                apoResult.push_back(std::move(z));
+            }
+            return OGRERR_NONE;
+        };
+
+        ret = process_features_in_threads(this, pLayerResult, nThreads,
+                                          bSkipFailures, processFeature,
+                                          pfnProgress, pProgressArg);
+        goto done;
+    }
+
     for (auto &&x : this)
     {
 
@@ -5680,6 +6166,13 @@ done:
  *     features with lower dimension geometry, but only if the result layer
  *     has an unknown geometry type.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This function is the same as the C++ method OGRLayer::Intersection().
@@ -7510,6 +8003,13 @@ OGRErr OGR_L_Update(OGRLayerH pLayerInput, OGRLayerH pLayerMethod,
  * <li>METHOD_PREFIX=string. Set a prefix for the field names that
  *     will be created from the fields of the method layer.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This method is the same as the C function OGR_L_Clip().
@@ -7551,6 +8051,7 @@ OGRErr OGRLayer::Clip(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         CPLTestBool(CSLFetchNameValueDef(papszOptions, "SKIP_FAILURES", "NO"));
     const bool bPromoteToMulti = CPLTestBool(
         CSLFetchNameValueDef(papszOptions, "PROMOTE_TO_MULTI", "NO"));
+    const int nThreads = get_num_threads(papszOptions);
 
     // check for GEOS
     if (!OGRGeometryFactory::haveGEOS())
@@ -7572,6 +8073,89 @@ OGRErr OGRLayer::Clip(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         goto done;
 
     poDefnResult = pLayerResult->GetLayerDefn();
+    if (nThreads > 1)
+    {
+        OverlayMethodIndex oMethodIndex;
+        if (!oMethodIndex.Load(pLayerMethod, pGeometryMethodFilter))
+        {
+            ret = OGRERR_FAILURE;
+            goto done;
+        }
+
+        const auto processFeature =
+            [&](OGRFeature *x, std::vector<OGRFeatureUniquePtr> &apoResult)
+        {
+            std::vector<const OGRFeature *> apoMethodFeatures;
+            bool bError = false;
+            const OGRGeometry *x_geom =
+                oMethodIndex.Select(x, apoMethodFeatures, bError);
+            if (bError)
+            {
+                if (!bSkipFailures)
+                    return OGRERR_FAILURE;
+                CPLErrorReset();
+            }
+            if (!x_geom)
+                return OGRERR_NONE;
+
+            OGRGeometryUniquePtr
+                geom;  // this will be the geometry of the result feature
+            // incrementally add area from y to geom
+            for (const OGRFeature *y : apoMethodFeatures)
+            {
+                const OGRGeometry *y_geom = y->GetGeometryRef();
+                if (!geom)
+                {
+                    geom.reset(y_geom->clone());
+                    continue;
+                }
+                CPLErrorReset();
+                OGRGeometryUniquePtr geom_new(geom->Union(y_geom));
+                if (CPLGetLastErrorType() != CE_None || geom_new == nullptr)
+                {
+                    if (!bSkipFailures)
+                        return OGRERR_FAILURE;
+                    CPLErrorReset();
+                }
+                else
+                {
+                    geom.swap(geom_new);
+                }
+            }
+
+            // possibly add a new feature with area x intersection sum of y
+            if (geom)
+            {
+                CPLErrorReset();
+                OGRGeometryUniquePtr poIntersection(
+                    x_geom->Intersection(geom.get()));
+                if (CPLGetLastErrorType() != CE_None ||
+                    poIntersection == nullptr)
+                {
+                    if (!bSkipFailures)
+                        return OGRERR_FAILURE;
+                    CPLErrorReset();
+                }
+                else if (!poIntersection->IsEmpty())
+                {
+                    OGRFeatureUniquePtr z(new OGRFeature(poDefnResult));
+                    z->SetFieldsFrom(x, mapInput);
+                    if (bPromoteToMulti)
+                        poIntersection.reset(
+                            promote_to_multi(poIntersection.release()));
+                    z->SetGeometryDirectly(poIntersection.release());
+                    apoResult.push_back(std::move(z));
+                }
+            }
+            return OGRERR_NONE;
+        };
+
+        ret = process_features_in_threads(this, pLayerResult, nThreads,
+                                          bSkipFailures, processFeature,
+                                          pfnProgress, pProgressArg);
+        goto done;
+    }
+
     for (auto &&x : this)
     {
 
@@ -7742,6 +8326,13 @@ done:
  * <li>METHOD_PREFIX=string. Set a prefix for the field names that
  *     will be created from the fields of the method layer.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This function is the same as the C++ method OGRLayer::Clip().
@@ -7819,6 +8410,13 @@ OGRErr OGR_L_Clip(OGRLayerH pLayerInput, OGRLayerH pLayerMethod,
  * <li>METHOD_PREFIX=string. Set a prefix for the field names that
  *     will be created from the fields of the method layer.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This method is the same as the C function OGR_L_Erase().
@@ -7860,6 +8458,7 @@ OGRErr OGRLayer::Erase(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         CPLTestBool(CSLFetchNameValueDef(papszOptions, "SKIP_FAILURES", "NO"));
     const bool bPromoteToMulti = CPLTestBool(
         CSLFetchNameValueDef(papszOptions, "PROMOTE_TO_MULTI", "NO"));
+    const int nThreads = get_num_threads(papszOptions);
 
     // check for GEOS
     if (!OGRGeometryFactory::haveGEOS())
@@ -7882,6 +8481,75 @@ OGRErr OGRLayer::Erase(OGRLayer *pLayerMethod, OGRLayer *pLayerResult,
         goto done;
     poDefnResult = pLayerResult->GetLayerDefn();
 
+    if (nThreads > 1)
+    {
+        OverlayMethodIndex oMethodIndex;
+        if (!oMethodIndex.Load(pLayerMethod, pGeometryMethodFilter))
+        {
+            ret = OGRERR_FAILURE;
+            goto done;
+        }
+
+        const auto processFeature =
+            [&](OGRFeature *x, std::vector<OGRFeatureUniquePtr> &apoResult)
+        {
+            std::vector<const OGRFeature *> apoMethodFeatures;
+            bool bError = false;
+            const OGRGeometry *x_geom =
+                oMethodIndex.Select(x, apoMethodFeatures, bError);
+            if (bError)
+            {
+                if (!bSkipFailures)
+                    return OGRERR_FAILURE;
+                CPLErrorReset();
+            }
+            if (!x_geom)
+                return OGRERR_NONE;
+
+            OGRGeometryUniquePtr geom(
+                x_geom->clone());  // this will be the geometry of the result
+                                   // feature
+            // incrementally erase y from geom
+            for (const OGRFeature *y : apoMethodFeatures)
+            {
+                CPLErrorReset();
+                OGRGeometryUniquePtr geom_new(
+                    geom->Difference(y->GetGeometryRef()));
+                if (CPLGetLastErrorType() != CE_None || geom_new == nullptr)
+                {
+                    if (!bSkipFailures)
+                        return OGRERR_FAILURE;
+                    CPLErrorReset();
+                }
+                else
+                {
+                    geom.swap(geom_new);
+                    if (geom->IsEmpty())
+                    {
+                        break;
+                    }
+                }
+            }
+
+            // add a new feature if there is remaining area
+            if (!geom->IsEmpty())
+            {
+                OGRFeatureUniquePtr z(new OGRFeature(poDefnResult));
+                z->SetFieldsFrom(x, mapInput);
+                if (bPromoteToMulti)
+                    geom.reset(promote_to_multi(geom.release()));
+                z->SetGeometryDirectly(geom.release());
+                apoResult.push_back(std::move(z));
+            }
+            return OGRERR_NONE;
+        };
+
+        ret = process_features_in_threads(this, pLayerResult, nThreads,
+                                          bSkipFailures, processFeature,
+                                          pfnProgress, pProgressArg);
+        goto done;
+    }
+
     for (auto &&x : this)
     {
 
@@ -8030,6 +8698,13 @@ done:
  * <li>METHOD_PREFIX=string. Set a prefix for the field names that
  *     will be created from the fields of the method layer.
  * </li>
+ * <li>NUM_THREADS=number|ALL_CPUS. (GDAL >= 3.14) Number of threads
+ *     used to process the features of this layer. When greater than 1, the
+ *     features of the method layer are first loaded in memory and indexed,
+ *     and the features of this layer are processed in parallel. The result
+ *     features are written in the same order as with a single thread.
+ *     Defaults to 1.
+ * </li>
  * </ul>
  *
  * This function is the same as the C++ method OGRLayer::Erase().
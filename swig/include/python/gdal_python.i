@@ -573,6 +573,136 @@ unsigned int wrapper_VSIFReadL( void **buf, unsigned int nMembSize, unsigned int
 %clear (void **buf );
 %clear VSILFILE* fp;
 
+/* -------------------------------------------------------------------- */
+/*      VSIFReadIntoL()                                                 */
+/* -------------------------------------------------------------------- */
+
+%rename (_VSIFReadIntoL) wrapper_VSIFReadIntoL;
+
+%apply ( void *inPythonObject ) { (void *buf_obj ) };
+%apply Pointer NONNULL {VSILFILE* fp};
+%inline %{
+/* Read directly into a writable buffer, without intermediate copy. */
+/* Returns the number of bytes read, or -1 in case of error. */
+GIntBig wrapper_VSIFReadIntoL( void *buf_obj, VSILFILE *fp)
+{
+    Py_buffer view;
+    {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        if (PyObject_GetBuffer( (PyObject*)buf_obj, &view,
+                                PyBUF_SIMPLE | PyBUF_WRITABLE) != 0)
+        {
+            PyErr_Clear();
+            SWIG_PYTHON_THREAD_END_BLOCK;
+            CPLError(CE_Failure, CPLE_AppDefined,
+                     "buf_obj is not a simple writable buffer");
+            return -1;
+        }
+        SWIG_PYTHON_THREAD_END_BLOCK;
+    }
+
+    // The GIL is released during the read
+    const size_t nRet = VSIFReadL( view.buf, 1, static_cast<size_t>(view.len), fp );
+
+    {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        PyBuffer_Release(&view);
+        SWIG_PYTHON_THREAD_END_BLOCK;
+    }
+    return static_cast<GIntBig>(nRet);
+}
+%}
+%clear (void *buf_obj );
+%clear VSILFILE* fp;
+
+/* -------------------------------------------------------------------- */
+/*      VSIFReadMultiRangeL()                                           */
+/* -------------------------------------------------------------------- */
+
+%rename (VSIFReadMultiRangeL) wrapper_VSIFReadMultiRangeL;
+
+%apply ( void **outPythonObject ) { (void **buf ) };
+%apply (int nList, GUIntBig* pList) {(int nOffsets, GUIntBig *panOffsets)};
+%apply (int nList, GUIntBig* pList) {(int nSizes, GUIntBig *panSizes)};
+%apply Pointer NONNULL {VSILFILE* fp};
+%inline %{
+/* Returns a list of bytes objects, one per range, or None in case of error */
+void wrapper_VSIFReadMultiRangeL( void **buf,
+                                  int nOffsets, GUIntBig *panOffsets,
+                                  int nSizes, GUIntBig *panSizes,
+                                  VSILFILE *fp)
+{
+    *buf = NULL;
+    if (nOffsets != nSizes)
+    {
+        CPLError(CE_Failure, CPLE_IllegalArg,
+                 "offsets and sizes must have the same number of elements");
+        return;
+    }
+
+    std::vector<void*> apData(nOffsets);
+    std::vector<vsi_l_offset> anOffsets(nOffsets);
+    std::vector<size_t> anSizes(nOffsets);
+    for (int i = 0; i < nOffsets; ++i)
+    {
+        if (panSizes[i] > static_cast<GUIntBig>(PY_SSIZE_T_MAX))
+        {
+            CPLError(CE_Failure, CPLE_AppDefined, "Too big request");
+            return;
+        }
+        anOffsets[i] = static_cast<vsi_l_offset>(panOffsets[i]);
+        anSizes[i] = static_cast<size_t>(panSizes[i]);
+    }
+
+    PyObject* list = NULL;
+    {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        list = PyList_New(nOffsets);
+        for (int i = 0; list != NULL && i < nOffsets; ++i)
+        {
+            PyObject* o = PyBytes_FromStringAndSize(NULL, static_cast<Py_ssize_t>(anSizes[i]));
+            if (o == NULL)
+            {
+                Py_DECREF(list);
+                list = NULL;
+                break;
+            }
+            apData[i] = PyBytes_AS_STRING(o);
+            PyList_SET_ITEM(list, i, o);
+        }
+        if (list == NULL)
+        {
+            if( !GetUseExceptions() )
+            {
+                PyErr_Clear();
+            }
+            SWIG_PYTHON_THREAD_END_BLOCK;
+            CPLError(CE_Failure, CPLE_OutOfMemory, "Cannot allocate result buffer");
+            return;
+        }
+        SWIG_PYTHON_THREAD_END_BLOCK;
+    }
+
+    // The GIL is released during the read
+    const int nRet = nOffsets == 0 ? 0 :
+        VSIFReadMultiRangeL(nOffsets, apData.data(), anOffsets.data(),
+                            anSizes.data(), fp);
+
+    if (nRet != 0)
+    {
+        SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+        Py_DECREF(list);
+        list = NULL;
+        SWIG_PYTHON_THREAD_END_BLOCK;
+    }
+    *buf = list;
+}
+%}
+%clear (void **buf );
+%clear (int nOffsets, GUIntBig *panOffsets);
+%clear (int nSizes, GUIntBig *panSizes);
+%clear VSILFILE* fp;
+
 /* -------------------------------------------------------------------- */
 /*      VSIGetMemFileBuffer_unsafe()                                    */
 /* -------------------------------------------------------------------- */
@@ -6473,6 +6603,7 @@ def ComputeMinMaxLocation(self, *args, **kwargs):
 # VSIFile: Copyright (c) 2024, Dan Baston <dbaston at gmail.com>
 
 from io import BytesIO
+import re
 
 class VSIFile(BytesIO):
     """Class wrapping a GDAL VSILFILE instance as a Python BytesIO instance
@@ -6480,6 +6611,12 @@ class VSIFile(BytesIO):
        :since: GDAL 3.11
     """
 
+    # Size of the chunks read when iterating over lines, or when reading
+    # until the end of the file
+    _READ_CHUNK_SIZE = 65536
+
+    _EOL_PATTERN = re.compile(b"[\r\n]")
+
     def __init__(self, path, mode, encoding="utf-8", options = {}):
         self._path = path
         self._mode = mode
@@ -6490,6 +6627,12 @@ class VSIFile(BytesIO):
         self._closed = True
         self._fp = None
 
+        # Bytes read ahead from the file by the line iterator, and not yet
+        # consumed. The logical position in the file is VSIFTellL() minus
+        # len(self._rbuf) - self._rpos
+        self._rbuf = bytearray()
+        self._rpos = 0
+
         self._fp = VSIFOpenExL(self._path, self._mode, True, options)
         if self._fp is None:
             raise OSError(VSIGetLastErrorMsg())
@@ -6505,35 +6648,132 @@ class VSIFile(BytesIO):
     def __iter__(self):
         return self
 
+    def _fill_read_buffer(self):
+        """Append a chunk of the file to the read-ahead buffer.
+
+           Returns False if the end of file has been reached.
+        """
+        chunk = VSIFReadL(1, self._READ_CHUNK_SIZE, self._fp)
+        if not chunk:
+            return False
+        del self._rbuf[:self._rpos]
+        self._rpos = 0
+        self._rbuf += chunk
+        return True
+
+    def _take_read_buffer(self, size=-1):
+        """Consume up to size bytes (or all of them if size < 0) from the read-ahead buffer"""
+        available = len(self._rbuf) - self._rpos
+        if size < 0 or size > available:
+            size = available
+        data = self._rbuf[self._rpos:self._rpos + size]
+        self._rpos += size
+        if self._rpos == len(self._rbuf):
+            self._rbuf = bytearray()
+            self._rpos = 0
+        return data
+
+    def _discard_read_buffer(self):
+        """Drop the read-ahead buffer and move the file pointer back to the logical position"""
+        remaining = len(self._rbuf) - self._rpos
+        self._rbuf = bytearray()
+        self._rpos = 0
+        if remaining:
+            if VSIFSeekL(self._fp, VSIFTellL(self._fp) - remaining, 0) != 0:
+                raise OSError(VSIGetLastErrorMsg())
+
     def __next__(self):
-        line = CPLReadLineL(self._fp)
-        if line is None:
-            raise StopIteration
+        # Lines are terminated by "\r\n", "\n\r", "\n" or "\r", which
+        # are stripped, consistently with CPLReadLineL(). Data is read by chunks
+        # of _READ_CHUNK_SIZE bytes rather than line by line.
+        scanned = 0
+        while True:
+            buf = self._rbuf
+            start = self._rpos
+            m = self._EOL_PATTERN.search(buf, start + scanned)
+            # A terminator that is the last byte of the buffer might be
+            # followed by its complementary character in the next chunk.
+            if m is not None and m.end() < len(buf):
+                eol = m.start()
+                line = bytes(buf[start:eol])
+                if buf[eol:eol + 2] in (b"\r\n", b"\n\r"):
+                    self._rpos = eol + 2
+                else:
+                    self._rpos = eol + 1
+                break
+            scanned = (len(buf) if m is None else m.start()) - start
+            if not self._fill_read_buffer():
+                if start == len(buf):
+                    raise StopIteration
+                line = bytes(buf[start:len(buf) if m is None else m.start()])
+                self._rbuf = bytearray()
+                self._rpos = 0
+                break
+
         if self._binary:
-            return line.encode()
-        return line
+            return line
+        return line.decode(self._encoding, errors="surrogateescape")
 
     def close(self):
         if self._closed:
             return
 
         self._closed = True
+        self._rbuf = bytearray()
+        self._rpos = 0
         VSIFCloseL(self._fp)
 
     def read(self, size=-1):
-        if size == -1:
-            pos = self.tell()
-            self.seek(0, 2)
-            size = self.tell()
-            self.seek(pos)
-
-        raw = VSIFReadL(1, size, self._fp)
+        if size is None or size < 0:
+            chunks = [self._take_read_buffer()]
+            chunk_size = self._READ_CHUNK_SIZE
+            while True:
+                chunk = VSIFReadL(1, chunk_size, self._fp)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if len(chunk) < chunk_size:
+                    break
+                # Grow the chunk size to limit the number of calls on big files
+                chunk_size = min(chunk_size * 2, 64 * 1024 * 1024)
+            raw = b"".join(chunks)
+        else:
+            buffered = self._take_read_buffer(size)
+            if len(buffered) == size:
+                raw = bytes(buffered)
+            else:
+                raw = b"".join((buffered, VSIFReadL(1, size - len(buffered), self._fp) or b""))
 
         if self._binary:
-            return bytes(raw)
+            return raw
         else:
             return raw.decode(self._encoding)
 
+    def readinto(self, b):
+        """Read bytes into a pre-allocated, writable bytes-like object b.
+
+           The data is directly read into the memory of b, without
+           intermediate copy. This makes it possible to use VSIFile with
+           :py:class:`io.BufferedReader`, or to fill a numpy array.
+
+           Returns the number of bytes read (0 for EOF).
+
+           .. versionadded:: 3.14
+        """
+
+        with memoryview(b) as mv, mv.cast("B") as view:
+            if view.readonly:
+                raise TypeError("readinto() argument must be a writable bytes-like object")
+            buffered = self._take_read_buffer(len(view))
+            n = len(buffered)
+            view[0:n] = buffered
+            if n < len(view):
+                ret = _VSIFReadIntoL(view[n:], self._fp)
+                if ret < 0:
+                    raise OSError(VSIGetLastErrorMsg())
+                n += ret
+            return n
+
     def write(self, x):
 
         if self._binary:
@@ -6542,6 +6782,8 @@ class VSIFile(BytesIO):
             assert type(x) is str
             x = x.encode(self._encoding)
 
+        self._discard_read_buffer()
+
         planned_write = len(x)
         actual_write = VSIFWriteL(x, 1, planned_write, self._fp)
 
@@ -6563,11 +6805,16 @@ class VSIFile(BytesIO):
            Returns the new absolute position.
         """
 
+        if whence == 1:
+            offset -= len(self._rbuf) - self._rpos
+        self._rbuf = bytearray()
+        self._rpos = 0
+
         if VSIFSeekL(self._fp, offset, whence) != 0:
             raise OSError(VSIGetLastErrorMsg())
 
     def tell(self):
-        return VSIFTellL(self._fp)
+        return VSIFTellL(self._fp) - (len(self._rbuf) - self._rpos)
 %}
 
 
@@ -99,6 +99,20 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
 %}
 
 %extend OGRLayerShadow {
+
+  %apply (int nList, int *pList ) { (int nFields, int *panFields ) };
+  PyObject* _GetNextFeatureBatch(int batch_size, int nFields, int *panFields,
+                                 bool include_fid, int geometry_format, bool as_dict) {
+    PyObject* ret;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    ret = OGRPythonGetNextFeatureBatch(self, batch_size, nFields, panFields, include_fid,
+                                       static_cast<OGRPythonGeometryFormat>(geometry_format),
+                                       as_dict);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return ret;
+  }
+  %clear (int nFields, int *panFields);
+
   %pythoncode %{
     def Reference(self):
       "For backwards compatibility only."
@@ -176,6 +190,91 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
                 break
             yield feature
 
+    def iter_batches(self, batch_size=1000, fields=None, geometry_format="WKB",
+                     include_fid=True, as_dict=False):
+        """Iterate over the features of the layer by batches of rows.
+
+        Each batch is a list of tuples (or dictionaries if ``as_dict`` is set),
+        with one item per feature. The rows are built without creating a
+        :py:class:`Feature` object for each feature, which makes this method
+        much faster than iterating over the layer for row-oriented consumers.
+        Column-oriented consumers should rather use :py:meth:`GetArrowStream`
+        or :py:meth:`GetArrowStreamAsNumPy`.
+
+        In the tuples, the FID comes first (if ``include_fid`` is set), then the
+        values of the fields, and then the geometry of the first geometry field
+        (if ``geometry_format`` is not None).
+        The keys of the dictionaries are the name of the FID column (or
+        ``OGC_FID``), the field names and the name of the geometry column (or
+        ``wkb_geometry``), as with :py:meth:`GetArrowStream`.
+
+        The values of the fields are the ones returned by
+        :py:meth:`Feature.GetField`.
+
+        The reading of the layer is reset first. The attribute and spatial
+        filters, and the ignored fields, of the layer are honored.
+
+        .. versionadded:: 3.14
+
+        Parameters
+        ----------
+        batch_size : int, default = 1000
+            Maximum number of rows of each batch.
+        fields : list of str, optional
+            Names of the fields to return. By default, all fields are returned.
+            :py:meth:`SetIgnoredFields` can be used in addition, to avoid
+            the driver reading fields that are not needed.
+        geometry_format : str, optional, default = "WKB"
+            Format of the geometries: ``"WKB"`` for ISO WKB (little-endian) bytes,
+            ``"WKT"`` for ISO WKT strings, ``"OGR"`` for :py:class:`Geometry`
+            objects, or None to not return the geometries.
+        include_fid : bool, default = True
+            Whether the FID of the features should be returned.
+        as_dict : bool, default = False
+            Whether rows should be returned as dictionaries instead of tuples.
+
+        Yields
+        ------
+        list of tuple or list of dict
+
+        Examples
+        --------
+        >>> with gdal.OpenEx("poly.shp", gdal.OF_VECTOR) as ds:
+        ...     lyr = ds.GetLayer(0)
+        ...     for batch in lyr.iter_batches(geometry_format=None):
+        ...         for fid, area, eas_id, prfedea in batch:
+        ...             pass
+        """
+
+        if batch_size <= 0:
+            raise ValueError("batch_size should be strictly positive")
+
+        geometry_formats = {None: 0, "WKB": 1, "WKT": 2, "OGR": 3}
+        if isinstance(geometry_format, str):
+            geometry_format = geometry_format.upper()
+        if geometry_format not in geometry_formats:
+            raise ValueError("Unsupported geometry_format: %s" % geometry_format)
+
+        defn = self.GetLayerDefn()
+        if fields is None:
+            field_indices = list(range(defn.GetFieldCount()))
+        else:
+            field_indices = []
+            for name in fields:
+                idx = defn.GetFieldIndex(name)
+                if idx < 0:
+                    raise KeyError("Illegal field requested in iter_batches(): %s" % name)
+                field_indices.append(idx)
+
+        self.ResetReading()
+        while True:
+            batch = _ogr.Layer__GetNextFeatureBatch(
+                self, batch_size, field_indices, include_fid,
+                geometry_formats[geometry_format], as_dict)
+            if not batch:
+                break
+            yield batch
+
     def schema(self):
         output = []
         defn = self.GetLayerDefn()
@@ -498,6 +597,439 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
 
 }
 
+%{
+#include <string>
+#include <vector>
+
+/* Same conversion as the one done by SWIG for the const char* return value */
+/* of Feature.GetFieldAsString() and FieldDefn.GetName() */
+static PyObject* OGRPythonStringFromCStr(const char* pszStr)
+{
+    return PyUnicode_DecodeUTF8(pszStr, strlen(pszStr), "surrogateescape");
+}
+
+/* Return the value of a field as Feature.GetField() does */
+static PyObject* OGRPythonGetFieldValue(OGRFeatureH hFeat, int iField,
+                                        OGRFieldType eType, bool bBoolean)
+{
+    if( !OGR_F_IsFieldSetAndNotNull(hFeat, iField) )
+    {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    switch( eType )
+    {
+        case OFTInteger:
+        {
+            const int nVal = OGR_F_GetFieldAsInteger(hFeat, iField);
+            return bBoolean ? PyBool_FromLong(nVal) : PyLong_FromLong(nVal);
+        }
+
+        case OFTInteger64:
+            return PyLong_FromLongLong(OGR_F_GetFieldAsInteger64(hFeat, iField));
+
+        case OFTReal:
+            return PyFloat_FromDouble(OGR_F_GetFieldAsDouble(hFeat, iField));
+
+        case OFTStringList:
+        {
+            char** papszList = OGR_F_GetFieldAsStringList(hFeat, iField);
+            if( papszList == NULL )
+            {
+                Py_INCREF(Py_None);
+                return Py_None;
+            }
+            const int nCount = CSLCount(papszList);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; ++i )
+            {
+                PyList_SetItem(poList, i, GDALPythonObjectFromCStr(papszList[i]));
+            }
+            return poList;
+        }
+
+        case OFTIntegerList:
+        {
+            int nCount = 0;
+            const int* panList = OGR_F_GetFieldAsIntegerList(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; ++i )
+            {
+                PyList_SetItem(poList, i,
+                               bBoolean ? PyBool_FromLong(panList[i])
+                                        : PyLong_FromLong(panList[i]));
+            }
+            return poList;
+        }
+
+        case OFTInteger64List:
+        {
+            int nCount = 0;
+            const GIntBig* panList = OGR_F_GetFieldAsInteger64List(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; ++i )
+            {
+                PyList_SetItem(poList, i, PyLong_FromLongLong(panList[i]));
+            }
+            return poList;
+        }
+
+        case OFTRealList:
+        {
+            int nCount = 0;
+            const double* padfList = OGR_F_GetFieldAsDoubleList(hFeat, iField, &nCount);
+            PyObject* poList = PyList_New(nCount);
+            if( poList == NULL )
+                return NULL;
+            for( int i = 0; i < nCount; ++i )
+            {
+                PyList_SetItem(poList, i, PyFloat_FromDouble(padfList[i]));
+            }
+            return poList;
+        }
+
+        default:
+            break;
+    }
+
+    PyObject* poRet = OGRPythonStringFromCStr(OGR_F_GetFieldAsString(hFeat, iField));
+    if( poRet == NULL )
+    {
+        PyErr_Clear();
+        int nBytes = 0;
+        const GByte* pabyData = OGR_F_GetFieldAsBinary(hFeat, iField, &nBytes);
+        poRet = PyBytes_FromStringAndSize(reinterpret_cast<const char*>(pabyData), nBytes);
+    }
+    return poRet;
+}
+
+/* Field types and names of a feature definition, as needed to convert */
+/* all the fields of a feature at once. */
+typedef struct
+{
+    OGRFieldDefnH hFieldDefn;
+    OGRFieldType eType;
+    OGRFieldSubType eSubType;
+    std::string osName;
+    PyObject* poName;
+} OGRPythonFieldTypeEntry;
+
+/* Table of the last feature definition used by Feature.items(), values() */
+/* and as_tuple(), which is typically the one of all the features of the */
+/* layer being iterated over. Only accessed with the GIL held. */
+static OGRFeatureDefnH hOGRPythonFieldTableDefn = NULL;
+static std::vector<OGRPythonFieldTypeEntry> aoOGRPythonFieldTable;
+
+/* Return the table of field types of the feature definition of hFeat. */
+/* As a feature definition may be modified, or destroyed and another one */
+/* created at the same address, the cached table is checked against the */
+/* current field definitions before being reused. */
+static const std::vector<OGRPythonFieldTypeEntry>* OGRPythonGetFieldTypeTable(OGRFeatureH hFeat)
+{
+    OGRFeatureDefnH hDefn = OGR_F_GetDefnRef(hFeat);
+    const int nFieldCount = OGR_FD_GetFieldCount(hDefn);
+
+    bool bValid = hDefn == hOGRPythonFieldTableDefn &&
+                  static_cast<size_t>(nFieldCount) == aoOGRPythonFieldTable.size();
+    for( int i = 0; bValid && i < nFieldCount; ++i )
+    {
+        const OGRPythonFieldTypeEntry& oEntry = aoOGRPythonFieldTable[i];
+        OGRFieldDefnH hFieldDefn = OGR_FD_GetFieldDefn(hDefn, i);
+        bValid = oEntry.hFieldDefn == hFieldDefn &&
+                 oEntry.eType == OGR_Fld_GetType(hFieldDefn) &&
+                 oEntry.eSubType == OGR_Fld_GetSubType(hFieldDefn) &&
+                 oEntry.osName == OGR_Fld_GetNameRef(hFieldDefn);
+    }
+    if( bValid )
+        return &aoOGRPythonFieldTable;
+
+    for( auto& oEntry: aoOGRPythonFieldTable )
+        Py_XDECREF(oEntry.poName);
+    aoOGRPythonFieldTable.clear();
+    hOGRPythonFieldTableDefn = NULL;
+
+    std::vector<OGRPythonFieldTypeEntry> aoTable;
+    for( int i = 0; i < nFieldCount; ++i )
+    {
+        OGRPythonFieldTypeEntry oEntry;
+        oEntry.hFieldDefn = OGR_FD_GetFieldDefn(hDefn, i);
+        oEntry.eType = OGR_Fld_GetType(oEntry.hFieldDefn);
+        oEntry.eSubType = OGR_Fld_GetSubType(oEntry.hFieldDefn);
+        oEntry.osName = OGR_Fld_GetNameRef(oEntry.hFieldDefn);
+        oEntry.poName = OGRPythonStringFromCStr(oEntry.osName.c_str());
+        if( oEntry.poName == NULL )
+        {
+            for( auto& oOtherEntry: aoTable )
+                Py_DECREF(oOtherEntry.poName);
+            return NULL;
+        }
+        aoTable.push_back(std::move(oEntry));
+    }
+    aoOGRPythonFieldTable = std::move(aoTable);
+    hOGRPythonFieldTableDefn = hDefn;
+    return &aoOGRPythonFieldTable;
+}
+
+/* Return the values of all the fields of a feature, as a tuple, a list */
+/* or a dictionary indexed by field names */
+typedef enum
+{
+    OGR_PYTHON_FIELDS_AS_TUPLE,
+    OGR_PYTHON_FIELDS_AS_LIST,
+    OGR_PYTHON_FIELDS_AS_DICT
+} OGRPythonFieldsContainer;
+
+static PyObject* OGRPythonGetFieldValues(OGRFeatureH hFeat,
+                                         OGRPythonFieldsContainer eContainer)
+{
+    const std::vector<OGRPythonFieldTypeEntry>* paoTable = OGRPythonGetFieldTypeTable(hFeat);
+    if( paoTable == NULL )
+        return NULL;
+    const Py_ssize_t nFieldCount = static_cast<Py_ssize_t>(paoTable->size());
+
+    PyObject* poRet = eContainer == OGR_PYTHON_FIELDS_AS_TUPLE ? PyTuple_New(nFieldCount) :
+                      eContainer == OGR_PYTHON_FIELDS_AS_LIST ? PyList_New(nFieldCount) :
+                                                                PyDict_New();
+    if( poRet == NULL )
+        return NULL;
+    for( Py_ssize_t i = 0; i < nFieldCount; ++i )
+    {
+        const OGRPythonFieldTypeEntry& oEntry = (*paoTable)[i];
+        PyObject* poValue = OGRPythonGetFieldValue(
+            hFeat, static_cast<int>(i), oEntry.eType, oEntry.eSubType == OFSTBoolean);
+        if( poValue == NULL )
+        {
+            Py_DECREF(poRet);
+            return NULL;
+        }
+        if( eContainer == OGR_PYTHON_FIELDS_AS_TUPLE )
+        {
+            PyTuple_SET_ITEM(poRet, i, poValue);
+        }
+        else if( eContainer == OGR_PYTHON_FIELDS_AS_LIST )
+        {
+            PyList_SET_ITEM(poRet, i, poValue);
+        }
+        else
+        {
+            /* If several fields have the same name, the value of the */
+            /* first one is used, as in Feature.GetField(name) */
+            PyObject* poSet = PyDict_SetDefault(poRet, oEntry.poName, poValue);
+            Py_DECREF(poValue);
+            if( poSet == NULL )
+            {
+                Py_DECREF(poRet);
+                return NULL;
+            }
+        }
+    }
+    return poRet;
+}
+
+/* Geometry formats of Layer.iter_batches() */
+typedef enum
+{
+    OGR_PYTHON_GEOMETRY_NONE,
+    OGR_PYTHON_GEOMETRY_WKB,
+    OGR_PYTHON_GEOMETRY_WKT,
+    OGR_PYTHON_GEOMETRY_OGR
+} OGRPythonGeometryFormat;
+
+static PyObject* OGRPythonGeometryToPyObject(OGRGeometryH hGeom,
+                                             OGRPythonGeometryFormat eFormat)
+{
+    if( hGeom == NULL )
+    {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    if( eFormat == OGR_PYTHON_GEOMETRY_WKB )
+    {
+        const size_t nSize = OGR_G_WkbSizeEx(hGeom);
+        PyObject* poRet = PyBytes_FromStringAndSize(NULL, static_cast<Py_ssize_t>(nSize));
+        if( poRet != NULL )
+        {
+            OGR_G_ExportToIsoWkb(hGeom, wkbNDR,
+                                 reinterpret_cast<unsigned char*>(PyBytes_AS_STRING(poRet)));
+        }
+        OGR_G_DestroyGeometry(hGeom);
+        return poRet;
+    }
+
+    if( eFormat == OGR_PYTHON_GEOMETRY_WKT )
+    {
+        char* pszWKT = NULL;
+        OGR_G_ExportToIsoWkt(hGeom, &pszWKT);
+        OGR_G_DestroyGeometry(hGeom);
+        PyObject* poRet = GDALPythonObjectFromCStr(pszWKT ? pszWKT : "");
+        CPLFree(pszWKT);
+        return poRet;
+    }
+
+    return SWIG_NewPointerObj(hGeom, SWIGTYPE_p_OGRGeometryShadow, SWIG_POINTER_OWN);
+}
+
+/* Read the next batch of features of a layer as a list of tuples or */
+/* dictionaries. In the tuples, the FID comes first, then the fields, */
+/* and then the geometry of the first geometry field. */
+static PyObject* OGRPythonGetNextFeatureBatch(OGRLayerH hLayer, int nBatchSize,
+                                              int nFields, const int* panFields,
+                                              bool bIncludeFID,
+                                              OGRPythonGeometryFormat eGeometryFormat,
+                                              bool bAsDict)
+{
+    OGRFeatureDefnH hDefn = OGR_L_GetLayerDefn(hLayer);
+    const int nDefnFieldCount = OGR_FD_GetFieldCount(hDefn);
+    if( OGR_FD_GetGeomFieldCount(hDefn) == 0 )
+        eGeometryFormat = OGR_PYTHON_GEOMETRY_NONE;
+
+    std::vector<OGRFieldType> aeTypes;
+    std::vector<bool> abBoolean;
+    for( int i = 0; i < nFields; ++i )
+    {
+        if( panFields[i] < 0 || panFields[i] >= nDefnFieldCount )
+        {
+            CPLError(CE_Failure, CPLE_AppDefined, FIELD_INDEX_ERROR_TMPL, panFields[i]);
+            Py_INCREF(Py_None);
+            return Py_None;
+        }
+        OGRFieldDefnH hFieldDefn = OGR_FD_GetFieldDefn(hDefn, panFields[i]);
+        aeTypes.push_back(OGR_Fld_GetType(hFieldDefn));
+        abBoolean.push_back(OGR_Fld_GetSubType(hFieldDefn) == OFSTBoolean);
+    }
+
+    /* Read the features of the batch without holding the GIL */
+    std::vector<OGRFeatureH> ahFeatures;
+    bool bError = false;
+    const int bUseExceptions = GetUseExceptions();
+    SWIG_PYTHON_THREAD_BEGIN_ALLOW;
+    CPLErrorReset();
+    while( static_cast<int>(ahFeatures.size()) < nBatchSize )
+    {
+        OGRFeatureH hFeat = OGR_L_GetNextFeature(hLayer);
+        /* Same as Layer.GetNextFeature(), which raises an exception if */
+        /* an error is emitted while reading a feature */
+        if( bUseExceptions && CPLGetLastErrorType() == CE_Failure )
+        {
+            if( hFeat )
+                OGR_F_Destroy(hFeat);
+            bError = true;
+            break;
+        }
+        if( hFeat == NULL )
+            break;
+        ahFeatures.push_back(hFeat);
+    }
+    SWIG_PYTHON_THREAD_END_ALLOW;
+
+    if( bError )
+    {
+        for( OGRFeatureH hFeat: ahFeatures )
+            OGR_F_Destroy(hFeat);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    /* Keys of the dictionaries, with the same names as in GetArrowStream() */
+    std::vector<PyObject*> apoKeys;
+    PyObject* poRet = NULL;
+    if( bAsDict )
+    {
+        const char* pszFIDColumn = OGR_L_GetFIDColumn(hLayer);
+        apoKeys.push_back(OGRPythonStringFromCStr(
+            pszFIDColumn[0] ? pszFIDColumn : "OGC_FID"));
+        for( int i = 0; i < nFields; ++i )
+        {
+            apoKeys.push_back(OGRPythonStringFromCStr(
+                OGR_Fld_GetNameRef(OGR_FD_GetFieldDefn(hDefn, panFields[i]))));
+        }
+        const char* pszGeomColumn = OGR_L_GetGeometryColumn(hLayer);
+        apoKeys.push_back(OGRPythonStringFromCStr(
+            pszGeomColumn[0] ? pszGeomColumn : "wkb_geometry"));
+        for( PyObject* poKey: apoKeys )
+        {
+            if( poKey == NULL )
+                goto end;
+        }
+    }
+
+    poRet = PyList_New(static_cast<Py_ssize_t>(ahFeatures.size()));
+    if( poRet == NULL )
+        goto end;
+    for( size_t iFeat = 0; iFeat < ahFeatures.size(); ++iFeat )
+    {
+        OGRFeatureH hFeat = ahFeatures[iFeat];
+        const Py_ssize_t nValues = (bIncludeFID ? 1 : 0) + nFields +
+            (eGeometryFormat != OGR_PYTHON_GEOMETRY_NONE ? 1 : 0);
+        PyObject* poRow = bAsDict ? PyDict_New() : PyTuple_New(nValues);
+        if( poRow == NULL )
+        {
+            Py_CLEAR(poRet);
+            goto end;
+        }
+        PyList_SET_ITEM(poRet, static_cast<Py_ssize_t>(iFeat), poRow);
+
+        Py_ssize_t iValue = 0;
+        for( int i = -1; i <= nFields; ++i )
+        {
+            PyObject* poValue;
+            if( i < 0 )
+            {
+                if( !bIncludeFID )
+                    continue;
+                poValue = PyLong_FromLongLong(OGR_F_GetFID(hFeat));
+            }
+            else if( i < nFields )
+            {
+                poValue = OGRPythonGetFieldValue(hFeat, panFields[i], aeTypes[i], abBoolean[i]);
+            }
+            else
+            {
+                if( eGeometryFormat == OGR_PYTHON_GEOMETRY_NONE )
+                    continue;
+                poValue = OGRPythonGeometryToPyObject(OGR_F_StealGeometry(hFeat),
+                                                      eGeometryFormat);
+            }
+            if( poValue == NULL )
+            {
+                Py_CLEAR(poRet);
+                goto end;
+            }
+            if( bAsDict )
+            {
+                const int nErr = PyDict_SetItem(poRow, apoKeys[i + 1], poValue);
+                Py_DECREF(poValue);
+                if( nErr != 0 )
+                {
+                    Py_CLEAR(poRet);
+                    goto end;
+                }
+            }
+            else
+            {
+                PyTuple_SET_ITEM(poRow, iValue, poValue);
+            }
+            ++iValue;
+        }
+    }
+
+end:
+    for( PyObject* poKey: apoKeys )
+        Py_XDECREF(poKey);
+    for( OGRFeatureH hFeat: ahFeatures )
+        OGR_F_Destroy(hFeat);
+    return poRet;
+}
+%}
+
 %extend OGRFeatureShadow {
 
   %apply ( const char *utf8_string ) { (const char* value) };
@@ -506,6 +1038,50 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
   }
   %clear (const char* value );
 
+  PyObject* _GetFieldAsPyObject(int id) {
+    PyObject* ret;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    OGRFieldDefnH hFieldDefn = OGR_F_GetFieldDefnRef(self, id);
+    if( hFieldDefn == NULL )
+    {
+        /* Emits the same error as Feature.IsFieldSet() */
+        OGR_F_IsFieldSetAndNotNull(self, id);
+        Py_INCREF(Py_None);
+        ret = Py_None;
+    }
+    else
+    {
+        ret = OGRPythonGetFieldValue(self, id, OGR_Fld_GetType(hFieldDefn),
+                                     OGR_Fld_GetSubType(hFieldDefn) == OFSTBoolean);
+    }
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return ret;
+  }
+
+  PyObject* _GetFieldsAsTuple() {
+    PyObject* ret;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    ret = OGRPythonGetFieldValues(self, OGR_PYTHON_FIELDS_AS_TUPLE);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return ret;
+  }
+
+  PyObject* _GetFieldsAsList() {
+    PyObject* ret;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    ret = OGRPythonGetFieldValues(self, OGR_PYTHON_FIELDS_AS_LIST);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return ret;
+  }
+
+  PyObject* _GetFieldsAsDict() {
+    PyObject* ret;
+    SWIG_PYTHON_THREAD_BEGIN_BLOCK;
+    ret = OGRPythonGetFieldValues(self, OGR_PYTHON_FIELDS_AS_DICT);
+    SWIG_PYTHON_THREAD_END_BLOCK;
+    return ret;
+  }
+
   %pythoncode %{
     def Reference(self):
       pass
@@ -643,38 +1219,9 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         """
         if isinstance(fld_index, str):
             fld_index = self._getfieldindex(fld_index)
-        if (fld_index < 0) or (fld_index > self.GetFieldCount()):
+        if (fld_index < 0) or (fld_index > _ogr.Feature_GetFieldCount(self)):
             raise KeyError("Illegal field requested in GetField()")
-        if not (self.IsFieldSet(fld_index)) or self.IsFieldNull(fld_index):
-            return None
-        fld_type = self.GetFieldType(fld_index)
-        if fld_type == OFTInteger:
-            if self.GetFieldDefnRef(fld_index).GetSubType() == OFSTBoolean:
-                return bool(self.GetFieldAsInteger(fld_index))
-            return self.GetFieldAsInteger(fld_index)
-        if fld_type == OFTInteger64:
-            return self.GetFieldAsInteger64(fld_index)
-        if fld_type == OFTReal:
-            return self.GetFieldAsDouble(fld_index)
-        if fld_type == OFTStringList:
-            return self.GetFieldAsStringList(fld_index)
-        if fld_type == OFTIntegerList:
-            ret = self.GetFieldAsIntegerList(fld_index)
-            if self.GetFieldDefnRef(fld_index).GetSubType() == OFSTBoolean:
-                 ret = [bool(x) for x in ret]
-            return ret
-        if fld_type == OFTInteger64List:
-            return self.GetFieldAsInteger64List(fld_index)
-        if fld_type == OFTRealList:
-            return self.GetFieldAsDoubleList(fld_index)
-        ## if fld_type == OFTDateTime or fld_type == OFTDate or fld_type == OFTTime:
-        #     return self.GetFieldAsDate(fld_index)
-        # default to returning as a string.  Should we add more types?
-        try:
-            return self.GetFieldAsString(fld_index)
-        except:
-            # For Python3 on non-UTF8 strings
-            return self.GetFieldAsBinary(fld_index)
+        return _ogr.Feature__GetFieldAsPyObject(self, fld_index)
 
     def SetFieldBinary(self, field_index_or_name, value):
         """
@@ -747,12 +1294,40 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         return names
 
     def items(self):
-        """Return a dictionary with the field names as key, and their value in the feature"""
-        keys = self.keys()
-        output = {}
-        for key in keys:
-            output[key] = self.GetField(key)
-        return output
+        """Return a dictionary with the field names as key, and their value in the feature
+
+        The values are the ones returned by :py:meth:`GetField`. All the fields
+        are converted in a single call, which is much faster than calling
+        :py:meth:`GetField` for each field.
+        """
+        return _ogr.Feature__GetFieldsAsDict(self)
+
+    def values(self):
+        """Return the list of the values of the fields of the feature
+
+        The values are the ones returned by :py:meth:`GetField`, in the order
+        of the fields of the layer definition.
+
+        .. versionadded:: 3.14
+        """
+        return _ogr.Feature__GetFieldsAsList(self)
+
+    def as_tuple(self):
+        """Return a tuple with the values of the fields of the feature
+
+        The values are the ones returned by :py:meth:`GetField`, in the order
+        of the fields of the layer definition.
+
+        .. versionadded:: 3.14
+
+        Examples
+        --------
+        >>> with gdal.OpenEx("poly.shp", gdal.OF_VECTOR) as ds:
+        ...     lyr = ds.GetLayer(0)
+        ...     for f in lyr:
+        ...         area, eas_id, prfedea = f.as_tuple()
+        """
+        return _ogr.Feature__GetFieldsAsTuple(self)
 
     def geometry(self):
         """ Return the feature geometry
@@ -819,12 +1394,7 @@ def _WarnIfUserHasNotSpecifiedIfUsingExceptions():
         if fid != NullFID:
             output['id'] = fid
 
-        for key in self.keys():
-            fld_defn = self.GetFieldDefnRef(self.GetFieldIndex(key))
-            if fld_defn.GetType() == _ogr.OFTInteger and fld_defn.GetSubType() == _ogr.OFSTBoolean:
-                output['properties'][key] = bool(self.GetField(key))
-            else:
-                output['properties'][key] = self.GetField(key)
+        output['properties'] = self.items()
 
         if not as_object:
             output = simplejson.dumps(output)
@@ -315,6 +315,17 @@ def get_data_type(data_type: Optional[DataTypeOrStr]):
         return data_type
 
 
+def get_num_threads(num_threads: Optional[Union[int, str]]) -> int:
+    """returns the number of worker threads from an int or a "ALL_CPUS" string"""
+    if num_threads is None:
+        return 1
+    if isinstance(num_threads, str):
+        if num_threads.upper() == "ALL_CPUS":
+            return gdal.GetNumCPUs()
+        num_threads = int(num_threads)
+    return max(1, num_threads)
+
+
 def get_raster_bands(ds: gdal.Dataset) -> Iterator[gdal.Band]:
     return (ds.GetRasterBand(i + 1) for i in range(ds.RasterCount))
 
@@ -19,8 +19,11 @@
 # SPDX-License-Identifier: MIT
 # ******************************************************************************
 
+import array
+import collections
 import contextlib
 import glob
+import gzip
 import json
 import logging
 import math
@@ -28,12 +31,13 @@ import optparse
 import os
 import shutil
 import stat
+import struct
 import sys
 import tempfile
 import threading
 import warnings
 from functools import partial
-from typing import Any, Dict, List, NoReturn, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, NoReturn, Optional, Tuple
 from uuid import uuid4
 from xml.etree import ElementTree
 
@@ -1275,9 +1279,63 @@ def _get_creation_options(options):
     return copts
 
 
-def create_base_tile(
-    tile_job_info: "TileJobInfo", tmsMap: dict, tile_detail: "TileDetail"
+def write_tile(
+    tile_job_info: "TileJobInfo",
+    dstile: gdal.Dataset,
+    tilefilename: str,
+    tile: Tuple[int, int, int],
+    encoded_tiles: Optional[List[Tuple[Tuple[int, int, int], bytes]]] = None,
 ) -> None:
+    """Encode a tile to its file, or in memory if encoded_tiles is specified.
+
+    In the latter case, a ((tz, tx, ty), data) tuple, with ty in the TMS
+    convention, is appended to encoded_tiles.
+    """
+
+    out_drv = gdal.GetDriverByName(tile_job_info.tile_driver)
+    if encoded_tiles is not None:
+        tilefilename = "/vsimem/gdal2tiles_%s.%s" % (
+            uuid4(),
+            tile_job_info.tile_extension,
+        )
+
+    # Write a copy of tile to png/jpg
+    out_drv.CreateCopy(
+        tilefilename,
+        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
+        strict=0,
+        options=_get_creation_options(tile_job_info.options),
+    )
+
+    # Remove useless side car file
+    aux_xml = tilefilename + ".aux.xml"
+    if gdal.VSIStatL(aux_xml) is not None:
+        gdal.Unlink(aux_xml)
+
+    if encoded_tiles is not None:
+        f = gdal.VSIFOpenL(tilefilename, "rb")
+        try:
+            size = gdal.VSIStatL(tilefilename).size
+            encoded_tiles.append((tile, gdal.VSIFReadL(1, size, f)))
+        finally:
+            gdal.VSIFCloseL(f)
+            gdal.Unlink(tilefilename)
+
+
+def create_base_tile(
+    tile_job_info: "TileJobInfo",
+    tmsMap: dict,
+    tile_detail: "TileDetail",
+    encoded_tiles: Optional[List[Tuple[Tuple[int, int, int], bytes]]] = None,
+) -> Optional[bytes]:
+    """Generate a base tile from the input raster.
+
+    If encoded_tiles is specified, the encoded tile is appended to it instead
+    of being written to its file (see write_tile()).
+
+    Returns the content of the tile (all bands, including alpha), or None if
+    no tile was created.
+    """
 
     if tmsMap is None:
         _, tmsMap = get_profile_list_and_tmsMap()
@@ -1298,7 +1356,6 @@ def create_base_tile(
         threadLocal.cached_ds = ds
 
     mem_drv = gdal.GetDriverByName("MEM")
-    out_drv = gdal.GetDriverByName(tile_job_info.tile_driver)
     alphaband = ds.GetRasterBand(1).GetMaskBand()
 
     tx = tile_detail.tx
@@ -1329,7 +1386,29 @@ def create_base_tile(
     # Query is in 'nearest neighbour' but can be bigger in then the tile_size
     # We scale down the query to the tile_size by supplied algorithm.
 
-    if rxsize != 0 and rysize != 0 and wxsize != 0 and wysize != 0:
+    if tile_detail.metatile_size > 1:
+        # Slice the tile from the metatile it belongs to
+        dsmeta = read_metatile(ds, tile_detail, tilebands)
+        alpha = dsmeta.GetRasterBand(tilebands).ReadRaster(
+            tile_detail.mx, tile_detail.my, querysize, querysize
+        )
+
+        # Detect totally transparent tile and skip its creation
+        if tile_job_info.exclude_transparent and len(alpha) == alpha.count(
+            "\x00".encode("ascii")
+        ):
+            return
+
+        data = dsmeta.ReadRaster(
+            tile_detail.mx,
+            tile_detail.my,
+            querysize,
+            querysize,
+            band_list=list(range(1, dataBandsCount + 1)),
+        )
+        wx, wy, wxsize, wysize = 0, 0, querysize, querysize
+
+    elif rxsize != 0 and rysize != 0 and wxsize != 0 and wysize != 0:
         alpha = alphaband.ReadRaster(rx, ry, rxsize, rysize, wxsize, wysize)
 
         # Detect totally transparent tile and skip its creation
@@ -1390,18 +1469,11 @@ def create_base_tile(
 
     del data
 
-    # Write a copy of tile to png/jpg
-    out_drv.CreateCopy(
-        tilefilename,
-        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
-        strict=0,
-        options=_get_creation_options(options),
-    )
+    tile_data = dstile.ReadRaster(0, 0, tile_size, tile_size)
 
-    # Remove useless side car file
-    aux_xml = tilefilename + ".aux.xml"
-    if gdal.VSIStatL(aux_xml) is not None:
-        gdal.Unlink(aux_xml)
+    write_tile(
+        tile_job_info, dstile, tilefilename, (tz, tx, tile_detail.ty_tms), encoded_tiles
+    )
 
     del dstile
 
@@ -1430,6 +1502,53 @@ def create_base_tile(
                         ).encode("utf-8")
                     )
 
+    return tile_data
+
+
+def read_metatile(
+    ds: gdal.Dataset, tile_detail: "TileDetail", tilebands: int
+) -> gdal.Dataset:
+    """
+    Return an in-memory dataset with the content of the metatile of a base
+    tile, read from the input raster with a single ReadRaster() request.
+
+    The last read metatile is cached, so that the other tiles of a metatile,
+    generated in a row by create_tile_subtree(), are just sliced from it.
+    """
+
+    metatile_size = tile_detail.metatile_size
+    key = (
+        ds.GetDescription(),
+        tile_detail.tz,
+        tile_detail.tx // metatile_size,
+        tile_detail.ty_tms // metatile_size,
+    )
+    cached_metatile = getattr(threadLocal, "cached_metatile", None)
+    if cached_metatile and cached_metatile[0] == key:
+        return cached_metatile[1]
+    threadLocal.cached_metatile = None
+
+    size = metatile_size * tile_detail.querysize
+    dsmeta = gdal.GetDriverByName("MEM").Create("", size, size, tilebands)
+    dsmeta.GetRasterBand(tilebands).SetColorInterpretation(gdal.GCI_AlphaBand)
+
+    rx, ry = tile_detail.rx, tile_detail.ry
+    rxsize, rysize = tile_detail.rxsize, tile_detail.rysize
+    wx, wy = tile_detail.wx, tile_detail.wy
+    wxsize, wysize = tile_detail.wxsize, tile_detail.wysize
+    band_list = list(range(1, tilebands))
+    if rxsize != 0 and rysize != 0 and wxsize != 0 and wysize != 0:
+        alphaband = ds.GetRasterBand(1).GetMaskBand()
+        alpha = alphaband.ReadRaster(rx, ry, rxsize, rysize, wxsize, wysize)
+        data = ds.ReadRaster(
+            rx, ry, rxsize, rysize, wxsize, wysize, band_list=band_list
+        )
+        dsmeta.WriteRaster(wx, wy, wxsize, wysize, data, band_list=band_list)
+        dsmeta.WriteRaster(wx, wy, wxsize, wysize, alpha, band_list=[tilebands])
+
+    threadLocal.cached_metatile = (key, dsmeta)
+    return dsmeta
+
 
 def remove_alpha_band(src_ds):
     if (
@@ -1463,6 +1582,163 @@ def remove_alpha_band(src_ds):
     return dst_ds
 
 
+def get_tile_filename(
+    tile_job_info: "TileJobInfo", tz: int, tx: int, ty: int, tmsMap: dict
+) -> str:
+    """Return the filename of a tile, from its TMS coordinates"""
+
+    ty_real = GDAL2Tiles.getYTile(ty, tz, tile_job_info.options, tmsMap)
+    return os.path.join(
+        tile_job_info.output_file_path,
+        str(tz),
+        str(tx),
+        "%s.%s" % (ty_real, tile_job_info.tile_extension),
+    )
+
+
+def read_tile_data(tilefilename: str, tile_job_info: "TileJobInfo") -> Optional[bytes]:
+    """Read the content of a tile file (all bands, including alpha), or None if
+    the file does not exist"""
+
+    if not isfile(tilefilename):
+        return None
+
+    mem_driver = gdal.GetDriverByName("MEM")
+    tilebands = tile_job_info.nb_data_bands + 1
+
+    dsquerytile = gdal.Open(tilefilename, gdal.GA_ReadOnly)
+
+    if (
+        tile_job_info.tile_driver == "JPEG"
+        and dsquerytile.RasterCount == 3
+        and tilebands == 2
+    ):
+        # Input is RGB with R=G=B. Add An alpha band
+        tmp_ds = mem_driver.Create(
+            "", dsquerytile.RasterXSize, dsquerytile.RasterYSize, 2
+        )
+        tmp_ds.GetRasterBand(1).WriteRaster(
+            0,
+            0,
+            tile_job_info.tile_size,
+            tile_job_info.tile_size,
+            dsquerytile.GetRasterBand(1).ReadRaster(),
+        )
+        mask = bytearray([255] * (tile_job_info.tile_size * tile_job_info.tile_size))
+        tmp_ds.GetRasterBand(2).WriteRaster(
+            0,
+            0,
+            tile_job_info.tile_size,
+            tile_job_info.tile_size,
+            mask,
+        )
+        tmp_ds.GetRasterBand(2).SetColorInterpretation(gdal.GCI_AlphaBand)
+        dsquerytile = tmp_ds
+    elif dsquerytile.RasterCount == tilebands - 1:
+        # assume that the alpha band is missing and add it
+        tmp_ds = mem_driver.CreateCopy("", dsquerytile, 0)
+        tmp_ds.AddBand()
+        mask = bytearray([255] * (tile_job_info.tile_size * tile_job_info.tile_size))
+        tmp_ds.WriteRaster(
+            0,
+            0,
+            tile_job_info.tile_size,
+            tile_job_info.tile_size,
+            mask,
+            band_list=[tilebands],
+        )
+        dsquerytile = tmp_ds
+    elif dsquerytile.RasterCount != tilebands:
+        raise Exception(
+            "Unexpected number of bands in base tile. Got %d, expected %d"
+            % (dsquerytile.RasterCount, tilebands)
+        )
+
+    return dsquerytile.ReadRaster(
+        0, 0, tile_job_info.tile_size, tile_job_info.tile_size
+    )
+
+
+def get_mbtiles_tile(filename: str, tz: int, tx: int, ty: int) -> Optional[bytes]:
+    """Return the encoded content of a tile of a MBTiles file, or None"""
+
+    import sqlite3
+
+    conn = getattr(threadLocal, "mbtiles_conn", None)
+    if conn is None or threadLocal.mbtiles_filename != filename:
+        if not os.path.exists(filename):
+            return None
+        conn = sqlite3.connect(filename)
+        threadLocal.mbtiles_conn = conn
+        threadLocal.mbtiles_filename = filename
+    row = conn.execute(
+        "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? "
+        "AND tile_row = ?",
+        (tz, tx, ty),
+    ).fetchone()
+    return None if row is None else bytes(row[0])
+
+
+def tile_exists(
+    tile_job_info: "TileJobInfo", tz: int, tx: int, ty: int, tmsMap: dict
+) -> bool:
+    """Return whether a tile, given by its TMS coordinates, has already been
+    generated"""
+
+    if tile_job_info.tile_container == "MBTiles":
+        return get_mbtiles_tile(tile_job_info.output_file_path, tz, tx, ty) is not None
+    return isfile(get_tile_filename(tile_job_info, tz, tx, ty, tmsMap))
+
+
+def get_tile_manifest(tile_job_info: "TileJobInfo") -> Optional["TileManifest"]:
+    """Return the completion manifest, as it was when tiling started"""
+
+    key = (tile_job_info.options.manifest, tile_job_info.manifest_size)
+    cached_manifest = getattr(threadLocal, "cached_manifest", None)
+    if cached_manifest is None or cached_manifest[0] != key:
+        manifest = TileManifest.read(tile_job_info, tile_job_info.manifest_size)
+        cached_manifest = (key, manifest)
+        threadLocal.cached_manifest = cached_manifest
+    return cached_manifest[1]
+
+
+def tile_is_generated(
+    tile_job_info: "TileJobInfo", tz: int, tx: int, ty: int, tmsMap: dict
+) -> bool:
+    """Return whether a tile, given by its TMS coordinates, has already been
+    generated, for --resume: according to the completion manifest if there is
+    one, or to the existence of the tile otherwise"""
+
+    if tile_job_info.manifest_size is not None:
+        manifest = get_tile_manifest(tile_job_info)
+        return manifest is not None and manifest.is_complete(tz, tx, ty)
+    return tile_exists(tile_job_info, tz, tx, ty, tmsMap)
+
+
+def read_tile(
+    tile_job_info: "TileJobInfo", tz: int, tx: int, ty: int, tmsMap: dict
+) -> Optional[bytes]:
+    """Read the content of a tile, given by its TMS coordinates, with all its
+    bands including alpha, or None if it does not exist"""
+
+    if tile_job_info.tile_container == "MBTiles":
+        encoded_data = get_mbtiles_tile(tile_job_info.output_file_path, tz, tx, ty)
+        if encoded_data is None:
+            return None
+        tmp_filename = "/vsimem/gdal2tiles_%s.%s" % (
+            uuid4(),
+            tile_job_info.tile_extension,
+        )
+        gdal.FileFromMemBuffer(tmp_filename, encoded_data)
+        try:
+            return read_tile_data(tmp_filename, tile_job_info)
+        finally:
+            gdal.Unlink(tmp_filename)
+    return read_tile_data(
+        get_tile_filename(tile_job_info, tz, tx, ty, tmsMap), tile_job_info
+    )
+
+
 def create_overview_tile(
     base_tz: int,
     base_tiles: List[Tuple[int, int]],
@@ -1470,8 +1746,20 @@ def create_overview_tile(
     tile_job_info: "TileJobInfo",
     options: Options,
     tmsMap: dict,
-):
-    """Generating an overview tile from no more than 4 underlying tiles(base tiles)"""
+    base_tiles_data: Optional[Dict[Tuple[int, int], Optional[bytes]]] = None,
+    encoded_tiles: Optional[List[Tuple[Tuple[int, int, int], bytes]]] = None,
+) -> Optional[bytes]:
+    """Generating an overview tile from no more than 4 underlying tiles(base tiles)
+
+    If base_tiles_data is specified, it maps base tiles to their content (or
+    None if they have not been created), and the base tile files are not read.
+    The caller is then responsible for the handling of --resume.
+
+    If encoded_tiles is specified, the encoded tile is appended to it instead
+    of being written to its file (see write_tile()).
+
+    Returns the content of the overview tile, or None if it was not created.
+    """
 
     if tmsMap is None:
         _, tmsMap = get_profile_list_and_tmsMap()
@@ -1489,14 +1777,12 @@ def create_overview_tile(
     )
     if options.verbose:
         logger.debug(tilefilename)
-    if options.resume and isfile(tilefilename):
+    if base_tiles_data is None and options.resume and isfile(tilefilename):
         if options.verbose:
             logger.debug("Tile generation skipped because of --resume")
-        return
+        return None
 
     mem_driver = gdal.GetDriverByName("MEM")
-    tile_driver = tile_job_info.tile_driver
-    out_driver = gdal.GetDriverByName(tile_driver)
 
     tilebands = tile_job_info.nb_data_bands + 1
 
@@ -1515,19 +1801,21 @@ def create_overview_tile(
     for base_tile in base_tiles:
         base_tx = base_tile[0]
         base_ty = base_tile[1]
-        base_ty_real = GDAL2Tiles.getYTile(base_ty, base_tz, options, tmsMap)
 
-        base_tile_path = os.path.join(
-            output_folder,
-            str(base_tz),
-            str(base_tx),
-            "%s.%s" % (base_ty_real, tile_job_info.tile_extension),
-        )
-        if not isfile(base_tile_path):
+        if base_tiles_data is None:
+            base_ty_real = GDAL2Tiles.getYTile(base_ty, base_tz, options, tmsMap)
+            base_tile_path = os.path.join(
+                output_folder,
+                str(base_tz),
+                str(base_tx),
+                "%s.%s" % (base_ty_real, tile_job_info.tile_extension),
+            )
+            base_data = read_tile_data(base_tile_path, tile_job_info)
+        else:
+            base_data = base_tiles_data.get(base_tile)
+        if base_data is None:
             continue
 
-        dsquerytile = gdal.Open(base_tile_path, gdal.GA_ReadOnly)
-
         if base_tx % 2 == 0:
             tileposx = 0
         else:
@@ -1544,60 +1832,6 @@ def create_overview_tile(
             else:
                 tileposy = 0
 
-        if (
-            tile_job_info.tile_driver == "JPEG"
-            and dsquerytile.RasterCount == 3
-            and tilebands == 2
-        ):
-            # Input is RGB with R=G=B. Add An alpha band
-            tmp_ds = mem_driver.Create(
-                "", dsquerytile.RasterXSize, dsquerytile.RasterYSize, 2
-            )
-            tmp_ds.GetRasterBand(1).WriteRaster(
-                0,
-                0,
-                tile_job_info.tile_size,
-                tile_job_info.tile_size,
-                dsquerytile.GetRasterBand(1).ReadRaster(),
-            )
-            mask = bytearray(
-                [255] * (tile_job_info.tile_size * tile_job_info.tile_size)
-            )
-            tmp_ds.GetRasterBand(2).WriteRaster(
-                0,
-                0,
-                tile_job_info.tile_size,
-                tile_job_info.tile_size,
-                mask,
-            )
-            tmp_ds.GetRasterBand(2).SetColorInterpretation(gdal.GCI_AlphaBand)
-            dsquerytile = tmp_ds
-        elif dsquerytile.RasterCount == tilebands - 1:
-            # assume that the alpha band is missing and add it
-            tmp_ds = mem_driver.CreateCopy("", dsquerytile, 0)
-            tmp_ds.AddBand()
-            mask = bytearray(
-                [255] * (tile_job_info.tile_size * tile_job_info.tile_size)
-            )
-            tmp_ds.WriteRaster(
-                0,
-                0,
-                tile_job_info.tile_size,
-                tile_job_info.tile_size,
-                mask,
-                band_list=[tilebands],
-            )
-            dsquerytile = tmp_ds
-        elif dsquerytile.RasterCount != tilebands:
-            raise Exception(
-                "Unexpected number of bands in base tile. Got %d, expected %d"
-                % (dsquerytile.RasterCount, tilebands)
-            )
-
-        base_data = dsquerytile.ReadRaster(
-            0, 0, tile_job_info.tile_size, tile_job_info.tile_size
-        )
-
         dsquery.WriteRaster(
             tileposx,
             tileposy,
@@ -1610,21 +1844,21 @@ def create_overview_tile(
         usable_base_tiles.append(base_tile)
 
     if not usable_base_tiles:
-        return
+        return None
 
     scale_query_to_tile(dsquery, dstile, options, tilefilename=tilefilename)
 
-    # Write a copy of tile to png/jpg
-    out_driver.CreateCopy(
+    tile_data = dstile.ReadRaster(
+        0, 0, tile_job_info.tile_size, tile_job_info.tile_size
+    )
+
+    write_tile(
+        tile_job_info,
+        dstile,
         tilefilename,
-        dstile if tile_job_info.tile_driver != "JPEG" else remove_alpha_band(dstile),
-        strict=0,
-        options=_get_creation_options(options),
+        (overview_tz, overview_tx, overview_ty),
+        encoded_tiles,
     )
-    # Remove useless side car file
-    aux_xml = tilefilename + ".aux.xml"
-    if gdal.VSIStatL(aux_xml) is not None:
-        gdal.Unlink(aux_xml)
 
     if options.verbose:
         logger.debug(
@@ -1657,34 +1891,874 @@ def create_overview_tile(
                     ).encode("utf-8")
                 )
 
+    return tile_data
 
-def group_overview_base_tiles(
-    base_tz: int, output_folder: str, tile_job_info: "TileJobInfo"
-) -> List[List[Tuple[int, int]]]:
-    """Group base tiles that belong to the same overview tile"""
 
-    overview_to_bases = {}
-    tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[base_tz]
-    for ty in range(tmaxy, tminy - 1, -1):
-        overview_ty = ty >> 1
-        for tx in range(tminx, tmaxx + 1):
-            overview_tx = tx >> 1
-            base_tile = (tx, ty)
-            overview_tile = (overview_tx, overview_ty)
+def get_tile_range(tile_job_info: "TileJobInfo", tz: int) -> Tuple[int, int, int, int]:
+    """Return the range of the tiles generated at a zoom level: the base tiles at
+    the max zoom, and the parents of the tiles of the next zoom level otherwise"""
 
-            if overview_tile not in overview_to_bases:
-                overview_to_bases[overview_tile] = []
+    if tz == tile_job_info.tmaxz:
+        return tuple(tile_job_info.tminmax[tz])
+    tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[tz + 1]
+    return (tminx >> 1, tminy >> 1, tmaxx >> 1, tmaxy >> 1)
 
-            overview_to_bases[overview_tile].append(base_tile)
 
-    # Create directories for the tiles
-    overview_tz = base_tz - 1
-    for tx in range(tminx, tmaxx + 1):
-        overview_tx = tx >> 1
-        tiledirname = os.path.join(output_folder, str(overview_tz), str(overview_tx))
-        makedirs(tiledirname)
+def get_subtree_ranges(
+    tile_job_info: "TileJobInfo",
+) -> Dict[int, Tuple[int, int, int, int]]:
+    """Return, for each zoom level, the range of the tiles that are generated or
+    that have generated descendants"""
+
+    subtree_ranges = {}
+    tminx, tminy, tmaxx, tmaxy = get_tile_range(tile_job_info, tile_job_info.tmaxz)
+    for tz in range(tile_job_info.tmaxz, tile_job_info.tminz - 1, -1):
+        if tz < tile_job_info.tmaxz:
+            rminx, rminy, rmaxx, rmaxy = get_tile_range(tile_job_info, tz)
+            tminx = min(tminx >> 1, rminx)
+            tminy = min(tminy >> 1, rminy)
+            tmaxx = max(tmaxx >> 1, rmaxx)
+            tmaxy = max(tmaxy >> 1, rmaxy)
+        subtree_ranges[tz] = (tminx, tminy, tmaxx, tmaxy)
+    return subtree_ranges
+
+
+def get_children_in_range(
+    tx: int, ty: int, tile_range: Tuple[int, int, int, int]
+) -> List[Tuple[int, int]]:
+    """Return the children of a tile within a range, in the order in which
+    base tiles were historically grouped"""
+
+    tminx, tminy, tmaxx, tmaxy = tile_range
+    return [
+        (base_tx, base_ty)
+        for base_ty in range(min(tmaxy, 2 * ty + 1), max(tminy, 2 * ty) - 1, -1)
+        for base_tx in range(max(tminx, 2 * tx), min(tmaxx, 2 * tx + 1) + 1)
+    ]
+
+
+def is_in_range(tx: int, ty: int, tile_range: Tuple[int, int, int, int]) -> bool:
+    tminx, tminy, tmaxx, tmaxy = tile_range
+    return tminx <= tx <= tmaxx and tminy <= ty <= tmaxy
+
+
+def quadtree_key(tile: Tuple[int, int]) -> int:
+    """Sort key to enumerate tiles in quadtree (Z-order) order, so that sibling
+    tiles are processed close to each other"""
+
+    tx, ty = tile
+    key = 0
+    for i in range(max(tx.bit_length(), ty.bit_length())):
+        key |= ((tx >> i) & 1) << (2 * i)
+        key |= ((ty >> i) & 1) << (2 * i + 1)
+    return key
+
+
+def create_tile_subtree(
+    tile_job_info: "TileJobInfo",
+    tmsMap: dict,
+    subtree: Tuple[int, int, int, List["TileDetail"]],
+) -> Tuple[
+    int,
+    int,
+    int,
+    Optional[bytes],
+    int,
+    Optional[List[Tuple[Tuple[int, int, int], bytes]]],
+]:
+    """
+    Generate the tiles of a subtree of the pyramid, given as a (tz, tx, ty,
+    tile_details) tuple with the details of its base tiles.
+
+    The base tiles are generated first, then each overview tile from the
+    in-memory content of its base tiles, so that they do not have to be read
+    back from their files. At most 4 tiles per zoom level are kept in memory.
+
+    Returns (tz, tx, ty, content of the root tile, number of processed tiles,
+    encoded tiles), where encoded tiles is only set when writing to a tile
+    container, to be written by the caller.
+    """
+
+    if tmsMap is None:
+        _, tmsMap = get_profile_list_and_tmsMap()
+
+    options = tile_job_info.options
+    subtree_ranges = get_subtree_ranges(tile_job_info)
+    root_tz, root_tx, root_ty, tile_details = subtree
+    tile_details = {
+        (tile_detail.tx, tile_detail.ty_tms): tile_detail
+        for tile_detail in tile_details
+    }
+    encoded_tiles = [] if tile_job_info.tile_container else None
+    nb_tiles = 0
+
+    def create_tile(tz, tx, ty, need_data):
+        nonlocal nb_tiles
+
+        if tz == tile_job_info.tmaxz:
+            # Count the base tiles skipped by generate_base_tiles() as processed
+            nb_tiles += 1
+            tile_detail = tile_details.get((tx, ty))
+            if tile_detail is not None:
+                return create_base_tile(
+                    tile_job_info, tmsMap, tile_detail, encoded_tiles
+                )
+            if need_data and options.resume:
+                if tile_job_info.manifest_size is not None and not tile_is_generated(
+                    tile_job_info, tz, tx, ty, tmsMap
+                ):
+                    return None
+                return read_tile(tile_job_info, tz, tx, ty, tmsMap)
+            return None
+
+        # Tiles outside of the range of their zoom level are only traversed
+        # to reach their descendants
+        generated = is_in_range(tx, ty, get_tile_range(tile_job_info, tz))
+        base_tiles = get_children_in_range(tx, ty, tile_job_info.tminmax[tz + 1])
+        skip = (
+            generated
+            and options.resume
+            and tile_is_generated(tile_job_info, tz, tx, ty, tmsMap)
+        )
+        base_tiles_data = {}
+        for child in get_children_in_range(tx, ty, subtree_ranges[tz + 1]):
+            base_tiles_data[child] = create_tile(
+                tz + 1,
+                child[0],
+                child[1],
+                generated and not skip and child in base_tiles,
+            )
+
+        if not generated:
+            return None
+        nb_tiles += 1
+
+        if skip:
+            if options.verbose:
+                logger.debug(get_tile_filename(tile_job_info, tz, tx, ty, tmsMap))
+                logger.debug("Tile generation skipped because of --resume")
+            return read_tile(tile_job_info, tz, tx, ty, tmsMap) if need_data else None
+
+        if not base_tiles:
+            return None
+        return create_overview_tile(
+            tz + 1,
+            base_tiles,
+            tile_job_info.output_file_path,
+            tile_job_info,
+            options,
+            tmsMap,
+            base_tiles_data,
+            encoded_tiles,
+        )
+
+    data = create_tile(root_tz, root_tx, root_ty, root_tz > tile_job_info.tminz)
+
+    # Metatiles do not span several subtrees
+    threadLocal.cached_metatile = None
+
+    return root_tz, root_tx, root_ty, data, nb_tiles, encoded_tiles
+
+
+class TilePyramid:
+    """
+    Schedule the generation of the tiles of all zoom levels.
+
+    The pyramid is split at a zoom level in subtrees, each one generated by a
+    job (see create_tile_subtree()). The overview tiles of the lower zoom
+    levels are generated from the content of the subtree roots, as soon as all
+    the children of a tile are available. This avoids both a barrier between
+    zoom levels and reading back the tiles from their files.
+
+    The subtrees are limited to max_subtree_depth zoom levels, so that the
+    details of their base tiles, generated as the jobs are consumed, remain
+    small. By default, that is 8 zoom levels, or 4 when writing to a tile
+    container, as the encoded tiles of the subtrees are then sent back to be
+    written by tile_container_writer.
+
+    If manifest_writer is specified, the tiles whose subtree is complete are
+    recorded into the completion manifest.
+    """
+
+    def __init__(
+        self,
+        tile_job_info: "TileJobInfo",
+        tmsMap: dict,
+        min_nb_jobs: int = 1,
+        tile_container_writer=None,
+        max_subtree_depth: Optional[int] = None,
+        manifest_writer: Optional["TileManifestWriter"] = None,
+    ) -> None:
+        self.tile_job_info = tile_job_info
+        self.tmsMap = tmsMap
+        self.tile_container_writer = tile_container_writer
+        self.manifest_writer = manifest_writer
+        self.subtree_ranges = get_subtree_ranges(tile_job_info)
+        tminz = tile_job_info.tminz
+        tmaxz = tile_job_info.tmaxz
+
+        # Split at the lowest zoom level with enough subtrees to keep all the
+        # workers busy
+        self.split_tz = tmaxz
+        for tz in range(tminz, tmaxz + 1):
+            tminx, tminy, tmaxx, tmaxy = self.subtree_ranges[tz]
+            if (tmaxx - tminx + 1) * (tmaxy - tminy + 1) >= min_nb_jobs:
+                self.split_tz = tz
+                break
+        # Subtrees must be made of whole metatiles
+        metatile_depth = tile_job_info.options.metatile.bit_length() - 1
+        self.split_tz = max(tminz, min(self.split_tz, tmaxz - metatile_depth))
+        if max_subtree_depth is None:
+            max_subtree_depth = 4 if tile_container_writer else 8
+        max_subtree_depth = max(max_subtree_depth, metatile_depth + 1)
+        self.split_tz = max(self.split_tz, tmaxz - max_subtree_depth + 1)
+
+        # Create directories for the tiles
+        if not tile_job_info.tile_container:
+            for tz in range(tmaxz, tminz - 1, -1):
+                tminx, _, tmaxx, _ = get_tile_range(tile_job_info, tz)
+                for tx in range(tminx, tmaxx + 1):
+                    makedirs(
+                        os.path.join(tile_job_info.output_file_path, str(tz), str(tx))
+                    )
+
+        # Content of the children already received by the tiles of the zoom
+        # levels below split_tz
+        self.received_children = {}
+
+        # Roots of the subtrees with nothing to generate, to be added by the
+        # thread calling add_subtree(), as get_jobs() may be consumed by
+        # another one.
+        self.empty_roots = collections.deque()
+
+    def get_root_range(self, tz: int) -> Tuple[int, int, int, int]:
+        """Return the range of the tiles of a zoom level up to split_tz that
+        are roots of subtrees or have such descendants"""
+
+        shift = self.split_tz - tz
+        return tuple(v >> shift for v in self.subtree_ranges[self.split_tz])
+
+    def get_base_range(self, tx: int, ty: int) -> Tuple[int, int, int, int]:
+        """Return the range of the base tiles of the subtree of a root"""
+
+        shift = self.tile_job_info.tmaxz - self.split_tz
+        tminx, tminy, tmaxx, tmaxy = self.tile_job_info.tminmax[
+            self.tile_job_info.tmaxz
+        ]
+        return (
+            max(tminx, tx << shift),
+            max(tminy, ty << shift),
+            min(tmaxx, ((tx + 1) << shift) - 1),
+            min(tmaxy, ((ty + 1) << shift) - 1),
+        )
+
+    def get_roots(self) -> Iterator[Tuple[int, int]]:
+        """Lazily generate the roots of the subtrees, in quadtree order"""
+
+        root_range = self.subtree_ranges[self.split_tz]
+
+        def get_descendant_roots(shift, tx, ty):
+            if shift == 0:
+                yield tx, ty
+                return
+            children = get_children_in_range(
+                tx, ty, tuple(v >> (shift - 1) for v in root_range)
+            )
+            for child in sorted(children, key=quadtree_key):
+                yield from get_descendant_roots(shift - 1, child[0], child[1])
+
+        # Start from the (possibly virtual) ancestor of all the roots
+        return get_descendant_roots(max(v.bit_length() for v in root_range), 0, 0)
+
+    def get_jobs(
+        self, generate_base_tiles: Callable[..., Iterator["TileDetail"]]
+    ) -> Iterator[Tuple[int, int, int, List["TileDetail"]]]:
+        """
+        Lazily generate the jobs of the subtrees, in quadtree order, with
+        the details of their base tiles returned by generate_base_tiles() for
+        a tile range (see GDAL2Tiles.generate_base_tiles()).
+        """
+
+        tile_job_info = self.tile_job_info
+        for tx, ty in self.get_roots():
+            if tile_job_info.manifest_size is not None and tile_is_generated(
+                tile_job_info, self.split_tz, tx, ty, self.tmsMap
+            ):
+                # Complete subtree, whose root only has to be read if its
+                # parent is generated again
+                details = []
+                if self.split_tz == tile_job_info.tminz or tile_is_generated(
+                    tile_job_info, self.split_tz - 1, tx >> 1, ty >> 1, self.tmsMap
+                ):
+                    self.empty_roots.append((tx, ty))
+                    continue
+            else:
+                details = list(generate_base_tiles(self.get_base_range(tx, ty)))
+            if not details and not tile_job_info.options.resume:
+                # Nothing to generate in that subtree
+                self.empty_roots.append((tx, ty))
+            else:
+                yield self.split_tz, tx, ty, details
+
+    def add_empty_subtrees(self) -> int:
+        """
+        Generate the overview tiles that were only waiting for subtrees with
+        nothing to generate.
+
+        Returns the number of processed tiles.
+        """
+
+        tile_job_info = self.tile_job_info
+        nb_tiles = 0
+        while self.empty_roots:
+            tx, ty = self.empty_roots.popleft()
+            # Count the tiles of the subtree as processed
+            for tz in range(self.split_tz, tile_job_info.tmaxz + 1):
+                shift = tz - self.split_tz
+                tminx, tminy, tmaxx, tmaxy = get_tile_range(tile_job_info, tz)
+                tminx, tminy = max(tminx, tx << shift), max(tminy, ty << shift)
+                tmaxx = min(tmaxx, ((tx + 1) << shift) - 1)
+                tmaxy = min(tmaxy, ((ty + 1) << shift) - 1)
+                nb_tiles += max(0, tmaxx - tminx + 1) * max(0, tmaxy - tminy + 1)
+            nb_tiles += self.add_tile(self.split_tz, tx, ty, None)
+        return nb_tiles
+
+    def add_subtree(
+        self,
+        subtree_result: Tuple[
+            int,
+            int,
+            int,
+            Optional[bytes],
+            int,
+            Optional[List[Tuple[Tuple[int, int, int], bytes]]],
+        ],
+    ) -> int:
+        """
+        Provide the result of create_tile_subtree() for a job, write its
+        encoded tiles to the tile container if needed, and generate the
+        overview tiles that were only waiting for its root, or for the
+        subtrees with nothing to generate.
+
+        Returns the number of processed tiles.
+        """
+
+        tz, tx, ty, data, nb_tiles, encoded_tiles = subtree_result
+        if encoded_tiles:
+            self.tile_container_writer.write_tiles(encoded_tiles)
+        nb_tiles += self.add_tile(tz, tx, ty, data)
+        return nb_tiles + self.add_empty_subtrees()
+
+    def add_tile(self, tz: int, tx: int, ty: int, data: Optional[bytes]) -> int:
+        """
+        Provide the content of a generated tile, and generate the overview
+        tiles that were only waiting for it.
+
+        Returns the number of generated overview tiles.
+        """
+
+        tile_job_info = self.tile_job_info
+        options = tile_job_info.options
+        encoded_tiles = [] if self.tile_container_writer else None
+        complete_subtrees = [(tz, tx, ty)]
+        nb_tiles = 0
+        while tz > tile_job_info.tminz:
+            parent = (tz - 1, tx >> 1, ty >> 1)
+            expected = get_children_in_range(
+                parent[1], parent[2], self.get_root_range(tz)
+            )
+            received = self.received_children.setdefault(parent, {})
+            received[(tx, ty)] = data
+            if len(received) < len(expected):
+                break
+            del self.received_children[parent]
+
+            tz, tx, ty = parent
+            complete_subtrees.append(parent)
+            data = None
+            if not is_in_range(tx, ty, get_tile_range(tile_job_info, tz)):
+                continue
+            base_tiles = get_children_in_range(tx, ty, tile_job_info.tminmax[tz + 1])
+            if options.resume and tile_is_generated(
+                tile_job_info, tz, tx, ty, self.tmsMap
+            ):
+                if options.verbose:
+                    logger.debug(
+                        get_tile_filename(tile_job_info, tz, tx, ty, self.tmsMap)
+                    )
+                    logger.debug("Tile generation skipped because of --resume")
+                if tz > tile_job_info.tminz:
+                    data = read_tile(tile_job_info, tz, tx, ty, self.tmsMap)
+            elif base_tiles:
+                data = create_overview_tile(
+                    tz + 1,
+                    base_tiles,
+                    tile_job_info.output_file_path,
+                    tile_job_info,
+                    options,
+                    self.tmsMap,
+                    received,
+                    encoded_tiles,
+                )
+            nb_tiles += 1
+
+        if encoded_tiles:
+            self.tile_container_writer.write_tiles(encoded_tiles)
+        if self.manifest_writer:
+            self.manifest_writer.add_complete_subtrees(complete_subtrees)
+        return nb_tiles
+
+
+def get_tile_container(output: str) -> Optional[str]:
+    """Return the single-file tile container format matching the extension of
+    the output, or None if tiles are written in a directory"""
+
+    ext = os.path.splitext(output)[1].lower()
+    return {".mbtiles": "MBTiles", ".pmtiles": "PMTiles"}.get(ext)
+
+
+class MBTilesWriter:
+    """
+    Write encoded tiles into a MBTiles file (https://github.com/mapbox/mbtiles-spec)
+
+    Tiles are inserted by batches of batch_size tiles, each in its own
+    transaction.
+    """
+
+    def __init__(self, tile_job_info: "TileJobInfo", batch_size: int = 1000) -> None:
+        import sqlite3
+
+        filename = tile_job_info.output_file_path
+        options = tile_job_info.options
+        if not options.resume and os.path.exists(filename):
+            os.unlink(filename)
+
+        self.conn = sqlite3.connect(filename)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS metadata (name text, value text)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tiles (zoom_level integer, "
+            "tile_column integer, tile_row integer, tile_data blob)"
+        )
+        self.conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles "
+            "(zoom_level, tile_column, tile_row)"
+        )
+
+        south, west, north, east = tile_job_info.swne
+        self.conn.execute("DELETE FROM metadata")
+        self.conn.executemany(
+            "INSERT INTO metadata (name, value) VALUES (?, ?)",
+            [
+                ("name", options.title),
+                ("format", tile_job_info.tile_extension),
+                ("type", "overlay"),
+                ("bounds", "%.10g,%.10g,%.10g,%.10g" % (west, south, east, north)),
+                ("minzoom", str(tile_job_info.tminz)),
+                ("maxzoom", str(tile_job_info.tmaxz)),
+            ],
+        )
+        self.conn.commit()
+
+        self.batch_size = batch_size
+        self.pending_tiles = []
+
+    def write_tiles(self, tiles: List[Tuple[Tuple[int, int, int], bytes]]) -> None:
+        # MBTiles uses the TMS convention for rows
+        for (tz, tx, ty), data in tiles:
+            self.pending_tiles.append((tz, tx, ty, data))
+        if len(self.pending_tiles) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending_tiles:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tiles (zoom_level, tile_column, tile_row, "
+                "tile_data) VALUES (?, ?, ?, ?)",
+                self.pending_tiles,
+            )
+            self.conn.commit()
+            self.pending_tiles = []
 
-    return list(overview_to_bases.values())
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+
+def pmtiles_tile_id(tz: int, tx: int, ty: int) -> int:
+    """Return the PMTiles tile id (position along the Hilbert curve of all zoom
+    levels) of a tile, with ty in the XYZ convention"""
+
+    tile_id = ((1 << (2 * tz)) - 1) // 3
+    for a in range(tz - 1, -1, -1):
+        s = 1 << a
+        rx = tx & s
+        ry = ty & s
+        tile_id += ((3 * rx) ^ ry) << a
+        if ry == 0:
+            if rx != 0:
+                tx = s - 1 - tx
+                ty = s - 1 - ty
+            tx, ty = ty, tx
+    return tile_id
+
+
+def _write_varint(buf: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+class PMTilesWriter:
+    """
+    Write encoded tiles into a PMTiles v3 archive (https://github.com/protomaps/PMTiles)
+
+    The tile data is appended to the archive as tiles are received, after
+    space reserved for the header and the root directory. The directories and
+    the metadata are written when closing the archive.
+    """
+
+    HEADER_SIZE = 127
+    ROOT_DIRECTORY_MAX_SIZE = 16384 - HEADER_SIZE
+    TILE_TYPES = {"png": 2, "jpg": 3, "webp": 4}
+
+    def __init__(self, tile_job_info: "TileJobInfo") -> None:
+        self.tile_job_info = tile_job_info
+        self.f = open(tile_job_info.output_file_path, "wb")
+        self.f.write(b"\0" * (self.HEADER_SIZE + self.ROOT_DIRECTORY_MAX_SIZE))
+        self.tile_data_offset = self.HEADER_SIZE + self.ROOT_DIRECTORY_MAX_SIZE
+        self.tile_data_length = 0
+        self.tile_ids = array.array("Q")
+        self.offsets = array.array("Q")
+        self.lengths = array.array("L")
+
+    def write_tiles(self, tiles: List[Tuple[Tuple[int, int, int], bytes]]) -> None:
+        for (tz, tx, ty), data in tiles:
+            self.tile_ids.append(pmtiles_tile_id(tz, tx, (1 << tz) - 1 - ty))
+            self.offsets.append(self.tile_data_length)
+            self.lengths.append(len(data))
+            self.f.write(data)
+            self.tile_data_length += len(data)
+
+    @staticmethod
+    def _serialize_directory(entries: List[Tuple[int, int, int, int]]) -> bytes:
+        """Serialize (tile_id, offset, length, run_length) entries, sorted by
+        tile id, into a compressed directory"""
+
+        buf = bytearray()
+        _write_varint(buf, len(entries))
+        last_tile_id = 0
+        for tile_id, _, _, _ in entries:
+            _write_varint(buf, tile_id - last_tile_id)
+            last_tile_id = tile_id
+        for _, _, _, run_length in entries:
+            _write_varint(buf, run_length)
+        for _, _, length, _ in entries:
+            _write_varint(buf, length)
+        for i, (_, offset, _, _) in enumerate(entries):
+            if i > 0 and offset == entries[i - 1][1] + entries[i - 1][2]:
+                _write_varint(buf, 0)
+            else:
+                _write_varint(buf, offset + 1)
+        return gzip.compress(bytes(buf))
+
+    def close(self) -> None:
+        tile_job_info = self.tile_job_info
+        order = sorted(range(len(self.tile_ids)), key=self.tile_ids.__getitem__)
+        entries = [
+            (self.tile_ids[i], self.offsets[i], self.lengths[i], 1) for i in order
+        ]
+
+        # Split the entries in leaf directories if they do not fit in the root one
+        root_directory = self._serialize_directory(entries)
+        leaf_directories = bytearray()
+        leaf_size = 4096
+        while len(root_directory) > self.ROOT_DIRECTORY_MAX_SIZE:
+            leaf_directories = bytearray()
+            root_entries = []
+            for i in range(0, len(entries), leaf_size):
+                leaf_directory = self._serialize_directory(entries[i : i + leaf_size])
+                root_entries.append(
+                    (entries[i][0], len(leaf_directories), len(leaf_directory), 0)
+                )
+                leaf_directories += leaf_directory
+            root_directory = self._serialize_directory(root_entries)
+            leaf_size *= 2
+
+        metadata = gzip.compress(
+            json.dumps(
+                {
+                    "name": tile_job_info.options.title,
+                    "format": tile_job_info.tile_extension,
+                    "type": "overlay",
+                }
+            ).encode("utf-8")
+        )
+        metadata_offset = self.tile_data_offset + self.tile_data_length
+        leaf_directories_offset = metadata_offset + len(metadata)
+        self.f.write(metadata)
+        self.f.write(leaf_directories)
+
+        south, west, north, east = tile_job_info.swne
+        self.f.seek(0)
+        self.f.write(
+            struct.pack(
+                "<7sB11Q6B4iB2i",
+                b"PMTiles",
+                3,
+                self.HEADER_SIZE,
+                len(root_directory),
+                metadata_offset,
+                len(metadata),
+                leaf_directories_offset,
+                len(leaf_directories),
+                self.tile_data_offset,
+                self.tile_data_length,
+                len(entries),
+                len(entries),
+                len(entries),
+                0,  # not clustered
+                2,  # gzip internal compression
+                1,  # no tile compression
+                self.TILE_TYPES[tile_job_info.tile_extension],
+                tile_job_info.tminz,
+                tile_job_info.tmaxz,
+                round(west * 1e7),
+                round(south * 1e7),
+                round(east * 1e7),
+                round(north * 1e7),
+                tile_job_info.tminz,
+                round((west + east) / 2 * 1e7),
+                round((south + north) / 2 * 1e7),
+            )
+        )
+        self.f.write(root_directory)
+        self.f.close()
+
+
+class TileManifest:
+    """
+    Completion manifest of the tiles of an output directory (see --manifest)
+
+    The manifest file is made of a header, describing the tiling, followed by
+    an append-only sequence of fixed-size records. A COMPLETE record marks the
+    subtree of a tile as complete, that is the tile and all its descendants
+    have been generated. A CHANGED record marks a range of base tiles, and
+    thus their ancestors, as to be generated again.
+
+    The complete subtrees are kept in memory as a bitmap per zoom level, so
+    that --resume does not have to test the existence of each tile.
+    """
+
+    MAGIC = b"GDAL2TILES_MANIFEST\n"
+    RECORD = struct.Struct("<BBIIII")
+    COMPLETE = 0
+    CHANGED = 1
+
+    def __init__(self, tile_job_info: "TileJobInfo") -> None:
+        self.tile_job_info = tile_job_info
+        self.ranges = get_subtree_ranges(tile_job_info)
+        self.bitmaps = {}
+        self.size = 0
+
+    @classmethod
+    def get_header(cls, tile_job_info: "TileJobInfo") -> bytes:
+        """Return the header of the manifest of a tiling. The manifest of a
+        previous run can only be used if its header is identical."""
+
+        options = tile_job_info.options
+        description = {
+            "profile": options.profile,
+            "tile_size": tile_job_info.tile_size,
+            "tile_extension": tile_job_info.tile_extension,
+            "tminz": tile_job_info.tminz,
+            "tmaxz": tile_job_info.tmaxz,
+            "base_range": list(tile_job_info.tminmax[tile_job_info.tmaxz]),
+        }
+        return cls.MAGIC + json.dumps(description).encode("utf-8") + b"\n"
+
+    @classmethod
+    def read(
+        cls, tile_job_info: "TileJobInfo", size: Optional[int] = None
+    ) -> Optional["TileManifest"]:
+        """Read the manifest, or its first size bytes. Return None if it does
+        not exist or if it has been written for another tiling."""
+
+        filename = tile_job_info.options.manifest
+        if not os.path.exists(filename):
+            return None
+        with open(filename, "rb") as f:
+            content = f.read() if size is None else f.read(size)
+
+        header = cls.get_header(tile_job_info)
+        if not content.startswith(header):
+            return None
+
+        manifest = cls(tile_job_info)
+        # Ignore the truncated last record of an interrupted run
+        nb_records = (len(content) - len(header)) // cls.RECORD.size
+        manifest.size = len(header) + nb_records * cls.RECORD.size
+        for kind, tz, tminx, tminy, tmaxx, tmaxy in cls.RECORD.iter_unpack(
+            content[len(header) : manifest.size]
+        ):
+            if kind == cls.COMPLETE:
+                for ty in range(tminy, tmaxy + 1):
+                    for tx in range(tminx, tmaxx + 1):
+                        manifest.set_complete(tz, tx, ty)
+            elif kind == cls.CHANGED:
+                manifest.set_changed((tminx, tminy, tmaxx, tmaxy))
+        return manifest
+
+    def get_bit_index(self, tz: int, tx: int, ty: int) -> Optional[int]:
+        if tz not in self.ranges or not is_in_range(tx, ty, self.ranges[tz]):
+            return None
+        tminx, tminy, tmaxx, _ = self.ranges[tz]
+        return (ty - tminy) * (tmaxx - tminx + 1) + tx - tminx
+
+    def is_set(self, tz: int, tx: int, ty: int) -> bool:
+        bitmap = self.bitmaps.get(tz)
+        index = self.get_bit_index(tz, tx, ty)
+        if bitmap is None or index is None:
+            return False
+        return (bitmap[index >> 3] >> (index & 7)) & 1 != 0
+
+    def set_complete(self, tz: int, tx: int, ty: int, complete: bool = True) -> None:
+        """Mark the subtree of a tile as complete, or not"""
+
+        index = self.get_bit_index(tz, tx, ty)
+        if index is None:
+            return
+        bitmap = self.bitmaps.get(tz)
+        if bitmap is None:
+            if not complete:
+                return
+            tminx, tminy, tmaxx, tmaxy = self.ranges[tz]
+            nb_tiles = (tmaxx - tminx + 1) * (tmaxy - tminy + 1)
+            bitmap = self.bitmaps[tz] = bytearray((nb_tiles + 7) // 8)
+        if complete:
+            bitmap[index >> 3] |= 1 << (index & 7)
+        else:
+            bitmap[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def is_complete(self, tz: int, tx: int, ty: int) -> bool:
+        """Return whether a tile has been generated, that is whether the
+        subtree of the tile or of one of its ancestors is complete"""
+
+        for ancestor_tz in range(tz, self.tile_job_info.tminz - 1, -1):
+            shift = tz - ancestor_tz
+            if self.is_set(ancestor_tz, tx >> shift, ty >> shift):
+                return True
+        return False
+
+    def set_changed(self, base_range: Tuple[int, int, int, int]) -> None:
+        """
+        Mark a range of base tiles, and their ancestors, as not generated.
+
+        The complete subtrees that contain them are replaced, from the top
+        of the pyramid, by the complete subtrees of their children.
+        """
+
+        tmaxz = self.tile_job_info.tmaxz
+        for tz in range(self.tile_job_info.tminz, tmaxz + 1):
+            if tz not in self.bitmaps:
+                continue
+            shift = tmaxz - tz
+            cminx, cminy, cmaxx, cmaxy = (v >> shift for v in base_range)
+            tminx, tminy, tmaxx, tmaxy = self.ranges[tz]
+            for ty in range(max(cminy, tminy), min(cmaxy, tmaxy) + 1):
+                for tx in range(max(cminx, tminx), min(cmaxx, tmaxx) + 1):
+                    if not self.is_set(tz, tx, ty):
+                        continue
+                    self.set_complete(tz, tx, ty, False)
+                    if tz < tmaxz:
+                        for child in get_children_in_range(tx, ty, self.ranges[tz + 1]):
+                            self.set_complete(tz + 1, child[0], child[1])
+
+
+class TileManifestWriter:
+    """
+    Append records to the completion manifest (see TileManifest)
+
+    The manifest is only written by the process scheduling the jobs, once all
+    the tiles of a subtree have been written. On opening, the manifest of a
+    previous run is reused with --resume, with the range of base tiles of
+    --changed-extent marked as changed, and the size of the manifest is
+    stored in tile_job_info.manifest_size, so that the workers can read it as
+    it was when tiling started. Otherwise, a new manifest is created, and
+    --resume tests the existence of each tile.
+    """
+
+    def __init__(self, tile_job_info: "TileJobInfo") -> None:
+        options = tile_job_info.options
+        filename = options.manifest
+
+        self.manifest = TileManifest.read(tile_job_info) if options.resume else None
+        if self.manifest is None:
+            if tile_job_info.changed_range:
+                exit_with_error(
+                    "--changed-extent requires the manifest of a previous run "
+                    "with the same zoom levels and extent"
+                )
+            self.f = open(filename, "wb")
+            self.f.write(TileManifest.get_header(tile_job_info))
+            tile_job_info.manifest_size = None
+        else:
+            self.f = open(filename, "r+b")
+            self.f.truncate(self.manifest.size)
+            self.f.seek(self.manifest.size)
+            if tile_job_info.changed_range:
+                self.f.write(
+                    TileManifest.RECORD.pack(
+                        TileManifest.CHANGED,
+                        tile_job_info.tmaxz,
+                        *tile_job_info.changed_range,
+                    )
+                )
+                self.manifest.set_changed(tile_job_info.changed_range)
+            tile_job_info.manifest_size = self.f.tell()
+        self.f.flush()
+
+    def add_complete_subtrees(self, tiles: List[Tuple[int, int, int]]) -> None:
+        """Mark the subtrees of tiles, given as (tz, tx, ty), as complete"""
+
+        records = [
+            TileManifest.RECORD.pack(TileManifest.COMPLETE, tz, tx, ty, tx, ty)
+            for tz, tx, ty in tiles
+            if self.manifest is None or not self.manifest.is_complete(tz, tx, ty)
+        ]
+        if records:
+            self.f.write(b"".join(records))
+            self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def open_tile_container_writer(tile_job_info: "TileJobInfo"):
+    """Return the writer of the tile container of the output, or None if tiles
+    are written in a directory"""
+
+    if tile_job_info.tile_container == "MBTiles":
+        return MBTilesWriter(tile_job_info)
+    if tile_job_info.tile_container == "PMTiles":
+        return PMTilesWriter(tile_job_info)
+    return None
+
+
+def open_tile_manifest_writer(
+    tile_job_info: "TileJobInfo",
+) -> Optional[TileManifestWriter]:
+    """Return the writer of the completion manifest, or None if --manifest is
+    not specified"""
+
+    if not tile_job_info.options.manifest:
+        return None
+    return TileManifestWriter(tile_job_info)
+
+
+def count_base_tiles(tile_job_info: "TileJobInfo") -> int:
+    tminx, tminy, tmaxx, tmaxy = tile_job_info.tminmax[tile_job_info.tmaxz]
+    return (1 + abs(tmaxx - tminx)) * (1 + abs(tmaxy - tminy))
 
 
 def count_overview_tiles(tile_job_info: "TileJobInfo") -> int:
@@ -1752,6 +2826,22 @@ def optparse_init() -> Tuple[optparse.OptionParser, Dict[Any, Any]]:
         action="store_true",
         help="Resume mode. Generate only missing files.",
     )
+    p.add_option(
+        "--manifest",
+        dest="manifest",
+        metavar="FILENAME",
+        help="Record the generated tiles in a completion manifest, used by "
+        "--resume instead of testing the existence of each tile",
+    )
+    p.add_option(
+        "--changed-extent",
+        dest="changed_extent",
+        metavar="MINX MINY MAXX MAXY",
+        nargs=4,
+        type="float",
+        help="With --resume and --manifest, generate again the tiles intersecting "
+        "that extent of the input raster, in its SRS",
+    )
     p.add_option(
         "-a",
         "--srcnodata",
@@ -1809,6 +2899,14 @@ def optparse_init() -> Tuple[optparse.OptionParser, Dict[Any, Any]]:
         help="Assume launched by mpiexec and ignore --processes. "
         "User should set GDAL_CACHEMAX to size per process.",
     )
+    p.add_option(
+        "--metatile",
+        dest="metatile",
+        metavar="N",
+        default=1,
+        type="int",
+        help="Read blocks of NxN base tiles at once from the input raster (N must be a power of two)",
+    )
     p.add_option(
         "--tilesize",
         dest="tilesize",
@@ -1961,6 +3059,7 @@ def optparse_init() -> Tuple[optparse.OptionParser, Dict[Any, Any]]:
         googlekey="INSERT_YOUR_KEY_HERE",
         bingkey="INSERT_YOUR_KEY_HERE",
         processes=1,
+        tile_container=None,
     )
 
     return p, tmsMap
@@ -2077,6 +3176,48 @@ def options_post_processing(
             exit_with_error("jpeg_quality should be in the range [1-100]")
         options.jpeg_quality = int(options.jpeg_quality)
 
+    if options.metatile < 1 or options.metatile & (options.metatile - 1):
+        exit_with_error("--metatile should be a power of two")
+    if options.metatile > 1 and options.profile == "raster":
+        exit_with_error("--metatile is not supported with the raster profile")
+
+    # Single-file tile containers
+    options.tile_container = get_tile_container(output_folder)
+    if options.tile_container:
+        if output_folder.startswith("/vsi"):
+            exit_with_error(
+                "%s output is only supported on a local filesystem"
+                % options.tile_container
+            )
+        if options.profile != "mercator":
+            exit_with_error(
+                "%s output is only supported with the mercator profile"
+                % options.tile_container
+            )
+        if options.kml:
+            exit_with_error(
+                "KML generation is not supported with %s output"
+                % options.tile_container
+            )
+        if options.resume and options.tile_container == "PMTiles":
+            exit_with_error("--resume is not supported with PMTiles output")
+        options.kml = False
+        options.webviewer = "none"
+
+    # Completion manifest
+    if options.manifest:
+        if options.tile_container:
+            exit_with_error(
+                "--manifest is not supported with %s output" % options.tile_container
+            )
+        if options.manifest.startswith("/vsi"):
+            exit_with_error("--manifest should be on a local filesystem")
+    if options.changed_extent:
+        if not options.resume or not options.manifest:
+            exit_with_error("--changed-extent requires --resume and --manifest")
+        if options.profile == "raster":
+            exit_with_error("--changed-extent is not supported with the raster profile")
+
     # Output the results
     if options.verbose:
         logger.debug("Options: %s" % str(options))
@@ -2088,24 +3229,29 @@ def options_post_processing(
 
 
 class TileDetail:
-    tx = 0
-    ty = 0
-    ty_tms = 0
-    tz = 0
-    rx = 0
-    ry = 0
-    rxsize = 0
-    rysize = 0
-    wx = 0
-    wy = 0
-    wxsize = 0
-    wysize = 0
-    querysize = 0
+    # Slots avoid a per-instance dictionary, as there may be many base tiles
+    __slots__ = (
+        "tx",
+        "ty",
+        "ty_tms",
+        "tz",
+        "rx",
+        "ry",
+        "rxsize",
+        "rysize",
+        "wx",
+        "wy",
+        "wxsize",
+        "wysize",
+        "querysize",
+        "metatile_size",
+        "mx",
+        "my",
+    )
 
     def __init__(self, **kwargs):
-        for key in kwargs:
-            if hasattr(self, key):
-                setattr(self, key, kwargs[key])
+        for key in self.__slots__:
+            setattr(self, key, kwargs.get(key, 1 if key == "metatile_size" else 0))
 
     def __str__(self):
         return "TileDetail %s\n%s\n%s\n" % (self.tx, self.ty, self.tz)
@@ -2135,6 +3281,10 @@ class TileJobInfo:
     is_epsg_4326 = False
     options = None
     exclude_transparent = False
+    tile_container = None
+    swne = None
+    changed_range = None
+    manifest_size = None
 
     def __init__(self, **kwargs):
         for key in kwargs:
@@ -2164,6 +3314,10 @@ class GDAL2Tiles:
         self.out_drv = None
         self.mem_drv = None
         self.warped_input_dataset = None
+        self.tile_job_info = None
+        self.coverage_dataset = None
+        self.coverage_bands = None
+        self.coverage_transformer = None
         self.out_srs = None
         self.nativezoom = None
         self.tminmax = None
@@ -2199,8 +3353,13 @@ class GDAL2Tiles:
         else:
             self.tileext = "jpg"
         if options.mpi:
-            makedirs(output_folder)
-            self.tmp_dir = tempfile.mkdtemp(dir=output_folder)
+            if options.tile_container:
+                self.tmp_dir = tempfile.mkdtemp(
+                    dir=os.path.dirname(os.path.abspath(output_folder))
+                )
+            else:
+                makedirs(output_folder)
+                self.tmp_dir = tempfile.mkdtemp(dir=output_folder)
         else:
             self.tmp_dir = tempfile.mkdtemp()
         self.tmp_vrt_filename = os.path.join(self.tmp_dir, str(uuid4()) + ".vrt")
@@ -2372,6 +3531,8 @@ class GDAL2Tiles:
             self.tmp_vrt_filename, self.warped_input_dataset
         )
 
+        self.setup_data_coverage(input_dataset)
+
         self.dataBandsCount = nb_data_bands(self.warped_input_dataset)
 
         # KML test
@@ -2679,7 +3840,8 @@ class GDAL2Tiles:
         tiles are generated during the tile processing).
         """
 
-        makedirs(self.output_folder)
+        if not self.options.tile_container:
+            makedirs(self.output_folder)
 
         if self.options.profile == "mercator":
 
@@ -2730,6 +3892,10 @@ class GDAL2Tiles:
         else:
             self.swne = None
 
+        if self.options.tile_container:
+            # No side car files with single-file tile containers
+            return
+
         # Generate openlayers.html
         if self.options.webviewer in ("all", "openlayers"):
             if not self.options.resume or not isfile(
@@ -2798,136 +3964,227 @@ class GDAL2Tiles:
                             ).encode("utf-8")
                         )
 
-    def generate_base_tiles(self) -> Tuple[TileJobInfo, List[TileDetail]]:
-        """
-        Generation of the base tiles (the lowest in the pyramid) directly from the input raster
-        """
+    def get_tile_job_info(self) -> TileJobInfo:
+        """Return the configuration of the tile jobs"""
 
-        if not self.options.quiet:
-            logger.info("Generating Base Tiles:")
+        if self.tile_job_info is not None:
+            return self.tile_job_info
 
+        self.tile_job_info = TileJobInfo(
+            src_file=self.tmp_vrt_filename,
+            nb_data_bands=self.dataBandsCount,
+            output_file_path=self.output_folder,
+            tile_extension=self.tileext,
+            tile_driver=self.tiledriver,
+            tile_size=self.tile_size,
+            kml=self.kml,
+            tminmax=self.tminmax,
+            tminz=self.tminz,
+            tmaxz=self.tmaxz,
+            in_srs_wkt=self.in_srs_wkt,
+            out_geo_trans=self.out_gt,
+            ominy=self.ominy,
+            is_epsg_4326=self.isepsg4326,
+            options=self.options,
+            exclude_transparent=self.options.exclude_transparent,
+            tile_container=self.options.tile_container,
+            swne=self.swne,
+            changed_range=self.get_changed_range(),
+        )
+        return self.tile_job_info
+
+    def get_changed_range(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return the range of the base tiles intersecting --changed-extent,
+        or None if it is not specified or does not intersect them"""
+
+        if not self.options.changed_extent:
+            return None
+
+        ct = osr.CoordinateTransformation(self.in_srs, self.out_srs)
+        minx, miny, maxx, maxy = ct.TransformBounds(*self.options.changed_extent, 21)
+
+        tz = self.tmaxz
+        if self.options.profile == "mercator":
+            tminx, tminy = self.mercator.MetersToTile(minx, miny, tz)
+            tmaxx, tmaxy = self.mercator.MetersToTile(maxx, maxy, tz)
+        elif self.options.profile == "geodetic":
+            tminx, tminy = self.geodetic.LonLatToTile(minx, miny, tz)
+            tmaxx, tmaxy = self.geodetic.LonLatToTile(maxx, maxy, tz)
+        else:
+            tms = self.tmsMap[self.options.profile]
+            tminx, tminy = tms.GeorefCoordToTileCoord(minx, miny, tz, self.tile_size)
+            tmaxx, tmaxy = tms.GeorefCoordToTileCoord(maxx, maxy, tz, self.tile_size)
+
+        # Clamp to the base tiles, which are within the tile grid of the zoom
+        # level, as the extent may lie partly or totally outside of it
+        rminx, rminy, rmaxx, rmaxy = self.tminmax[tz]
+        changed_range = (
+            max(tminx, rminx),
+            max(tminy, rminy),
+            min(tmaxx, rmaxx),
+            min(tmaxy, rmaxy),
+        )
+        if changed_range[0] > changed_range[2] or changed_range[1] > changed_range[3]:
+            changed_range = None
         if self.options.verbose:
-            logger.debug("")
-            logger.debug("Tiles generated from the max zoom level:")
-            logger.debug("----------------------------------------")
-            logger.debug("")
+            logger.debug("Changed base tiles: %s" % str(changed_range))
+        return changed_range
+
+    def generate_base_tiles(
+        self, tile_range: Optional[Tuple[int, int, int, int]] = None
+    ) -> Iterator[TileDetail]:
+        """
+        Generation of the base tiles (the lowest in the pyramid) directly from the input raster
+
+        The details of the base tiles of tile_range (tminx, tminy, tmaxx, tmaxy),
+        or of the whole max zoom level by default, are lazily generated, so that
+        they can be consumed by the tiling jobs as they are computed.
+        """
 
         # Set the bounds
         tminx, tminy, tmaxx, tmaxy = self.tminmax[self.tmaxz]
+        rminx, rminy, rmaxx, rmaxy = tile_range or self.tminmax[self.tmaxz]
+        rminx, rminy = max(rminx, tminx), max(rminy, tminy)
+        rmaxx, rmaxy = min(rmaxx, tmaxx), min(rmaxy, tmaxy)
 
         ds = self.warped_input_dataset
-        tilebands = self.dataBandsCount + 1
         querysize = self.querysize
 
-        if self.options.verbose:
-            logger.debug("dataBandsCount: %d" % self.dataBandsCount)
-            logger.debug("tilebands: %d" % tilebands)
-
-        tcount = (1 + abs(tmaxx - tminx)) * (1 + abs(tmaxy - tminy))
+        tcount = max(0, rmaxx - rminx + 1) * max(0, rmaxy - rminy + 1)
         ti = 0
 
-        tile_details = []
+        conf = self.get_tile_job_info()
 
         tz = self.tmaxz
 
-        # Create directories for the tiles
-        for tx in range(tminx, tmaxx + 1):
-            tiledirname = os.path.join(self.output_folder, str(tz), str(tx))
-            makedirs(tiledirname)
-
-        for ty in range(tmaxy, tminy - 1, -1):
-            for tx in range(tminx, tmaxx + 1):
-
-                ti += 1
-                ytile = GDAL2Tiles.getYTile(ty, tz, self.options, self.tmsMap)
-                tilefilename = os.path.join(
-                    self.output_folder,
-                    str(tz),
-                    str(tx),
-                    "%s.%s" % (ytile, self.tileext),
-                )
-                if self.options.verbose:
-                    logger.debug("%d / %d, %s" % (ti, tcount, tilefilename))
+        # Size, in tiles, of the blocks of tiles read at once
+        metatile_size = self.options.metatile
+        metatile_queries = {}
 
-                if self.options.resume and isfile(tilefilename):
+        # Skip the parts of the range where the input raster has no data
+        for (rminx, rminy, rmaxx, rmaxy), coverage_status in self.get_covered_ranges(
+            (rminx, rminy, rmaxx, rmaxy)
+        ):
+            for ty in range(rmaxy, rminy - 1, -1):
+                for tx in range(rminx, rmaxx + 1):
+
+                    ti += 1
+                    ytile = GDAL2Tiles.getYTile(ty, tz, self.options, self.tmsMap)
+                    tilefilename = os.path.join(
+                        self.output_folder,
+                        str(tz),
+                        str(tx),
+                        "%s.%s" % (ytile, self.tileext),
+                    )
                     if self.options.verbose:
-                        logger.debug("Tile generation skipped because of --resume")
-                    continue
+                        logger.debug("%d / %d, %s" % (ti, tcount, tilefilename))
 
-                if self.options.profile == "mercator":
-                    # Tile bounds in EPSG:3857
-                    b = self.mercator.TileBounds(tx, ty, tz)
-                elif self.options.profile == "geodetic":
-                    b = self.geodetic.TileBounds(tx, ty, tz)
-                elif self.options.profile != "raster":
-                    b = self.tmsMap[self.options.profile].TileBounds(
-                        tx, ty, tz, self.tile_size
-                    )
+                    if self.options.resume and tile_is_generated(
+                        conf, tz, tx, ty, self.tmsMap
+                    ):
+                        if self.options.verbose:
+                            logger.debug("Tile generation skipped because of --resume")
+                        continue
 
-                # Don't scale up by nearest neighbour, better change the querysize
-                # to the native resolution (and return smaller query tile) for scaling
+                    if self.options.profile != "raster":
+                        b = self.tile_bounds(tx, ty, tz)
 
-                if self.options.profile != "raster":
-                    rb, wb = self.geo_query(ds, b[0], b[3], b[2], b[1])
+                    # Don't scale up by nearest neighbour, better change the querysize
+                    # to the native resolution (and return smaller query tile) for scaling
 
-                    # Pixel size in the raster covering query geo extent
-                    nativesize = wb[0] + wb[2]
-                    if self.options.verbose:
-                        logger.debug(
-                            f"\tNative Extent (querysize {nativesize}): {rb}, {wb}"
-                        )
+                    if self.options.profile != "raster":
+                        rb, wb = self.geo_query(ds, b[0], b[3], b[2], b[1])
 
-                    # Tile bounds in raster coordinates for ReadRaster query
-                    rb, wb = self.geo_query(
-                        ds, b[0], b[3], b[2], b[1], querysize=querysize
-                    )
+                        # Pixel size in the raster covering query geo extent
+                        nativesize = wb[0] + wb[2]
+                        if self.options.verbose:
+                            logger.debug(
+                                f"\tNative Extent (querysize {nativesize}): {rb}, {wb}"
+                            )
 
-                    rx, ry, rxsize, rysize = rb
-                    wx, wy, wxsize, wysize = wb
-
-                else:  # 'raster' profile:
-
-                    tsize = int(
-                        self.tsize[tz]
-                    )  # tile_size in raster coordinates for actual zoom
-                    xsize = (
-                        self.warped_input_dataset.RasterXSize
-                    )  # size of the raster in pixels
-                    ysize = self.warped_input_dataset.RasterYSize
-                    querysize = self.tile_size
-
-                    rx = tx * tsize
-                    rxsize = 0
-                    if tx == tmaxx:
-                        rxsize = xsize % tsize
-                    if rxsize == 0:
-                        rxsize = tsize
-
-                    ry = ty * tsize
-                    rysize = 0
-                    if ty == tmaxy:
-                        rysize = ysize % tsize
-                    if rysize == 0:
-                        rysize = tsize
-
-                    wx, wy = 0, 0
-                    wxsize = int(rxsize / float(tsize) * self.tile_size)
-                    wysize = int(rysize / float(tsize) * self.tile_size)
-
-                    if not self.options.xyz:
-                        ry = ysize - (ty * tsize) - rysize
-                        if wysize != self.tile_size:
-                            wy = self.tile_size - wysize
-
-                if rxsize == 0 or rysize == 0 or wxsize == 0 or wysize == 0:
-                    if self.options.verbose:
-                        logger.debug("\tExcluding tile with no pixel coverage")
-                    continue
+                        # Tile bounds in raster coordinates for ReadRaster query
+                        rb, wb = self.geo_query(
+                            ds, b[0], b[3], b[2], b[1], querysize=querysize
+                        )
+
+                        rx, ry, rxsize, rysize = rb
+                        wx, wy, wxsize, wysize = wb
+
+                    else:  # 'raster' profile:
+
+                        tsize = int(
+                            self.tsize[tz]
+                        )  # tile_size in raster coordinates for actual zoom
+                        xsize = (
+                            self.warped_input_dataset.RasterXSize
+                        )  # size of the raster in pixels
+                        ysize = self.warped_input_dataset.RasterYSize
+                        querysize = self.tile_size
+
+                        rx = tx * tsize
+                        rxsize = 0
+                        if tx == tmaxx:
+                            rxsize = xsize % tsize
+                        if rxsize == 0:
+                            rxsize = tsize
+
+                        ry = ty * tsize
+                        rysize = 0
+                        if ty == tmaxy:
+                            rysize = ysize % tsize
+                        if rysize == 0:
+                            rysize = tsize
+
+                        wx, wy = 0, 0
+                        wxsize = int(rxsize / float(tsize) * self.tile_size)
+                        wysize = int(rysize / float(tsize) * self.tile_size)
+
+                        if not self.options.xyz:
+                            ry = ysize - (ty * tsize) - rysize
+                            if wysize != self.tile_size:
+                                wy = self.tile_size - wysize
+
+                    if rxsize == 0 or rysize == 0 or wxsize == 0 or wysize == 0:
+                        if self.options.verbose:
+                            logger.debug("\tExcluding tile with no pixel coverage")
+                        continue
+
+                    mx = my = 0
+                    tile_metatile_size = metatile_size
+                    if coverage_status == gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY:
+                        # Transparent tile: nothing to read
+                        if self.options.verbose:
+                            logger.debug("\tNo data in the input raster for the tile")
+                        rxsize = rysize = wxsize = wysize = 0
+                        tile_metatile_size = 1
+                    elif metatile_size > 1:
+                        # Read the whole metatile instead, and locate the tile in it
+                        mtx = tx - tx % metatile_size
+                        mty = ty - ty % metatile_size
+                        metatile_query = metatile_queries.get((mtx, mty))
+                        if metatile_query is None:
+                            b0 = self.tile_bounds(mtx, mty, tz)
+                            b1 = self.tile_bounds(
+                                mtx + metatile_size - 1, mty + metatile_size - 1, tz
+                            )
+                            metatile_query = self.geo_query(
+                                ds,
+                                min(b0[0], b1[0]),
+                                max(b0[3], b1[3]),
+                                max(b0[2], b1[2]),
+                                min(b0[1], b1[1]),
+                                querysize=metatile_size * querysize,
+                            )
+                            metatile_queries[(mtx, mty)] = metatile_query
+                        (rx, ry, rxsize, rysize), (wx, wy, wxsize, wysize) = (
+                            metatile_query
+                        )
+                        mx = (tx - mtx) * querysize
+                        my = (mty + metatile_size - 1 - ty) * querysize
 
-                # Read the source raster if anything is going inside the tile as per the computed
-                # geo_query
-                tile_details.append(
-                    TileDetail(
+                    # Read the source raster if anything is going inside the tile as per the computed
+                    # geo_query
+                    yield TileDetail(
                         tx=tx,
                         ty_tms=ty,
                         ty=ytile,
@@ -2941,29 +4198,173 @@ class GDAL2Tiles:
                         wxsize=wxsize,
                         wysize=wysize,
                         querysize=querysize,
+                        metatile_size=tile_metatile_size,
+                        mx=mx,
+                        my=my,
                     )
-                )
 
-        conf = TileJobInfo(
-            src_file=self.tmp_vrt_filename,
-            nb_data_bands=self.dataBandsCount,
-            output_file_path=self.output_folder,
-            tile_extension=self.tileext,
-            tile_driver=self.tiledriver,
-            tile_size=self.tile_size,
-            kml=self.kml,
-            tminmax=self.tminmax,
-            tminz=self.tminz,
-            tmaxz=self.tmaxz,
-            in_srs_wkt=self.in_srs_wkt,
-            out_geo_trans=self.out_gt,
-            ominy=self.ominy,
-            is_epsg_4326=self.isepsg4326,
-            options=self.options,
-            exclude_transparent=self.options.exclude_transparent,
+    def setup_data_coverage(self, input_dataset: gdal.Dataset) -> None:
+        """
+        Prepare get_data_coverage_status(), to detect the areas where the
+        warped input raster is transparent because the input raster has no
+        data there (sparse blocks of GeoTIFF files, areas not covered by the
+        sources of VRT files, ...), without reading them.
+        """
+
+        self.coverage_bands = None
+        self.coverage_transformer = None
+        if self.options.profile == "raster" or self.options.srcnodata is not None:
+            return
+
+        band = input_dataset.GetRasterBand(1)
+        mask_flags = band.GetMaskFlags()
+        if mask_flags & gdal.GMF_PER_DATASET:
+            # Alpha or mask band
+            coverage_bands = [band.GetMaskBand()]
+        elif mask_flags & gdal.GMF_NODATA:
+            # Pixels are transparent where all the bands are at nodata
+            coverage_bands = [
+                input_dataset.GetRasterBand(i + 1)
+                for i in range(input_dataset.RasterCount)
+            ]
+        else:
+            return
+
+        try:
+            self.coverage_transformer = gdal.Transformer(
+                input_dataset,
+                self.warped_input_dataset,
+                [
+                    "SRC_SRS=" + self.in_srs_wkt,
+                    "DST_SRS=" + self.out_srs.ExportToWkt(),
+                ],
+            )
+        except RuntimeError:
+            return
+        if self.coverage_transformer:
+            self.coverage_dataset = input_dataset
+            self.coverage_bands = coverage_bands
+
+    def get_data_coverage_status(self, tile_range: Tuple[int, int, int, int]) -> int:
+        """
+        Return the data coverage status (combination of
+        gdal.GDAL_DATA_COVERAGE_STATUS_xxx flags) of the input raster for a
+        range of base tiles, conservatively estimated.
+        """
+
+        unknown_status = (
+            gdal.GDAL_DATA_COVERAGE_STATUS_UNIMPLEMENTED
+            | gdal.GDAL_DATA_COVERAGE_STATUS_DATA
+        )
+        if self.coverage_bands is None:
+            return unknown_status
+
+        tminx, tminy, tmaxx, tmaxy = tile_range
+        b0 = self.tile_bounds(tminx, tminy, self.tmaxz)
+        b1 = self.tile_bounds(tmaxx, tmaxy, self.tmaxz)
+        (rx, ry, rxsize, rysize), _ = self.geo_query(
+            self.warped_input_dataset,
+            min(b0[0], b1[0]),
+            max(b0[3], b1[3]),
+            max(b0[2], b1[2]),
+            min(b0[1], b1[1]),
+        )
+        if rxsize <= 0 or rysize <= 0:
+            return unknown_status
+
+        # Window of the input raster: sample the edges of the window of the
+        # warped raster, and a grid inside it.
+        n = 20
+        points = []
+        for i in range(n + 1):
+            points += [
+                (rx + rxsize * i / n, ry),
+                (rx + rxsize * i / n, ry + rysize),
+                (rx, ry + rysize * i / n),
+                (rx + rxsize, ry + rysize * i / n),
+            ]
+        points += [
+            (rx + rxsize * i / 4, ry + rysize * j / 4)
+            for j in range(1, 4)
+            for i in range(1, 4)
+        ]
+        points, success = self.coverage_transformer.TransformPoints(True, points)
+        if not all(success):
+            return unknown_status
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        # Add a margin for the resampling, and the curvature between samples
+        xmargin = 2 + (max(xs) - min(xs)) / n
+        ymargin = 2 + (max(ys) - min(ys)) / n
+        xoff = max(0, int(math.floor(min(xs) - xmargin)))
+        yoff = max(0, int(math.floor(min(ys) - ymargin)))
+        xend = min(self.coverage_dataset.RasterXSize, int(math.ceil(max(xs) + xmargin)))
+        yend = min(self.coverage_dataset.RasterYSize, int(math.ceil(max(ys) + ymargin)))
+        if xoff >= xend or yoff >= yend:
+            return unknown_status
+
+        statuses = []
+        for band in self.coverage_bands:
+            status, _ = band.GetDataCoverageStatus(xoff, yoff, xend - xoff, yend - yoff)
+            if status & gdal.GDAL_DATA_COVERAGE_STATUS_UNIMPLEMENTED:
+                return unknown_status
+            statuses.append(status)
+        if all(status == gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY for status in statuses):
+            return gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY
+        if any(status == gdal.GDAL_DATA_COVERAGE_STATUS_DATA for status in statuses):
+            return gdal.GDAL_DATA_COVERAGE_STATUS_DATA
+        return (
+            gdal.GDAL_DATA_COVERAGE_STATUS_DATA | gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY
         )
 
-        return conf, tile_details
+    def get_covered_ranges(
+        self, tile_range: Tuple[int, int, int, int]
+    ) -> List[Tuple[Tuple[int, int, int, int], int]]:
+        """
+        Split a range of base tiles in (range, data coverage status) tuples,
+        by recursively splitting in quadrants the parts with partial data
+        coverage. The parts with no data at all are pruned with --exclude.
+        """
+
+        tminx, tminy, tmaxx, tmaxy = tile_range
+        if tminx > tmaxx or tminy > tmaxy:
+            return []
+
+        status = self.get_data_coverage_status(tile_range)
+        if status == gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY:
+            if self.options.exclude_transparent:
+                if self.options.verbose:
+                    logger.debug(
+                        "No data in the input raster for the tiles %s" % str(tile_range)
+                    )
+                return []
+            return [(tile_range, status)]
+        if status & gdal.GDAL_DATA_COVERAGE_STATUS_EMPTY == 0 or (
+            tminx == tmaxx and tminy == tmaxy
+        ):
+            return [(tile_range, status)]
+
+        midx = (tminx + tmaxx) // 2
+        midy = (tminy + tmaxy) // 2
+        ranges = []
+        for quadrant in (
+            (tminx, midy + 1, midx, tmaxy),
+            (midx + 1, midy + 1, tmaxx, tmaxy),
+            (tminx, tminy, midx, midy),
+            (midx + 1, tminy, tmaxx, midy),
+        ):
+            ranges += self.get_covered_ranges(quadrant)
+        return ranges
+
+    def tile_bounds(self, tx, ty, tz):
+        """Return the bounds of a tile in georef coordinates, for non-raster profiles"""
+
+        if self.options.profile == "mercator":
+            # Tile bounds in EPSG:3857
+            return self.mercator.TileBounds(tx, ty, tz)
+        elif self.options.profile == "geodetic":
+            return self.geodetic.TileBounds(tx, ty, tz)
+        return self.tmsMap[self.options.profile].TileBounds(tx, ty, tz, self.tile_size)
 
     def geo_query(self, ds, ulx, uly, lrx, lry, querysize=0):
         """
@@ -4385,12 +5786,29 @@ function ExtDraggableObject(src, opt_drag) {
 
 def worker_tile_details(
     input_file: str, output_folder: str, options: Options, tmsMap: dict
-) -> Tuple[TileJobInfo, List[TileDetail]]:
+) -> Tuple[TileJobInfo, Callable[..., Iterator[TileDetail]]]:
+    """
+    Return the configuration of the tile jobs, and the generator of the
+    details of the base tiles of a tile range (see
+    GDAL2Tiles.generate_base_tiles())
+    """
+
     gdal2tiles = GDAL2Tiles(input_file, output_folder, options, tmsMap)
     gdal2tiles.open_input()
     gdal2tiles.generate_metadata()
-    tile_job_info, tile_details = gdal2tiles.generate_base_tiles()
-    return tile_job_info, tile_details
+
+    if not options.quiet:
+        logger.info("Generating Base Tiles:")
+
+    if options.verbose:
+        logger.debug("")
+        logger.debug("Tiles generated from the max zoom level:")
+        logger.debug("----------------------------------------")
+        logger.debug("")
+        logger.debug("dataBandsCount: %d" % gdal2tiles.dataBandsCount)
+        logger.debug("tilebands: %d" % (gdal2tiles.dataBandsCount + 1))
+
+    return gdal2tiles.get_tile_job_info(), gdal2tiles.generate_base_tiles
 
 
 class ProgressBar:
@@ -4404,9 +5822,16 @@ class ProgressBar:
 
     def log_progress(self, nb_items: int = 1) -> None:
         self.nb_items_done += nb_items
-        progress = float(self.nb_items_done) / self.total_items
+        if self.total_items == 0:
+            return
+        progress = min(1.0, float(self.nb_items_done) / self.total_items)
         self.progress_cbk(progress, "", None)
 
+    def finish(self) -> None:
+        if self.nb_items_done < self.total_items:
+            self.nb_items_done = self.total_items
+            self.progress_cbk(1.0, "", None)
+
 
 def get_tile_swne(tile_job_info, options):
     if options.profile == "mercator":
@@ -4469,41 +5894,48 @@ def single_threaded_tiling(
     """
     if options.verbose:
         logger.debug("Begin tiles details calc")
-    conf, tile_details = worker_tile_details(input_file, output_folder, options, tmsMap)
+    conf, generate_base_tiles = worker_tile_details(
+        input_file, output_folder, options, tmsMap
+    )
 
     if options.verbose:
         logger.debug("Tiles details calc complete.")
 
     if not options.verbose and not options.quiet:
-        base_progress_bar = ProgressBar(len(tile_details))
-        base_progress_bar.start()
-
-    for tile_detail in tile_details:
-        create_base_tile(conf, tmsMap, tile_detail)
+        progress_bar = ProgressBar(count_base_tiles(conf) + count_overview_tiles(conf))
+        progress_bar.start()
+
+    # The details of the base tiles are generated subtree by subtree, as the
+    # jobs are consumed
+    tile_container_writer = open_tile_container_writer(conf)
+    manifest_writer = open_tile_manifest_writer(conf)
+    pyramid = TilePyramid(
+        conf,
+        tmsMap,
+        tile_container_writer=tile_container_writer,
+        manifest_writer=manifest_writer,
+    )
+    for job in pyramid.get_jobs(generate_base_tiles):
+        nb_tiles = pyramid.add_subtree(create_tile_subtree(conf, tmsMap, job))
 
         if not options.verbose and not options.quiet:
-            base_progress_bar.log_progress()
+            progress_bar.log_progress(nb_tiles)
+
+    nb_tiles = pyramid.add_empty_subtrees()
+    if not options.verbose and not options.quiet:
+        progress_bar.log_progress(nb_tiles)
+
+    if tile_container_writer:
+        tile_container_writer.close()
+    if manifest_writer:
+        manifest_writer.close()
+
+    if not options.verbose and not options.quiet:
+        progress_bar.finish()
 
     if getattr(threadLocal, "cached_ds", None):
         del threadLocal.cached_ds
-
-    if not options.quiet:
-        count = count_overview_tiles(conf)
-        if count:
-            logger.info("Generating Overview Tiles:")
-
-            if not options.verbose:
-                overview_progress_bar = ProgressBar(count)
-                overview_progress_bar.start()
-
-    for base_tz in range(conf.tmaxz, conf.tminz, -1):
-        base_tile_groups = group_overview_base_tiles(base_tz, output_folder, conf)
-        for base_tiles in base_tile_groups:
-            create_overview_tile(
-                base_tz, base_tiles, output_folder, conf, options, tmsMap
-            )
-            if not options.verbose and not options.quiet:
-                overview_progress_bar.log_progress()
+    threadLocal.cached_manifest = None
 
     shutil.rmtree(os.path.dirname(conf.src_file))
 
@@ -4517,50 +5949,54 @@ def multi_threaded_tiling(
     if options.verbose:
         logger.debug("Begin tiles details calc")
 
-    conf, tile_details = worker_tile_details(input_file, output_folder, options, tmsMap)
+    conf, generate_base_tiles = worker_tile_details(
+        input_file, output_folder, options, tmsMap
+    )
 
     if options.verbose:
         logger.debug("Tiles details calc complete.")
 
     if not options.verbose and not options.quiet:
-        base_progress_bar = ProgressBar(len(tile_details))
-        base_progress_bar.start()
-
-    # TODO: gbataille - check the confs for which each element is an array... one useless level?
-    # TODO: gbataille - assign an ID to each job for print in verbose mode "ReadRaster Extent ..."
-    chunksize = max(1, min(128, len(tile_details) // nb_processes))
-    for _ in pool.imap_unordered(
-        partial(create_base_tile, conf, None), tile_details, chunksize=chunksize
+        progress_bar = ProgressBar(count_base_tiles(conf) + count_overview_tiles(conf))
+        progress_bar.start()
+
+    # Split the pyramid in enough subtrees to balance the load between the
+    # workers. The overview tiles of the lower zoom levels are generated by
+    # this process as soon as the subtrees they depend on are completed.
+    # When writing to a tile container, this process is also its only writer.
+    # The jobs, with the details of their base tiles, are generated as the
+    # pool consumes them, so that tiling starts immediately and the memory
+    # used does not depend on the number of tiles.
+    tile_container_writer = open_tile_container_writer(conf)
+    manifest_writer = open_tile_manifest_writer(conf)
+    pyramid = TilePyramid(
+        conf,
+        tmsMap,
+        min_nb_jobs=8 * nb_processes,
+        tile_container_writer=tile_container_writer,
+        manifest_writer=manifest_writer,
+    )
+    for subtree_result in pool.imap_unordered(
+        partial(create_tile_subtree, conf, None),
+        pyramid.get_jobs(generate_base_tiles),
+        chunksize=1,
     ):
+        nb_tiles = pyramid.add_subtree(subtree_result)
+
         if not options.verbose and not options.quiet:
-            base_progress_bar.log_progress()
+            progress_bar.log_progress(nb_tiles)
 
-    if not options.quiet:
-        count = count_overview_tiles(conf)
-        if count:
-            logger.info("Generating Overview Tiles:")
-
-            if not options.verbose:
-                overview_progress_bar = ProgressBar(count)
-                overview_progress_bar.start()
-
-    for base_tz in range(conf.tmaxz, conf.tminz, -1):
-        base_tile_groups = group_overview_base_tiles(base_tz, output_folder, conf)
-        chunksize = max(1, min(128, len(base_tile_groups) // nb_processes))
-        for _ in pool.imap_unordered(
-            partial(
-                create_overview_tile,
-                base_tz,
-                output_folder=output_folder,
-                tile_job_info=conf,
-                options=options,
-                tmsMap=None,
-            ),
-            base_tile_groups,
-            chunksize=chunksize,
-        ):
-            if not options.verbose and not options.quiet:
-                overview_progress_bar.log_progress()
+    nb_tiles = pyramid.add_empty_subtrees()
+    if not options.verbose and not options.quiet:
+        progress_bar.log_progress(nb_tiles)
+
+    if tile_container_writer:
+        tile_container_writer.close()
+    if manifest_writer:
+        manifest_writer.close()
+
+    if not options.verbose and not options.quiet:
+        progress_bar.finish()
 
     shutil.rmtree(os.path.dirname(conf.src_file))
 
@@ -4627,6 +6063,21 @@ def submain(argv: List[str], pool=None, pool_size=0, called_from_main=False) ->
 
     if not options.legacy:
 
+        if options.tile_container:
+            raise Exception(
+                f"{options.tile_container} output is not supported in 'gdal raster tile' non-legacy mode. You may specify --legacy to go on."
+            )
+
+        if options.metatile > 1:
+            raise Exception(
+                "--metatile is not supported in 'gdal raster tile' non-legacy mode. You may specify --legacy to go on."
+            )
+
+        if options.manifest:
+            raise Exception(
+                "--manifest is not supported in 'gdal raster tile' non-legacy mode. You may specify --legacy to go on."
+            )
+
         kwargs = {
             "input": input_file,
             "output": output_folder,
@@ -12,14 +12,17 @@
 #
 # SPDX-License-Identifier: MIT
 ###############################################################################
+import itertools
+import os
+import struct
 import sys
 import textwrap
 from numbers import Number
-from typing import Optional, Sequence, Tuple, Union
+from typing import Iterator, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from osgeo import gdal
+from osgeo import gdal, ogr
 from osgeo_utils.auxiliary.base import PathLikeOrStr
 from osgeo_utils.auxiliary.gdal_argparse import GDALArgumentParser, GDALScript
 from osgeo_utils.auxiliary.numpy_util import GDALTypeCodeAndNumericTypeCodeFromDataSet
@@ -49,6 +52,8 @@ def gdal2xyz(
     return_np_arrays: bool = False,
     pre_allocate_np_arrays: bool = True,
     progress_callback: OptionalProgressCallback = ...,
+    output_format: Optional[str] = None,
+    layer_creation_options: Optional[Sequence[str]] = None,
 ) -> Optional[Tuple]:
     """
     translates a raster file (or dataset) into xyz format
@@ -70,6 +75,11 @@ def gdal2xyz(
     pre_allocate_np_arrays - pre-allocated result arrays.
         Should be faster unless skip_nodata and the input is very sparse thus most data points will be skipped.
     progress_callback - progress callback function. use None for quiet or Ellipsis for using the default callback
+    output_format - "XYZ" for a delimited text output, "NPY" for a NumPy structured array file,
+        or the short name of an OGR vector driver (e.g. "Parquet", "Arrow") to write the points
+        as x, y and band_<n> columns of a layer.
+        default (`None`) - guessed from the extension of dstfile, "XYZ" if not recognized.
+    layer_creation_options - layer creation options of the OGR output layer
     """
 
     result = None
@@ -95,8 +105,16 @@ def gdal2xyz(
 
     dt, np_dt = GDALTypeCodeAndNumericTypeCodeFromDataSet(ds)
 
+    if output_format is None:
+        output_format = get_output_format(dstfile)
+    columnar = output_format.upper() != "XYZ"
+    if columnar and dstfile is None:
+        raise Exception(f"An output file is required for the {output_format} format.")
+
     # Open the output file.
-    if dstfile is not None:
+    if columnar:
+        dst_fh = None
+    elif dstfile is not None:
         dst_fh = gdal.VSIFOpenL(dstfile, "wb")
     elif return_np_arrays:
         dst_fh = None
@@ -116,9 +134,12 @@ def gdal2xyz(
             and abs(ds.RasterXSize * gt[1]) < 180
             and abs(ds.RasterYSize * gt[5]) < 180
         ):
-            frmt = "%.10g" + delim + "%.10g" + delim + "%s"
+            frmt = "%.10g" + delim + "%.10g" + delim
         else:
-            frmt = "%.3f" + delim + "%.3f" + delim + "%s"
+            frmt = "%.3f" + delim + "%.3f" + delim
+
+        # format string of a single line
+        line_format = frmt + band_format
 
     if isinstance(src_nodata, Number):
         src_nodata = [src_nodata] * band_count
@@ -138,7 +159,6 @@ def gdal2xyz(
 
     skip_nodata = skip_nodata and (src_nodata is not None)
     replace_nodata = (not skip_nodata) and (dst_nodata is not None)
-    process_nodata = skip_nodata or replace_nodata
 
     if isinstance(skip, Sequence):
         x_skip, y_skip = skip
@@ -146,87 +166,285 @@ def gdal2xyz(
         x_skip = y_skip = skip
 
     x_off, y_off, x_size, y_size = srcwin
-    bands_count = len(bands)
+    max_count = len(range(0, x_size, x_skip)) * len(range(0, y_size, y_skip))
 
-    nXBlocks = (x_size - x_off) // x_skip
-    nYBlocks = (y_size - y_off) // y_skip
-    progress_end = nXBlocks * nYBlocks
-    progress_curr = 0
-    progress_prev = -1
-    progress_parts = 100
+    dst_writer = None
+    if columnar:
+        field_names = ["x", "y"] + [f"band_{band.GetBand()}" for band in bands]
+        if output_format.upper() == "NPY":
+            dst_writer = NPYPointWriter(dstfile, field_names, np_dt, max_count)
+        else:
+            dst_writer = OGRPointWriter(
+                dstfile, output_format, field_names, layer_creation_options
+            )
+
+    chunks = iter_xyz_chunks(
+        bands,
+        gt,
+        srcwin,
+        x_skip=x_skip,
+        y_skip=y_skip,
+        np_dt=np_dt,
+        src_nodata=src_nodata if (skip_nodata or replace_nodata) else None,
+        dst_nodata=dst_nodata if replace_nodata else None,
+    )
 
     if return_np_arrays:
-        size = progress_end if pre_allocate_np_arrays else 0
-        all_geo_x = np.empty(size)
-        all_geo_y = np.empty(size)
-        all_data = np.empty((size, band_count), dtype=np_dt)
+        if pre_allocate_np_arrays:
+            size = max_count
+        else:
+            size = 0
+        all_geo_x = [np.empty(size)]
+        all_geo_y = [np.empty(size)]
+        all_data = [np.empty((band_count, size), dtype=np_dt)]
 
     # Loop emitting data.
     idx = 0
-    for y in range(y_off, y_off + y_size, y_skip):
-
-        size = bands_count if pre_allocate_np_arrays else 0
-        data = np.empty((size, x_size), dtype=np_dt)  # dims: (bands_count, x_size)
-        for i_bnd, band in enumerate(bands):
-            band_data = band.ReadAsArray(x_off, y, x_size, 1)  # read one band line
+    for progress_frac, geo_x, geo_y, data in chunks:
+        count = len(geo_x)
+
+        if dst_fh and count:
+            # format all the lines of the chunk at once
+            values = itertools.chain.from_iterable(
+                zip(geo_x.tolist(), geo_y.tolist(), *data.tolist())
+            )
+            lines = ((line_format * count) % tuple(values)).encode("UTF-8")
+            if gdal.VSIFWriteL(lines, len(lines), 1, dst_fh) != 1:
+                gdal.VSIFCloseL(dst_fh)
+                raise IOError("Cannot write into destination file")
+        if dst_writer and count:
+            dst_writer.write(geo_x, geo_y, data)
+        if return_np_arrays:
             if pre_allocate_np_arrays:
-                data[i_bnd] = band_data[0]
+                all_geo_x[0][idx : idx + count] = geo_x
+                all_geo_y[0][idx : idx + count] = geo_y
+                all_data[0][:, idx : idx + count] = data
             else:
-                data = np.append(data, band_data, axis=0)
-
-        for x_i in range(0, x_size, x_skip):
-
-            progress_curr += 1
-            if progress_callback:
-                progress_frac = progress_curr / progress_end
-                progress = int(progress_frac * progress_parts)
-                if progress > progress_prev:
-                    progress_prev = progress
-                    progress_callback(progress_frac)
-
-            x_i_data = data[:, x_i]  # single pixel, dims: (bands)
-            if process_nodata and np.array_equal(src_nodata, x_i_data):
-                if skip_nodata:
-                    continue
-                elif replace_nodata:
-                    x_i_data = dst_nodata
-
-            x = x_i + x_off
-
-            geo_x = gt[0] + (x + 0.5) * gt[1] + (y + 0.5) * gt[2]
-            geo_y = gt[3] + (x + 0.5) * gt[4] + (y + 0.5) * gt[5]
-
-            if dst_fh:
-                band_str = band_format % tuple(x_i_data)
-                line = (frmt % (float(geo_x), float(geo_y), band_str)).encode("UTF-8")
-                if gdal.VSIFWriteL(line, len(line), 1, dst_fh) != 1:
-                    gdal.VSIFCloseL(dst_fh)
-                    raise IOError("Cannot write into destination file")
-            if return_np_arrays:
-                if pre_allocate_np_arrays:
-                    all_geo_x[idx] = geo_x
-                    all_geo_y[idx] = geo_y
-                    all_data[idx] = x_i_data
-                else:
-                    all_geo_x = np.append(all_geo_x, geo_x)
-                    all_geo_y = np.append(all_geo_y, geo_y)
-                    all_data = np.append(all_data, [x_i_data], axis=0)
-            idx += 1
+                all_geo_x.append(geo_x)
+                all_geo_y.append(geo_y)
+                all_data.append(data)
+        idx += count
+
+        if progress_callback:
+            progress_callback(progress_frac)
 
     if return_np_arrays:
         nodata = None if skip_nodata else dst_nodata if replace_nodata else src_nodata
-        if idx != progress_curr:
-            all_geo_x = all_geo_x[:idx]
-            all_geo_y = all_geo_y[:idx]
-            all_data = all_data[:idx, :]
-        result = all_geo_x, all_geo_y, all_data.transpose(), nodata
+        if pre_allocate_np_arrays:
+            all_geo_x = all_geo_x[0][:idx]
+            all_geo_y = all_geo_y[0][:idx]
+            all_data = all_data[0][:, :idx]
+        else:
+            all_geo_x = np.concatenate(all_geo_x)
+            all_geo_y = np.concatenate(all_geo_y)
+            all_data = np.concatenate(all_data, axis=1)
+        result = all_geo_x, all_geo_y, all_data, nodata
 
     if dst_fh:
         gdal.VSIFCloseL(dst_fh)
+    if dst_writer:
+        dst_writer.close()
 
     return result
 
 
+def get_output_format(dstfile: Optional[PathLikeOrStr]) -> str:
+    """returns the output format guessed from the extension of dstfile"""
+    if dstfile is not None:
+        ext = os.path.splitext(os.fspath(dstfile))[1].lower()
+        if ext == ".npy":
+            return "NPY"
+        if ext == ".parquet":
+            return "Parquet"
+        if ext in (".arrow", ".arrows", ".feather", ".ipc"):
+            return "Arrow"
+    return "XYZ"
+
+
+class NPYPointWriter:
+    """
+    writes the points by chunks into a .npy file of a one dimensional
+    structured array, with one field per column
+    """
+
+    def __init__(
+        self,
+        filename: PathLikeOrStr,
+        field_names: Sequence[str],
+        np_dt,
+        max_count: int,
+    ):
+        self.dtype = np.dtype(
+            [
+                (name, np.float64 if i < 2 else np_dt)
+                for i, name in enumerate(field_names)
+            ]
+        )
+        self.count = 0
+        self.header_len = self.prefix_len = None
+        self.fh = gdal.VSIFOpenL(os.fspath(filename), "wb")
+        if self.fh is None:
+            raise IOError(f"Cannot create {filename}")
+        # The final number of points is only known at the end when nodata points
+        # are skipped, so the header written for the maximum number of points
+        # is rewritten on close, padded to the same length.
+        header = self.get_header(max_count)
+        self.header_len = len(header)
+        self._write(header)
+
+    def get_header(self, count: int) -> bytes:
+        header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+            np.lib.format.dtype_to_descr(self.dtype),
+            count,
+        )
+        if self.header_len is None:
+            # magic string, version and header length, then padding so that
+            # the data starts on a 64 bytes boundary, as written by NumPy
+            self.prefix_len = 10 if len(header) < 65536 - 64 else 12
+            header_len = self.prefix_len + len(header) + 1
+            header_len += -header_len % 64
+        else:
+            header_len = self.header_len
+        header = header.ljust(header_len - self.prefix_len - 1) + "\n"
+        if self.prefix_len == 10:
+            prefix = np.lib.format.magic(1, 0) + struct.pack("<H", len(header))
+        else:
+            prefix = np.lib.format.magic(2, 0) + struct.pack("<I", len(header))
+        return prefix + header.encode("latin1")
+
+    def _write(self, buffer: bytes):
+        if gdal.VSIFWriteL(buffer, len(buffer), 1, self.fh) != 1:
+            gdal.VSIFCloseL(self.fh)
+            raise IOError("Cannot write into destination file")
+
+    def write(self, geo_x: np.ndarray, geo_y: np.ndarray, data: np.ndarray):
+        records = np.empty(len(geo_x), dtype=self.dtype)
+        for name, values in zip(
+            self.dtype.names, itertools.chain((geo_x, geo_y), data)
+        ):
+            records[name] = values
+        self._write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        gdal.VSIFSeekL(self.fh, 0, 0)
+        self._write(self.get_header(self.count))
+        gdal.VSIFCloseL(self.fh)
+        self.fh = None
+
+
+class OGRPointWriter:
+    """
+    writes the points by chunks into an OGR layer (without geometry), through
+    the Arrow interface of the layer, which requires pyarrow
+    """
+
+    def __init__(
+        self,
+        filename: PathLikeOrStr,
+        driver_name: str,
+        field_names: Sequence[str],
+        layer_creation_options: Optional[Sequence[str]] = None,
+    ):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise Exception(f"pyarrow is required for the {driver_name} format.")
+        self.pa = pa
+        self.field_names = field_names
+
+        drv = gdal.GetDriverByName(driver_name)
+        if drv is None or not drv.GetMetadataItem(gdal.DCAP_VECTOR):
+            raise Exception(f"{driver_name} is not a known vector driver.")
+        filename = os.fspath(filename)
+        self.ds = drv.Create(filename, 0, 0, 0, gdal.GDT_Unknown)
+        layer_name = os.path.splitext(os.path.basename(filename))[0]
+        self.lyr = self.ds.CreateLayer(
+            layer_name, geom_type=ogr.wkbNone, options=layer_creation_options or []
+        )
+        self.fields_created = False
+
+    def write(self, geo_x: np.ndarray, geo_y: np.ndarray, data: np.ndarray):
+        pa = self.pa
+        # pyarrow arrays share the memory of the contiguous NumPy arrays
+        columns = [pa.array(geo_x), pa.array(geo_y)]
+        columns += [pa.array(np.ascontiguousarray(band_data)) for band_data in data]
+        batch = pa.RecordBatch.from_arrays(columns, names=self.field_names)
+        if not self.fields_created:
+            for field in batch.schema:
+                self.lyr.CreateFieldFromPyArrowSchema(field)
+            self.fields_created = True
+        if self.lyr.WritePyArrow(batch) != ogr.OGRERR_NONE:
+            raise IOError("Cannot write into destination layer")
+
+    def close(self):
+        self.ds.Close()
+        self.ds = None
+        self.lyr = None
+
+
+def iter_xyz_chunks(
+    bands: Sequence[gdal.Band],
+    gt: Sequence[float],
+    srcwin: Sequence[int],
+    x_skip: int = 1,
+    y_skip: int = 1,
+    np_dt=None,
+    src_nodata: Optional[np.ndarray] = None,
+    dst_nodata: Optional[np.ndarray] = None,
+    max_chunk_points: int = 1024 * 1024,
+) -> Iterator[Tuple[float, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    yields the points of a raster window by chunks of whole lines,
+    as tuples (progress_frac, geo_x, geo_y, data), with data of dims (bands, points)
+
+    src_nodata - points for which all the bands equal src_nodata are skipped,
+        or replaced by dst_nodata if dst_nodata is not None
+    max_chunk_points - maximum number of points read at once (at least one line is read)
+    """
+    x_off, y_off, x_size, y_size = srcwin
+    band_count = len(bands)
+
+    # pixel centers of the selected columns and lines
+    x_centers = np.arange(x_off, x_off + x_size, x_skip) + 0.5
+    y_lines = np.arange(y_off, y_off + y_size, y_skip)
+    lines_per_chunk = max(1, max_chunk_points // max(1, len(x_centers)))
+
+    for start in range(0, len(y_lines), lines_per_chunk):
+        chunk_lines = y_lines[start : start + lines_per_chunk]
+        line_count = len(chunk_lines)
+
+        data = np.empty((band_count, line_count, len(x_centers)), dtype=np_dt)
+        for i_bnd, band in enumerate(bands):
+            if y_skip == 1:
+                # read all the lines of the chunk at once
+                band_data = band.ReadAsArray(
+                    x_off, int(chunk_lines[0]), x_size, line_count
+                )
+                data[i_bnd] = band_data[:, ::x_skip]
+            else:
+                for i_line, y in enumerate(chunk_lines):
+                    band_data = band.ReadAsArray(x_off, int(y), x_size, 1)
+                    data[i_bnd, i_line] = band_data[0, ::x_skip]
+        data = data.reshape(band_count, -1)
+
+        y_centers = chunk_lines[:, np.newaxis] + 0.5
+        geo_x = (gt[0] + x_centers * gt[1] + y_centers * gt[2]).ravel()
+        geo_y = (gt[3] + x_centers * gt[4] + y_centers * gt[5]).ravel()
+
+        if src_nodata is not None:
+            is_nodata = np.all(data == src_nodata[:, np.newaxis], axis=0)
+            if dst_nodata is None:
+                is_valid = ~is_nodata
+                geo_x = geo_x[is_valid]
+                geo_y = geo_y[is_valid]
+                data = data[:, is_valid]
+            else:
+                data[:, is_nodata] = dst_nodata[:, np.newaxis]
+
+        yield (start + line_count) / len(y_lines), geo_x, geo_y, data
+
+
 class GDAL2XYZ(GDALScript):
     def __init__(self):
         super().__init__()
@@ -237,6 +455,7 @@ class GDAL2XYZ(GDALScript):
             But supporting other options, for example:
             * Select more then one band;
             * Skip or replace nodata value;
+            * Write the output in columnar formats (NumPy .npy, Parquet, Arrow);
             * Return the output as numpy arrays.""")
 
     def get_parser(self, argv) -> GDALArgumentParser:
@@ -322,6 +541,26 @@ class GDAL2XYZ(GDALScript):
             "(per band or per dataset).",
         )
 
+        parser.add_argument(
+            "-of",
+            dest="output_format",
+            metavar="format",
+            help="Output format: XYZ for delimited text, NPY for a NumPy structured array, "
+            "or the short name of an OGR vector driver, such as Parquet or Arrow. "
+            "If not specified, the format is guessed from the extension, "
+            "and defaults to XYZ.",
+        )
+
+        parser.add_argument(
+            "-lco",
+            dest="layer_creation_options",
+            type=str,
+            action="append",
+            metavar="name=value",
+            help="Specify a layer creation option of the OGR output format. "
+            "This may be specified multiple times.",
+        )
+
         parser.add_argument(
             "srcfile",
             metavar="src_dataset",
@@ -16,12 +16,17 @@
 # ******************************************************************************
 
 import argparse
+import collections
+import concurrent.futures
+import contextlib
 import glob
+import math
 import os
 import os.path
 import string
 import sys
 import textwrap
+import threading
 from numbers import Number
 from typing import Dict, Optional, Sequence, Tuple, Union
 
@@ -37,6 +42,7 @@ from osgeo_utils.auxiliary.rectangle import GeoRectangle
 from osgeo_utils.auxiliary.util import (
     GetOutputDriverFor,
     enable_gdal_exceptions,
+    get_num_threads,
     open_ds,
 )
 
@@ -91,6 +97,13 @@ work with two bands:
 
 sum all files with hidden noDataValue
     Calc(calc="sum(a,axis=0)", a=['0.tif','1.tif','2.tif'], outfile="sum.tif", hideNoData=True)
+
+get a dataset whose pixels are computed when read
+    ds = Calc(calc="where(A > 0, A * 2, 0)", A="input.tif", lazy=True)
+    gdal.Translate("result.tif", ds, srcWin=[0, 0, 256, 256])
+
+process windows of up to 512 MB, spanning several blocks, using all CPUs
+    Calc(calc="(A-B)/(A+B)", A="nir.tif", B="red.tif", outfile="ndvi.tif", num_threads="ALL_CPUS", max_memory=512)
 """
 
 
@@ -110,6 +123,10 @@ def Calc(
     extent: Optional[Extent] = None,
     projwin: Optional[Union[Tuple, GeoRectangle]] = None,
     user_namespace: Optional[Dict] = None,
+    lazy: bool = False,
+    num_threads: Optional[Union[int, str]] = None,
+    window_size: Optional[Sequence[int]] = None,
+    max_memory: Optional[Number] = None,
     debug: bool = False,
     quiet: bool = False,
     progress_callback: Optional = gdal.TermProgress_nocb,
@@ -147,9 +164,22 @@ def Calc(
 
     if not calc:
         raise Exception("No calculation provided.")
+    elif lazy:
+        if outfile:
+            raise Exception("Output file cannot be provided in lazy mode.")
+        format = "VRT"
     elif not outfile and format.upper() != "MEM":
         raise Exception("No output file provided.")
 
+    # parse the calculations once, instead of once per block
+    compiled_calc = []
+    for this_calc in calc:
+        try:
+            compiled_calc.append(compile(this_calc, "<calc>", "eval"))
+        except SyntaxError:
+            print(f"evaluation of calculation {this_calc} failed")
+            raise
+
     if format is None:
         format = GetOutputDriverFor(outfile)
 
@@ -332,10 +362,23 @@ def Calc(
         if GeoTransformCheck is None:
             raise Exception("Error! The requested extent is empty. Cannot proceed")
         for i in range(len(myFileNames)):
-            temp_vrt_filename, temp_vrt_ds = extent_util.make_temp_vrt(
-                myFiles[i], ExtentCheck
-            )
-            myTempFileNames.append(temp_vrt_filename)
+            if lazy:
+                # the VRT must outlive this function, so keep it in memory
+                temp_vrt_ds = gdal.BuildVRT(
+                    "",
+                    myFiles[i],
+                    outputBounds=(
+                        ExtentCheck.min_x,
+                        ExtentCheck.min_y,
+                        ExtentCheck.max_x,
+                        ExtentCheck.max_y,
+                    ),
+                )
+            else:
+                temp_vrt_filename, temp_vrt_ds = extent_util.make_temp_vrt(
+                    myFiles[i], ExtentCheck
+                )
+                myTempFileNames.append(temp_vrt_filename)
             myFiles[i] = None  # close original ds
             myFiles[i] = temp_vrt_ds  # replace original ds with vrt_ds
 
@@ -344,6 +387,24 @@ def Calc(
             DimensionsCheck = [temp_vrt_ds.RasterXSize, temp_vrt_ds.RasterYSize]
         temp_vrt_ds = None
 
+    if lazy:
+        return make_lazy_dataset(
+            calc=calc,
+            compiled_calc=compiled_calc,
+            files=myFiles,
+            bands=myBands,
+            alphas=myAlphaList,
+            alpha_file_lists=myAlphaFileLists,
+            all_bands_index=allBandsIndex,
+            all_bands_count=allBandsCount,
+            NoDataValue=NoDataValue,
+            hideNoData=hideNoData,
+            type=type,
+            color_table=color_table,
+            user_namespace=user_namespace,
+            debug=debug,
+        )
+
     ################################################################
     # set up output file
     ################################################################
@@ -466,34 +527,63 @@ def Calc(
     # find block size to chop grids into bite-sized chunks
     ################################################################
 
-    # use the block size of the first layer to read efficiently
-    myBlockSize = myFiles[0].GetRasterBand(myBands[0]).GetBlockSize()
+    num_threads = get_num_threads(num_threads)
+    if debug and num_threads > 1:
+        print(f"using {num_threads} threads")
+
+    if window_size:
+        # use the requested processing window
+        myBlockSize = [
+            min(int(window_size[0]), DimensionsCheck[0]),
+            min(int(window_size[1]), DimensionsCheck[1]),
+        ]
+    elif max_memory:
+        # use a processing window aligned on the block grids of all the
+        # inputs and of the output, as large as allowed by max_memory
+        block_sizes = [
+            myFiles[i].GetRasterBand(myBands[i]).GetBlockSize()
+            for i in range(len(myFiles))
+        ]
+        block_sizes.append(myOut.GetRasterBand(1).GetBlockSize())
+        # input buffers, nodata masks, and the result with an intermediate array
+        bytes_per_pixel = (
+            sum(
+                gdal.GetDataTypeSizeBytes(myFiles[i].GetRasterBand(myBands[i]).DataType)
+                for i in range(len(myFiles))
+            )
+            + 2
+            + 2 * max(8, gdal.GetDataTypeSizeBytes(myOutType))
+        )
+        # each thread holds its own buffers, and up to 2 results per thread
+        # may be waiting to be written
+        if num_threads > 1:
+            bytes_per_pixel *= 3 * num_threads
+        myBlockSize = get_processing_window_size(
+            block_sizes,
+            DimensionsCheck,
+            int(float(max_memory) * 1024 * 1024) // bytes_per_pixel,
+        )
+    else:
+        # use the block size of the first layer to read efficiently
+        myBlockSize = myFiles[0].GetRasterBand(myBands[0]).GetBlockSize()
     # find total x and y blocks to be read
     nXBlocks = (int)((DimensionsCheck[0] + myBlockSize[0] - 1) / myBlockSize[0])
     nYBlocks = (int)((DimensionsCheck[1] + myBlockSize[1] - 1) / myBlockSize[1])
-    myBufSize = myBlockSize[0] * myBlockSize[1]
 
     if debug:
         print(f"using blocksize {myBlockSize[0]} x {myBlockSize[1]}")
 
     # variables for displaying progress
-    ProgressCt = -1
+    ProgressCt = 0
     ProgressEnd = nXBlocks * nYBlocks * allBandsCount
 
     ################################################################
-    # start looping through each band in allBandsCount
+    # find the layout of the lettered arrays for each output band
     ################################################################
 
+    count_file_per_alpha_per_band = {}
+    largest_datatype_per_alpha_per_band = {}
     for bandNo in range(1, allBandsCount + 1):
-
-        ################################################################
-        # start looping through blocks of data
-        ################################################################
-
-        # store these numbers in variables that may change later
-        nXValid = myBlockSize[0]
-        nYValid = myBlockSize[1]
-
         count_file_per_alpha = {}
         largest_datatype_per_alpha = {}
         for i, Alpha in enumerate(myAlphaList):
@@ -513,139 +603,233 @@ def Calc(
                         largest_datatype_per_alpha[Alpha] = gdal.DataTypeUnion(
                             largest_datatype_per_alpha[Alpha], band.DataType
                         )
+        count_file_per_alpha_per_band[bandNo] = count_file_per_alpha
+        largest_datatype_per_alpha_per_band[bandNo] = largest_datatype_per_alpha
+
+    # lock serializing the reads of inputs that cannot be re-opened per thread
+    # (i.e. Dataset objects given by the caller)
+    shared_files_lock = threading.Lock()
+
+    # arrays of the eval namespace that must not be modified in place
+    namespace_arrays = [
+        v for v in global_namespace.values() if isinstance(v, numpy.ndarray)
+    ]
+
+    def calc_block(files, buffers, bandNo, myX, myY, nXValid, nYValid):
+        """Read a window of every input layer and evaluate the calculation on it.
+
+        files holds the input DataSets to read from. A None item means that
+        the corresponding DataSet of myFiles must be read under shared_files_lock.
+        buffers is a dict of arrays reused from one window to the next one.
+        """
+
+        count_file_per_alpha = count_file_per_alpha_per_band[bandNo]
+        largest_datatype_per_alpha = largest_datatype_per_alpha_per_band[bandNo]
+        shape = (nYValid, nXValid)
+
+        # boolean buffer to mark where nodata occurs
+        myNDVs = None
+
+        # make local namespace for calculation
+        local_namespace = {}
+
+        # Get destination numpy arrays for each alpha
+        numpy_arrays = {}
+        counter_per_alpha = {}
+        for Alpha in count_file_per_alpha:
+            dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
+                largest_datatype_per_alpha[Alpha]
+            )
+            if count_file_per_alpha[Alpha] == 1:
+                buf_shape = shape
+            else:
+                buf_shape = (count_file_per_alpha[Alpha],) + shape
+            numpy_arrays[Alpha] = get_buffer(buffers, (Alpha, buf_shape), dtype)
+            counter_per_alpha[Alpha] = 0
 
-        # loop through X-lines
-        for X in range(0, nXBlocks):
-
-            # in case the blocks don't fit perfectly
-            # change the block size of the final piece
-            if X == nXBlocks - 1:
-                nXValid = DimensionsCheck[0] - X * myBlockSize[0]
-
-            # find X offset
-            myX = X * myBlockSize[0]
-
-            # reset buffer size for start of Y loop
-            nYValid = myBlockSize[1]
-            myBufSize = nXValid * nYValid
-
-            # loop through Y lines
-            for Y in range(0, nYBlocks):
-                ProgressCt += 1
-                if not quiet:
-                    progress_callback(float(ProgressCt) / ProgressEnd, "", None)
-
-                # change the block size of the final piece
-                if Y == nYBlocks - 1:
-                    nYValid = DimensionsCheck[1] - Y * myBlockSize[1]
-                    myBufSize = nXValid * nYValid
-
-                # find Y offset
-                myY = Y * myBlockSize[1]
+        # fetch data for each input layer
+        for i, Alpha in enumerate(myAlphaList):
 
-                # create empty buffer to mark where nodata occurs
-                myNDVs = None
+            # populate lettered arrays with values
+            if allBandsIndex is not None and allBandsIndex == i:
+                myBandNo = bandNo
+            else:
+                myBandNo = myBands[i]
 
-                # make local namespace for calculation
-                local_namespace = {}
+            if files[i] is None:
+                myFile = myFiles[i]
+                lock = shared_files_lock
+            else:
+                myFile = files[i]
+                lock = contextlib.nullcontext()
 
-                # Create destination numpy arrays for each alpha
-                numpy_arrays = {}
-                counter_per_alpha = {}
-                for Alpha in count_file_per_alpha:
-                    dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
-                        largest_datatype_per_alpha[Alpha]
-                    )
+            with lock:
+                band = myFile.GetRasterBand(myBandNo)
+                if Alpha in myAlphaFileLists:
                     if count_file_per_alpha[Alpha] == 1:
-                        numpy_arrays[Alpha] = numpy.empty(
-                            (nYValid, nXValid), dtype=dtype
-                        )
+                        buf_obj = numpy_arrays[Alpha]
                     else:
-                        numpy_arrays[Alpha] = numpy.empty(
-                            (count_file_per_alpha[Alpha], nYValid, nXValid), dtype=dtype
-                        )
-                    counter_per_alpha[Alpha] = 0
+                        buf_obj = numpy_arrays[Alpha][counter_per_alpha[Alpha]]
+                    counter_per_alpha[Alpha] += 1
+                    key = None
+                else:
+                    # the array allocated by the first read is reused afterwards
+                    key = (i, band.DataType, shape)
+                    buf_obj = buffers.get(key)
+                myval = gdal_array.BandReadAsArray(
+                    band,
+                    xoff=myX,
+                    yoff=myY,
+                    win_xsize=nXValid,
+                    win_ysize=nYValid,
+                    buf_obj=buf_obj,
+                )
+            if myval is None:
+                raise Exception(
+                    f"Input block reading failed from filename {myFileNames[i]}"
+                )
+            if key is not None:
+                buffers[key] = myval
+
+            # fill in nodata values
+            if myNDV[i] is not None:
+                # myNDVs is a boolean buffer.
+                # a cell is True if there is NDV in any of the corresponding cells in input raster bands.
+                if myNDVs is None:
+                    # this is the first band that has NDV set.
+                    myNDVs = get_buffer(buffers, ("nodata_mask", shape), bool)
+                    numpy.equal(myval, myNDV[i], out=myNDVs)
+                else:
+                    is_ndv = get_buffer(buffers, ("nodata_scratch", shape), bool)
+                    numpy.equal(myval, myNDV[i], out=is_ndv)
+                    numpy.logical_or(myNDVs, is_ndv, out=myNDVs)
 
-                # fetch data for each input layer
-                for i, Alpha in enumerate(myAlphaList):
+            # add an array of values for this block to the eval namespace
+            if Alpha not in myAlphaFileLists:
+                local_namespace[Alpha] = myval
+            myval = None
 
-                    # populate lettered arrays with values
-                    if allBandsIndex is not None and allBandsIndex == i:
-                        myBandNo = bandNo
-                    else:
-                        myBandNo = myBands[i]
+        for lst in myAlphaFileLists:
+            local_namespace[lst] = numpy_arrays[lst]
 
-                    if Alpha in myAlphaFileLists:
-                        if count_file_per_alpha[Alpha] == 1:
-                            buf_obj = numpy_arrays[Alpha]
-                        else:
-                            buf_obj = numpy_arrays[Alpha][counter_per_alpha[Alpha]]
-                        myval = gdal_array.BandReadAsArray(
-                            myFiles[i].GetRasterBand(myBandNo),
-                            xoff=myX,
-                            yoff=myY,
-                            win_xsize=nXValid,
-                            win_ysize=nYValid,
-                            buf_obj=buf_obj,
-                        )
-                        counter_per_alpha[Alpha] += 1
-                    else:
-                        myval = gdal_array.BandReadAsArray(
-                            myFiles[i].GetRasterBand(myBandNo),
-                            xoff=myX,
-                            yoff=myY,
-                            win_xsize=nXValid,
-                            win_ysize=nYValid,
-                        )
-                    if myval is None:
-                        raise Exception(
-                            f"Input block reading failed from filename {filename[i]}"
-                        )
+        # try the calculation on the array blocks
+        calc_idx = bandNo - 1 if len(calc) > 1 else 0
+        try:
+            myResult = eval(compiled_calc[calc_idx], global_namespace, local_namespace)
+        except Exception:
+            print(f"evaluation of calculation {calc[calc_idx]} failed")
+            raise
+
+        # Propagate nodata values (set nodata value to the nodata cells).
+        if myNDVs is not None and myOutNDV is not None:
+            myResult = numpy.asarray(myResult)
+            dtype = myResult.dtype
+            if not can_hold_value(dtype, myOutNDV):
+                dtype = numpy.promote_types(dtype, numpy.asarray(myOutNDV).dtype)
+            if (
+                myResult.shape != shape
+                or myResult.dtype != dtype
+                or not myResult.flags.writeable
+                or any(numpy.may_share_memory(myResult, a) for a in namespace_arrays)
+            ):
+                myResult = numpy.array(numpy.broadcast_to(myResult, shape), dtype=dtype)
+            numpy.copyto(myResult, myOutNDV, where=myNDVs, casting="unsafe")
+        elif not isinstance(myResult, numpy.ndarray):
+            myResult = numpy.ones(shape) * myResult
+
+        # Convert float16 to float32 if necessary
+        # (While numpy probably supports float16, GDAL may not)
+        if myResult.dtype == "float16":
+            myResult = numpy.float32(myResult)
+
+        return myResult
+
+    def write_block(bandNo, myX, myY, myResult):
+        nonlocal ProgressCt
+        if not quiet:
+            progress_callback(float(ProgressCt) / ProgressEnd, "", None)
+        ProgressCt += 1
+
+        # write data block to the output file
+        myOutB = myOut.GetRasterBand(bandNo)
+        if gdal_array.BandWriteArray(myOutB, myResult, xoff=myX, yoff=myY) != 0:
+            raise Exception("Block writing failed")
+        myOutB = None  # write to band
+
+    def iter_windows():
+        # loop through each band in allBandsCount, then through X-lines and Y-lines
+        for bandNo in range(1, allBandsCount + 1):
+            for X in range(0, nXBlocks):
+                # find X offset
+                myX = X * myBlockSize[0]
+                # in case the blocks don't fit perfectly
+                # change the block size of the final piece
+                nXValid = min(myBlockSize[0], DimensionsCheck[0] - myX)
+                for Y in range(0, nYBlocks):
+                    # find Y offset
+                    myY = Y * myBlockSize[1]
+                    nYValid = min(myBlockSize[1], DimensionsCheck[1] - myY)
+                    yield bandNo, myX, myY, nXValid, nYValid
+
+    ################################################################
+    # start looping through blocks of data
+    ################################################################
 
-                    # fill in nodata values
-                    if myNDV[i] is not None:
-                        # myNDVs is a boolean buffer.
-                        # a cell equals to 1 if there is NDV in any of the corresponding cells in input raster bands.
-                        if myNDVs is None:
-                            # this is the first band that has NDV set. we initializes myNDVs to a zero buffer
-                            # as we didn't see any NDV value yet.
-                            myNDVs = numpy.zeros(myBufSize)
-                            myNDVs.shape = (nYValid, nXValid)
-                        myNDVs = 1 * numpy.logical_or(myNDVs == 1, myval == myNDV[i])
-
-                    # add an array of values for this block to the eval namespace
-                    if Alpha not in myAlphaFileLists:
-                        local_namespace[Alpha] = myval
-                    myval = None
-
-                for lst in myAlphaFileLists:
-                    local_namespace[lst] = numpy_arrays[lst]
-
-                # try the calculation on the array blocks
-                this_calc = calc[bandNo - 1 if len(calc) > 1 else 0]
-                try:
-                    myResult = eval(this_calc, global_namespace, local_namespace)
-                except Exception:
-                    print(f"evaluation of calculation {this_calc} failed")
-                    raise
-
-                # Propagate nodata values (set nodata cells to zero
-                # then add nodata value to these cells).
-                if myNDVs is not None and myOutNDV is not None:
-                    myResult = ((1 * (myNDVs == 0)) * myResult) + (myOutNDV * myNDVs)
-                elif not isinstance(myResult, numpy.ndarray):
-                    myResult = numpy.ones((nYValid, nXValid)) * myResult
-
-                # Convert float16 to float32 if necessary
-                # (While numpy probably supports float16, GDAL may not)
-                if myResult.dtype == "float16":
-                    myResult = numpy.float32(myResult)
-
-                # write data block to the output file
-                myOutB = myOut.GetRasterBand(bandNo)
-                if gdal_array.BandWriteArray(myOutB, myResult, xoff=myX, yoff=myY) != 0:
-                    raise Exception("Block writing failed")
-                myOutB = None  # write to band
+    if num_threads <= 1 or ProgressEnd <= 1:
+        buffers = {}
+        for window in iter_windows():
+            myResult = calc_block(myFiles, buffers, *window)
+            write_block(*window[0:3], myResult)
+    else:
+        # Each worker thread reads from its own handles on the input files,
+        # while the blocks are written in order by the current thread, which
+        # is the only one accessing the output dataset.
+        input_names = [
+            myTempFileNames[i] if myTempFileNames else myFileNames[i]
+            for i in range(len(myFiles))
+        ]
+        thread_data = threading.local()
+        thread_files = []
+
+        @enable_gdal_exceptions
+        def calc_block_in_thread(window):
+            files = getattr(thread_data, "files", None)
+            if files is None:
+                files = [
+                    open_ds(name) if name is not None else None for name in input_names
+                ]
+                thread_data.files = files
+                thread_data.buffers = {}
+                with shared_files_lock:
+                    thread_files.append(files)
+            buffers = thread_data.buffers
+            myResult = calc_block(files, buffers, *window)
+            # the buffers of this thread are reused for its next window
+            # while this result waits to be written
+            if any(numpy.may_share_memory(myResult, a) for a in buffers.values()):
+                myResult = myResult.copy()
+            return myResult
+
+        # limit the number of computed blocks waiting to be written
+        max_pending = 2 * num_threads
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+            pending = collections.deque()
+            try:
+                for window in iter_windows():
+                    pending.append(
+                        (window, executor.submit(calc_block_in_thread, window))
+                    )
+                    if len(pending) >= max_pending:
+                        window, future = pending.popleft()
+                        write_block(*window[0:3], future.result())
+                while pending:
+                    window, future = pending.popleft()
+                    write_block(*window[0:3], future.result())
+            finally:
+                for _, future in pending:
+                    future.cancel()
+        thread_data = None
+        thread_files.clear()
 
     # remove temp files
     for idx, tempFile in enumerate(myTempFileNames):
@@ -663,6 +847,186 @@ def Calc(
     return myOut
 
 
+# functions of gdal returning lazily evaluated bands, for use in lazy mode
+LazyFunctionNames = (
+    "where",
+    "minimum",
+    "maximum",
+    "mean",
+    "abs",
+    "sqrt",
+    "log",
+    "log10",
+    "pow",
+    "logical_and",
+    "logical_or",
+    "logical_not",
+)
+
+
+def make_lazy_dataset(
+    calc: Sequence[str],
+    compiled_calc: Sequence,
+    files: Sequence[gdal.Dataset],
+    bands: Sequence[int],
+    alphas: Sequence[str],
+    alpha_file_lists: Sequence[str],
+    all_bands_index: Optional[int],
+    all_bands_count: int,
+    NoDataValue: Optional[Number],
+    hideNoData: bool,
+    type: Optional[Union[GDALDataType, str]],
+    color_table: Optional[ColorTableLike],
+    user_namespace: Optional[Dict],
+    debug: bool,
+) -> gdal.Dataset:
+    """Evaluate the calculations on gdal.Band objects, and return a VRT dataset
+    whose pixels are only computed when read.
+
+    Only the operators and functions supported by the lazily evaluated bands of gdal
+    (see LazyFunctionNames) can be used in the calculations.
+    """
+
+    global_namespace = {key: getattr(gdal, key) for key in LazyFunctionNames}
+    if user_namespace:
+        global_namespace.update(user_namespace)
+
+    if isinstance(type, str):
+        type = gdal.GetDataTypeByName(type)
+
+    if hideNoData:
+        # inputs without nodata value
+        files = [
+            gdal.BuildVRT("", ds, srcNodata="None", VRTNodata="None") for ds in files
+        ]
+
+    # objects that must stay alive as long as the returned dataset
+    references = list(files)
+    band_datasets = []
+    for bandNo in range(1, all_bands_count + 1):
+        local_namespace = {}
+        for i, Alpha in enumerate(alphas):
+            if all_bands_index is not None and all_bands_index == i:
+                myBandNo = bandNo
+            else:
+                myBandNo = bands[i]
+            band = files[i].GetRasterBand(myBandNo)
+            if Alpha in alpha_file_lists:
+                local_namespace.setdefault(Alpha, []).append(band)
+            else:
+                local_namespace[Alpha] = band
+
+        calc_idx = bandNo - 1 if len(calc) > 1 else 0
+        try:
+            myResult = eval(compiled_calc[calc_idx], global_namespace, local_namespace)
+        except Exception:
+            print(f"evaluation of calculation {calc[calc_idx]} failed")
+            raise
+        if not isinstance(myResult, gdal.Band):
+            raise Exception(
+                f"Error! Calculation {calc[calc_idx]} does not evaluate to a band "
+                f"in lazy mode"
+            )
+        if type:
+            myResult = myResult.astype(type)
+
+        # find the output nodata value
+        myOutType = myResult.DataType
+        if NoDataValue is None and not hideNoData:
+            myOutNDV = DefaultNDVLookup[myOutType]
+        elif isinstance(NoDataValue, str) and NoDataValue.lower() == "none":
+            myOutNDV = "None"
+        else:
+            myOutNDV = NoDataValue
+
+        # single band VRT referencing the result band, with the nodata value of
+        # the result (propagated from the inputs) replaced by the output one
+        result_vrt_ds = gdal.Translate(
+            "", myResult.GetDataset(), format="VRT", bandList=[myResult.GetBand()]
+        )
+        if myOutNDV is None:
+            band_ds = gdal.BuildVRT("", result_vrt_ds)
+        else:
+            myResultNDV = myResult.GetNoDataValue()
+            band_ds = gdal.BuildVRT(
+                "",
+                result_vrt_ds,
+                srcNodata=(
+                    "None" if myOutNDV == "None" or myResultNDV is None else myResultNDV
+                ),
+                VRTNodata=myOutNDV,
+            )
+        references += [myResult, result_vrt_ds]
+        band_datasets.append(band_ds)
+
+    if len(band_datasets) == 1:
+        myOut = band_datasets[0]
+    else:
+        myOut = gdal.BuildVRT("", band_datasets, separate=True)
+        references += band_datasets
+
+    if color_table:
+        if is_path_like(color_table):
+            color_table = get_color_table(color_table)
+        for i in range(1, myOut.RasterCount + 1):
+            myOutB = myOut.GetRasterBand(i)
+            myOutB.SetRasterColorTable(color_table)
+            myOutB.SetRasterColorInterpretation(gdal.GCI_PaletteIndex)
+
+    if debug:
+        print(
+            f"lazy output dimensions: {myOut.RasterXSize}, {myOut.RasterYSize}, "
+            f"type: {gdal.GetDataTypeName(myOut.GetRasterBand(1).DataType)}"
+        )
+
+    myOut._calc_references = references
+    return myOut
+
+
+def get_processing_window_size(
+    block_sizes: Sequence[Sequence[int]],
+    dimensions: Sequence[int],
+    max_pixels: int,
+) -> Tuple[int, int]:
+    """returns the largest processing window, aligned on all the block_sizes grids,
+    of at most max_pixels (but at least one block), favoring full-width windows"""
+    align_x = 1
+    align_y = 1
+    for block_x, block_y in block_sizes:
+        align_x = align_x * block_x // math.gcd(align_x, block_x)
+        align_y = align_y * block_y // math.gcd(align_y, block_y)
+    align_x = min(align_x, dimensions[0])
+    align_y = min(align_y, dimensions[1])
+
+    if dimensions[0] * align_y <= max_pixels:
+        # full-width windows, of as many aligned rows as possible
+        rows = max_pixels // (dimensions[0] * align_y) * align_y
+        return dimensions[0], min(max(rows, align_y), dimensions[1])
+    columns = max_pixels // (align_x * align_y) * align_x
+    return min(max(columns, align_x), dimensions[0]), align_y
+
+
+def get_buffer(buffers: Dict, key: Tuple, dtype) -> numpy.ndarray:
+    """returns the array of buffers with the given key, shape and dtype, creating it if needed"""
+    shape = key[-1]
+    buf = buffers.get(key)
+    if buf is None or buf.dtype != dtype:
+        buf = numpy.empty(shape, dtype=dtype)
+        buffers[key] = buf
+    return buf
+
+
+def can_hold_value(dtype, value) -> bool:
+    """returns True if value can be stored in an array of the given dtype without loss"""
+    value = numpy.asarray(value)
+    with numpy.errstate(all="ignore"):
+        cast_value = value.astype(dtype)
+        common_dtype = numpy.promote_types(cast_value.dtype, value.dtype)
+        if cast_value.astype(common_dtype) == value.astype(common_dtype):
+            return True
+    return bool(numpy.isnan(value) and numpy.isnan(cast_value))
+
+
 def doit(opts):
     kwargs = vars(opts)
     if "outF" in kwargs:
@@ -829,6 +1193,31 @@ class GDALCalc(GDALScript):
             metavar="[a-z, A-Z]",
             help="process all bands of given raster [a-z, A-Z]",
         )
+        parser.add_argument(
+            "--threads",
+            dest="num_threads",
+            type=str,
+            metavar="ALL_CPUS|<number>",
+            help="number of threads used to read and evaluate blocks concurrently",
+        )
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "--window-size",
+            dest="window_size",
+            type=int,
+            nargs=2,
+            metavar=("xsize", "ysize"),
+            help="size in pixels of the windows read and evaluated at once "
+            "(default block size of the first input)",
+        )
+        group.add_argument(
+            "--max-memory",
+            dest="max_memory",
+            type=float,
+            metavar="MB",
+            help="memory budget used to pick windows spanning several blocks, "
+            "aligned on the block grids of all inputs and of the output",
+        )
         parser.add_argument(
             "--overwrite",
             dest="overwrite",
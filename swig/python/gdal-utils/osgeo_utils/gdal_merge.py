@@ -29,12 +29,20 @@
 # building the stack.
 # anssi.pekkarinen@fao.org
 
+import collections
+import concurrent.futures
+import json
 import math
 import sys
+import threading
 import time
 
 from osgeo import gdal
-from osgeo_utils.auxiliary.util import GetOutputDriverFor
+from osgeo_utils.auxiliary.util import (
+    GetOutputDriverFor,
+    enable_gdal_exceptions,
+    get_num_threads,
+)
 
 progress = gdal.TermProgress_nocb
 
@@ -83,13 +91,7 @@ def raster_copy(
         )
 
     s_band = s_fh.GetRasterBand(s_band_n)
-    m_band = None
-    # Works only in binary mode and doesn't take into account
-    # intermediate transparency values for compositing.
-    if s_band.GetMaskFlags() != gdal.GMF_ALL_VALID:
-        m_band = s_band.GetMaskBand()
-    elif s_band.GetColorInterpretation() == gdal.GCI_AlphaBand:
-        m_band = s_band
+    m_band = get_mask_band(s_band)
     if m_band is not None:
         return raster_copy_with_mask(
             s_fh,
@@ -123,6 +125,23 @@ def raster_copy(
 # =============================================================================
 
 
+def get_mask_band(s_band):
+    """
+    Returns the band holding the validity mask of s_band, or None if all
+    its pixels are valid.
+    """
+    # Works only in binary mode and doesn't take into account
+    # intermediate transparency values for compositing.
+    if s_band.GetMaskFlags() != gdal.GMF_ALL_VALID:
+        return s_band.GetMaskBand()
+    if s_band.GetColorInterpretation() == gdal.GCI_AlphaBand:
+        return s_band
+    return None
+
+
+# =============================================================================
+
+
 def raster_copy_with_nodata(
     s_fh,
     s_xoff,
@@ -196,25 +215,523 @@ def raster_copy_with_mask(
 # =============================================================================
 
 
-def names_to_fileinfos(names):
+def raster_copy_into_buffer(
+    s_fh,
+    s_xoff,
+    s_yoff,
+    s_xsize,
+    s_ysize,
+    s_band_n,
+    buffer,
+    covered,
+    nodata=None,
+):
+    """
+    Copy a window of a source band into the pixels of a numpy array that are
+    not covered yet, resampled to the dimensions of the array, and add the
+    valid (not nodata nor masked out) source pixels to the covered ones.
+
+    The source window may have non integer offsets and dimensions.
+
+    buffer -- numpy array receiving the data.
+
+    covered -- boolean numpy array of the same shape, updated in place.
+    """
+    import numpy as np
+
+    if covered.all():
+        return 0
+
+    s_band = s_fh.GetRasterBand(s_band_n)
+    t_ysize, t_xsize = buffer.shape
+
+    data_src = None
+    valid = None
+    if nodata is not None:
+        data_src = s_band.ReadAsArray(
+            s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize
+        )
+        if not np.isnan(nodata):
+            valid = np.not_equal(data_src, nodata)
+        else:
+            valid = ~np.isnan(data_src)
+    else:
+        m_band = get_mask_band(s_band)
+        if m_band is not None:
+            data_mask = m_band.ReadAsArray(
+                s_xoff, s_yoff, s_xsize, s_ysize, t_xsize, t_ysize
+            )
+            valid = np.not_equal(data_mask, 0)
+
+    if valid is None and not covered.any():
+        s_band.ReadAsArray(s_xoff, s_yoff, s_xsize, s_ysize, buf_obj=buffer)
+        covered[...] = True
+        return 0
+
+    if data_src is None or data_src.dtype != buffer.dtype:
+        # let GDAL convert the values to the target data type
+        data_src = np.empty(buffer.shape, dtype=buffer.dtype)
+        s_band.ReadAsArray(s_xoff, s_yoff, s_xsize, s_ysize, buf_obj=data_src)
+    to_copy = ~covered
+    if valid is not None:
+        to_copy &= valid
+    np.copyto(buffer, data_src, where=to_copy)
+    covered |= to_copy
+
+    return 0
+
+
+# =============================================================================
+
+
+class DatasetCache:
+    """A bounded least recently used cache of opened GDAL datasets."""
+
+    def __init__(self, max_size):
+        self.max_size = max(1, max_size)
+        self.datasets = collections.OrderedDict()
+
+    def get(self, filename):
+        """Returns the dataset opened from filename, opening it if needed."""
+        ds = self.datasets.pop(filename, None)
+        if ds is None:
+            ds = gdal.Open(filename)
+            while len(self.datasets) >= self.max_size:
+                self.datasets.popitem(last=False)
+        self.datasets[filename] = ds
+        return ds
+
+    def clear(self):
+        self.datasets.clear()
+
+
+# =============================================================================
+
+
+def get_chunk_windows(t_fh, chunk_size=1024):
+    """
+    Split the target dataset into windows of about chunk_size x chunk_size
+    pixels, aligned on the block grid of its first band.
+
+    Returns a list of (xoff, yoff, xsize, ysize) tuples.
+    """
+    xsize = t_fh.RasterXSize
+    ysize = t_fh.RasterYSize
+    blockxsize, blockysize = t_fh.GetRasterBand(1).GetBlockSize()
+
+    chunk_xsize = max(blockxsize, chunk_size // blockxsize * blockxsize)
+    chunk_xsize = min(chunk_xsize, xsize)
+    # favor full width chunks for strip organized targets
+    chunk_ysize = chunk_size * chunk_size // chunk_xsize
+    chunk_ysize = max(blockysize, chunk_ysize // blockysize * blockysize)
+
+    return [
+        (xoff, yoff, min(chunk_xsize, xsize - xoff), min(chunk_ysize, ysize - yoff))
+        for yoff in range(0, ysize, chunk_ysize)
+        for xoff in range(0, xsize, chunk_xsize)
+    ]
+
+
+# =============================================================================
+
+
+def copy_by_chunks(
+    copies,
+    t_fh,
+    nodata_arg=None,
+    num_threads=1,
+    chunk_size=1024,
+    max_open_datasets=100,
+    progress_callback=None,
+    verbose=0,
+    file_index=None,
+    composite="last",
+    init_values=None,
+):
+    """
+    Copy the images of several files into the target file, chunk by chunk.
+
+    The target is split into block aligned chunks. The intersecting source
+    windows of each chunk are composited into in-memory buffers, and each
+    chunk is written once. The target is only read for the pixels of a
+    chunk that no source covers, unless init_values is specified.
+    Chunks don't overlap, so they can be processed by several threads,
+    each one reading from its own bounded cache of opened source datasets,
+    while the target is only accessed from the calling thread.
+
+    copies -- list of (file_info, source band number, target band number)
+    tuples, in compositing order.
+
+    file_index -- FootprintIndex of the files of copies, used to find the
+    files intersecting each chunk. Built from copies if not specified.
+
+    composite -- "last" for the last valid source pixel to win, as when
+    copying the files one after the other, or "first" for the first one.
+
+    init_values -- list of the initial values of the target bands. If
+    specified, the target content is ignored and all its chunks are written.
+
+    Returns 1 on success.
+    """
+    from osgeo import gdal_array
+
+    if composite not in ("first", "last"):
+        raise ValueError("composite must be 'first' or 'last'")
+
+    t_geotransform = t_fh.GetGeoTransform()
+    dtypes = [
+        gdal_array.GDALTypeCodeToNumericTypeCode(t_fh.GetRasterBand(i + 1).DataType)
+        for i in range(t_fh.RasterCount)
+    ]
+
+    if init_values is not None:
+        # convert the initial values as GDALRasterBand::Fill() would
+        init_arrays = []
+        for i in range(t_fh.RasterCount):
+            data_type = t_fh.GetRasterBand(i + 1).DataType
+            mem_ds = gdal.GetDriverByName("MEM").Create("", 1, 1, 1, data_type)
+            mem_ds.GetRasterBand(1).Fill(init_values[i])
+            init_arrays.append(mem_ds.GetRasterBand(1).ReadAsArray()[0, 0])
+        mem_ds = None
+
+    # copies of each file intersecting the target, with their windows
+    file_copies = collections.OrderedDict()
+    for fi, s_band_n, t_band_n in copies:
+        if fi not in file_copies:
+            file_copies[fi] = []
+            window = fi.get_windows(t_geotransform, t_fh.RasterXSize, t_fh.RasterYSize)
+        if window is not None:
+            file_copies[fi].append((s_band_n, t_band_n, window))
+    file_copies = collections.OrderedDict(
+        (fi, fi_copies) for fi, fi_copies in file_copies.items() if fi_copies
+    )
+    if file_index is None:
+        file_index = FootprintIndex(file_copies.keys())
+
+    def get_chunk_copies(chunk):
+        xoff, yoff, xsize, ysize = chunk
+        x0 = t_geotransform[0] + xoff * t_geotransform[1]
+        x1 = t_geotransform[0] + (xoff + xsize) * t_geotransform[1]
+        y0 = t_geotransform[3] + yoff * t_geotransform[5]
+        y1 = t_geotransform[3] + (yoff + ysize) * t_geotransform[5]
+        chunk_copies = []
+        for fi in file_index.query(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)):
+            for s_band_n, t_band_n, window in file_copies.get(fi, ()):
+                tw_xoff, tw_yoff, tw_xsize, tw_ysize = window[0:4]
+                if (
+                    tw_xoff < xoff + xsize
+                    and xoff < tw_xoff + tw_xsize
+                    and tw_yoff < yoff + ysize
+                    and yoff < tw_yoff + tw_ysize
+                ):
+                    chunk_copies.append((fi, s_band_n, t_band_n, window))
+        # The sources are composited with the first valid pixel winning,
+        # so that the reading of hidden sources can be skipped: for the last
+        # one to win, they are processed in reverse order.
+        if composite == "last":
+            chunk_copies.reverse()
+        return chunk_copies
+
+    chunks = []
+    for chunk in get_chunk_windows(t_fh, chunk_size):
+        chunk_copies = get_chunk_copies(chunk)
+        if chunk_copies or init_values is not None:
+            chunks.append((chunk, chunk_copies))
+
+    def composite_chunk(chunk, chunk_copies, dataset_cache):
+        import numpy as np
+
+        cxoff, cyoff, cxsize, cysize = chunk
+        if init_values is not None:
+            t_bands = range(1, t_fh.RasterCount + 1)
+        else:
+            t_bands = sorted(set(t_band_n for _, _, t_band_n, _ in chunk_copies))
+        buffers = {}
+        covered = {}
+        for t_band_n in t_bands:
+            buffers[t_band_n] = np.empty((cysize, cxsize), dtype=dtypes[t_band_n - 1])
+            covered[t_band_n] = np.zeros((cysize, cxsize), dtype=bool)
+
+        for fi, s_band_n, t_band_n, window in chunk_copies:
+            tw_xoff, tw_yoff, tw_xsize, tw_ysize = window[0:4]
+            sw_xoff, sw_yoff, sw_xsize, sw_ysize = window[4:8]
+
+            # part of the target window within the chunk
+            xoff = max(tw_xoff, cxoff)
+            yoff = max(tw_yoff, cyoff)
+            xend = min(tw_xoff + tw_xsize, cxoff + cxsize)
+            yend = min(tw_yoff + tw_ysize, cyoff + cysize)
+
+            # corresponding source window, with non integer coordinates when
+            # the resolutions differ
+            x_ratio = sw_xsize / tw_xsize
+            y_ratio = sw_ysize / tw_ysize
+            s_xoff = sw_xoff + (xoff - tw_xoff) * x_ratio
+            s_yoff = sw_yoff + (yoff - tw_yoff) * y_ratio
+            s_xsize = (xend - xoff) * x_ratio
+            s_ysize = (yend - yoff) * y_ratio
+
+            if verbose != 0:
+                print(
+                    "Copy %g,%g,%g,%g to %d,%d,%d,%d."
+                    % (
+                        s_xoff,
+                        s_yoff,
+                        s_xsize,
+                        s_ysize,
+                        xoff,
+                        yoff,
+                        xend - xoff,
+                        yend - yoff,
+                    )
+                )
+
+            window_slice = (
+                slice(yoff - cyoff, yend - cyoff),
+                slice(xoff - cxoff, xend - cxoff),
+            )
+            raster_copy_into_buffer(
+                dataset_cache.get(fi.filename),
+                s_xoff,
+                s_yoff,
+                s_xsize,
+                s_ysize,
+                s_band_n,
+                buffers[t_band_n][window_slice],
+                covered[t_band_n][window_slice],
+                nodata_arg,
+            )
+
+        if init_values is not None:
+            for t_band_n, buffer in buffers.items():
+                np.copyto(
+                    buffer,
+                    init_arrays[t_band_n - 1],
+                    where=~covered[t_band_n],
+                    casting="unsafe",
+                )
+            covered = None
+        return buffers, covered
+
+    def write_chunk(chunk, result):
+        import numpy as np
+
+        buffers, covered = result
+        for t_band_n, buffer in buffers.items():
+            t_band = t_fh.GetRasterBand(t_band_n)
+            if covered is not None and not covered[t_band_n].all():
+                # keep the existing target pixels where no source is valid
+                np.copyto(
+                    buffer,
+                    t_band.ReadAsArray(*chunk, buf_type=t_band.DataType),
+                    where=~covered[t_band_n],
+                    casting="unsafe",
+                )
+            t_band.WriteArray(buffer, chunk[0], chunk[1])
+
+    def chunk_done(chunk_idx):
+        if progress_callback is not None:
+            progress_callback((chunk_idx + 1) / float(len(chunks)))
+
+    if num_threads <= 1 or len(chunks) <= 1:
+        dataset_cache = DatasetCache(max_open_datasets)
+        for chunk_idx, (chunk, chunk_copies) in enumerate(chunks):
+            write_chunk(chunk, composite_chunk(chunk, chunk_copies, dataset_cache))
+            chunk_done(chunk_idx)
+        dataset_cache.clear()
+        return 1
+
+    thread_data = threading.local()
+    thread_caches = []
+    thread_caches_lock = threading.Lock()
+
+    @enable_gdal_exceptions
+    def composite_chunk_in_thread(chunk, chunk_copies):
+        dataset_cache = getattr(thread_data, "dataset_cache", None)
+        if dataset_cache is None:
+            dataset_cache = DatasetCache(max_open_datasets // num_threads)
+            thread_data.dataset_cache = dataset_cache
+            with thread_caches_lock:
+                thread_caches.append(dataset_cache)
+        return composite_chunk(chunk, chunk_copies, dataset_cache)
+
+    # limit the number of chunks held in memory
+    max_pending = 2 * num_threads
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending = collections.deque()
+        try:
+            for chunk_idx, (chunk, chunk_copies) in enumerate(chunks):
+                pending.append(
+                    (
+                        chunk_idx,
+                        chunk,
+                        executor.submit(composite_chunk_in_thread, chunk, chunk_copies),
+                    )
+                )
+                if len(pending) >= max_pending:
+                    chunk_done_idx, done_chunk, future = pending.popleft()
+                    write_chunk(done_chunk, future.result())
+                    chunk_done(chunk_done_idx)
+            while pending:
+                chunk_done_idx, done_chunk, future = pending.popleft()
+                write_chunk(done_chunk, future.result())
+                chunk_done(chunk_done_idx)
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+    for dataset_cache in thread_caches:
+        dataset_cache.clear()
+
+    return 1
+
+
+# =============================================================================
+
+
+def names_to_fileinfos(names, cache_filename=None):
     """
     Translate a list of GDAL filenames, into file_info objects.
 
     names -- list of valid GDAL dataset names.
 
+    cache_filename -- name of a JSON file caching the information of the
+    files, so that the unchanged ones (same modification time and size)
+    don't need to be opened again. It is created or updated if needed.
+
     Returns a list of file_info objects.  There may be less file_info objects
     than names if some of the names could not be opened as GDAL files.
     """
 
+    cache = None
+    if cache_filename is not None:
+        cache = {}
+        try:
+            with open(cache_filename, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            pass
+    new_cache = {}
+
     file_infos = []
     for name in names:
         fi = file_info()
+        if cache is not None:
+            signature = get_file_signature(name)
+            entry = cache.get(name)
+            if (
+                signature is not None
+                and entry is not None
+                and entry.get("signature") == signature
+            ):
+                fi.init_from_dict(entry)
+                file_infos.append(fi)
+                new_cache[name] = entry
+                continue
         if fi.init_from_name(name) == 1:
             file_infos.append(fi)
+            if cache is not None and signature is not None:
+                entry = fi.to_dict()
+                entry["signature"] = signature
+                new_cache[name] = entry
+
+    if cache is not None and new_cache != cache:
+        with open(cache_filename, "w") as f:
+            json.dump(new_cache, f)
 
     return file_infos
 
 
+def get_file_signature(filename):
+    """
+    Returns a [modification time, size] list identifying the current version
+    of a file, or None if it can't be determined.
+    """
+    stat = gdal.VSIStatL(filename)
+    if stat is None or not stat.IsFile():
+        return None
+    return [stat.mtime, stat.size]
+
+
+# =============================================================================
+
+
+class FootprintIndex:
+    """
+    A spatial index of the extents of file_info objects.
+
+    Each file is registered in the cells of a regular grid covering its
+    extent, the size of the cells being the median size of the files, so
+    that a query only tests the files registered in the cells it covers.
+    """
+
+    # files covering more cells are tested by all the queries
+    max_cells_per_file = 256
+
+    def __init__(self, file_infos):
+        self.file_infos = list(file_infos)
+        self.extents = [fi.get_extent() for fi in self.file_infos]
+        self.cells = {}
+        self.large = []
+        if not self.file_infos:
+            return
+
+        self.minx = min(extent[0] for extent in self.extents)
+        self.miny = min(extent[1] for extent in self.extents)
+        widths = sorted(extent[2] - extent[0] for extent in self.extents)
+        heights = sorted(extent[3] - extent[1] for extent in self.extents)
+        self.cell_xsize = widths[len(widths) // 2] or 1.0
+        self.cell_ysize = heights[len(heights) // 2] or 1.0
+
+        for idx, extent in enumerate(self.extents):
+            x0, y0, x1, y1 = self.get_cell_range(extent)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > self.max_cells_per_file:
+                self.large.append(idx)
+                continue
+            for y in range(y0, y1 + 1):
+                for x in range(x0, x1 + 1):
+                    self.cells.setdefault((x, y), []).append(idx)
+
+    def get_cell_range(self, extent):
+        minx, miny, maxx, maxy = extent
+        return (
+            int(math.floor((minx - self.minx) / self.cell_xsize)),
+            int(math.floor((miny - self.miny) / self.cell_ysize)),
+            int(math.floor((maxx - self.minx) / self.cell_xsize)),
+            int(math.floor((maxy - self.miny) / self.cell_ysize)),
+        )
+
+    def query(self, minx, miny, maxx, maxy):
+        """
+        Returns the file_info objects whose extent intersects (or touches)
+        the passed one, in their original order.
+        """
+        if not self.file_infos:
+            return []
+
+        x0, y0, x1, y1 = self.get_cell_range((minx, miny, maxx, maxy))
+        candidates = set(self.large)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self.cells):
+            for (x, y), idxs in self.cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    candidates.update(idxs)
+        else:
+            for y in range(y0, y1 + 1):
+                for x in range(x0, x1 + 1):
+                    candidates.update(self.cells.get((x, y), ()))
+
+        result = []
+        for idx in sorted(candidates):
+            extent = self.extents[idx]
+            if (
+                extent[0] <= maxx
+                and minx <= extent[2]
+                and extent[1] <= maxy
+                and miny <= extent[3]
+            ):
+                result.append(self.file_infos[idx])
+        return result
+
+
 # *****************************************************************************
 
 
@@ -267,35 +784,83 @@ class file_info:
 
         return 1
 
+    def to_dict(self):
+        """Returns the information of the file as a JSON serializable dict."""
+        ct = None
+        if self.ct is not None:
+            ct = {
+                "interpretation": self.ct.GetPaletteInterpretation(),
+                "entries": [
+                    list(self.ct.GetColorEntry(i)) for i in range(self.ct.GetCount())
+                ],
+            }
+        return {
+            "filename": self.filename,
+            "bands": self.bands,
+            "xsize": self.xsize,
+            "ysize": self.ysize,
+            "band_type": self.band_type,
+            "projection": self.projection,
+            "geotransform": list(self.geotransform),
+            "ct": ct,
+        }
+
+    def init_from_dict(self, d):
+        """
+        Initialize file_info from a dict returned by to_dict()
+
+        Returns 1.
+        """
+        self.filename = d["filename"]
+        self.bands = d["bands"]
+        self.xsize = d["xsize"]
+        self.ysize = d["ysize"]
+        self.band_type = d["band_type"]
+        self.projection = d["projection"]
+        self.geotransform = tuple(d["geotransform"])
+        self.ulx = self.geotransform[0]
+        self.uly = self.geotransform[3]
+        self.lrx = self.ulx + self.geotransform[1] * self.xsize
+        self.lry = self.uly + self.geotransform[5] * self.ysize
+
+        self.ct = None
+        if d["ct"] is not None:
+            self.ct = gdal.ColorTable(d["ct"]["interpretation"])
+            for i, entry in enumerate(d["ct"]["entries"]):
+                self.ct.SetColorEntry(i, tuple(entry))
+
+        return 1
+
+    def get_extent(self):
+        """Returns the (minx, miny, maxx, maxy) extent of the file."""
+        return (
+            min(self.ulx, self.lrx),
+            min(self.uly, self.lry),
+            max(self.ulx, self.lrx),
+            max(self.uly, self.lry),
+        )
+
     def report(self):
         print("Filename: " + self.filename)
         print("File Size: %dx%dx%d" % (self.xsize, self.ysize, self.bands))
         print("Pixel Size: %f x %f" % (self.geotransform[1], self.geotransform[5]))
         print("UL:(%f,%f)   LR:(%f,%f)" % (self.ulx, self.uly, self.lrx, self.lry))
 
-    def copy_into(self, t_fh, s_band=1, t_band=1, nodata_arg=None, verbose=0):
+    def get_windows(self, t_geotransform, t_xsize, t_ysize):
         """
-        Copy this files image into target file.
+        Compute the overlap area of this file and of a target raster.
 
-        This method will compute the overlap area of the file_info objects
-        file, and the target gdal.Dataset object, and copy the image data
-        for the common window area.  It is assumed that the files are in
-        a compatible projection ... no checking or warping is done.  However,
-        if the destination file is a different resolution, or different
-        image pixel type, the appropriate resampling and conversions will
-        be done (using normal GDAL promotion/demotion rules).
+        t_geotransform -- geotransform of the target raster.
+        t_xsize, t_ysize -- dimensions of the target raster.
 
-        t_fh -- gdal.Dataset object for the file into which some or all
-        of this file may be copied.
-
-        Returns 1 on success (or if nothing needs to be copied), and zero one
-        failure.
+        Returns a (tw_xoff, tw_yoff, tw_xsize, tw_ysize, sw_xoff, sw_yoff,
+        sw_xsize, sw_ysize) tuple with the target and source windows in pixel
+        coordinates, or None if they don't intersect.
         """
-        t_geotransform = t_fh.GetGeoTransform()
         t_ulx = t_geotransform[0]
         t_uly = t_geotransform[3]
-        t_lrx = t_geotransform[0] + t_fh.RasterXSize * t_geotransform[1]
-        t_lry = t_geotransform[3] + t_fh.RasterYSize * t_geotransform[5]
+        t_lrx = t_geotransform[0] + t_xsize * t_geotransform[1]
+        t_lry = t_geotransform[3] + t_ysize * t_geotransform[5]
 
         # figure out intersection region
         tgw_ulx = max(t_ulx, self.ulx)
@@ -309,11 +874,11 @@ class file_info:
 
         # do they even intersect?
         if tgw_ulx >= tgw_lrx:
-            return 1
+            return None
         if t_geotransform[5] < 0 and tgw_uly <= tgw_lry:
-            return 1
+            return None
         if t_geotransform[5] > 0 and tgw_uly >= tgw_lry:
-            return 1
+            return None
 
         # compute target window in pixel coordinates.
         tw_xoff = int((tgw_ulx - t_geotransform[0]) / t_geotransform[1] + 0.1)
@@ -326,7 +891,7 @@ class file_info:
         )
 
         if tw_xsize < 1 or tw_ysize < 1:
-            return 1
+            return None
 
         # Compute source window in pixel coordinates.
         sw_xoff = int((tgw_ulx - self.geotransform[0]) / self.geotransform[1] + 0.1)
@@ -339,7 +904,44 @@ class file_info:
         )
 
         if sw_xsize < 1 or sw_ysize < 1:
+            return None
+
+        return (
+            tw_xoff,
+            tw_yoff,
+            tw_xsize,
+            tw_ysize,
+            sw_xoff,
+            sw_yoff,
+            sw_xsize,
+            sw_ysize,
+        )
+
+    def copy_into(self, t_fh, s_band=1, t_band=1, nodata_arg=None, verbose=0):
+        """
+        Copy this files image into target file.
+
+        This method will compute the overlap area of the file_info objects
+        file, and the target gdal.Dataset object, and copy the image data
+        for the common window area.  It is assumed that the files are in
+        a compatible projection ... no checking or warping is done.  However,
+        if the destination file is a different resolution, or different
+        image pixel type, the appropriate resampling and conversions will
+        be done (using normal GDAL promotion/demotion rules).
+
+        t_fh -- gdal.Dataset object for the file into which some or all
+        of this file may be copied.
+
+        Returns 1 on success (or if nothing needs to be copied), and zero one
+        failure.
+        """
+        windows = self.get_windows(
+            t_fh.GetGeoTransform(), t_fh.RasterXSize, t_fh.RasterYSize
+        )
+        if windows is None:
             return 1
+        tw_xoff, tw_yoff, tw_xsize, tw_ysize = windows[0:4]
+        sw_xoff, sw_yoff, sw_xsize, sw_ysize = windows[4:8]
 
         # Open the source file, and copy the selected region.
         s_fh = gdal.Open(self.filename)
@@ -383,7 +985,19 @@ def Usage(isError):
         file=f,
     )
     print(
-        "                     [-ot <datatype>] [-createonly] <input_file> [<input_file>]...",
+        "                     [-ot <datatype>] [-createonly]",
+        file=f,
+    )
+    print(
+        "                     [-threads <n>|ALL_CPUS] [-chunk_size <pixels>] [-composite first|last]",
+        file=f,
+    )
+    print(
+        "                     [-header_cache <filename>]",
+        file=f,
+    )
+    print(
+        "                     <input_file> [<input_file>]...",
         file=f,
     )
     print("                     [--help-general]", file=f)
@@ -414,6 +1028,10 @@ def _gdal_merge(argv=None):
     band_type = None
     createonly = 0
     bTargetAlignedPixels = False
+    num_threads = None
+    chunk_size = None
+    header_cache = None
+    composite = None
     start_time = time.time()
 
     if argv is None:
@@ -489,6 +1107,25 @@ def _gdal_merge(argv=None):
         elif arg == "-tap":
             bTargetAlignedPixels = True
 
+        elif arg == "-threads":
+            i = i + 1
+            num_threads = get_num_threads(argv[i])
+
+        elif arg == "-chunk_size":
+            i = i + 1
+            chunk_size = int(argv[i])
+
+        elif arg == "-composite":
+            i = i + 1
+            composite = argv[i].lower()
+            if composite not in ("first", "last"):
+                print("Invalid value for -composite: %s" % argv[i])
+                return Usage(isError=True)
+
+        elif arg == "-header_cache":
+            i = i + 1
+            header_cache = argv[i]
+
         elif arg == "-ul_lr":
             ulx = float(argv[i + 1])
             uly = float(argv[i + 2])
@@ -526,7 +1163,7 @@ def _gdal_merge(argv=None):
         return 1
 
     # Collect information on all the source files.
-    file_infos = names_to_fileinfos(names)
+    file_infos = names_to_fileinfos(names, header_cache)
 
     if ulx is None:
         ulx = file_infos[0].ulx
@@ -604,15 +1241,67 @@ def _gdal_merge(argv=None):
             t_fh.GetRasterBand(i + 1).SetNoDataValue(a_nodata)
 
     # Do we need to pre-initialize the whole mosaic file to some value?
+    init_values = None
     if pre_init is not None:
         if t_fh.RasterCount <= len(pre_init):
-            for i in range(t_fh.RasterCount):
-                t_fh.GetRasterBand(i + 1).Fill(pre_init[i])
+            init_values = pre_init[0 : t_fh.RasterCount]
         elif len(pre_init) == 1:
-            for i in range(t_fh.RasterCount):
-                t_fh.GetRasterBand(i + 1).Fill(pre_init[0])
+            init_values = pre_init * t_fh.RasterCount
+
+    # In chunked mode, the initial values are directly composited into the
+    # chunks, which are written only once.
+    chunked = num_threads is not None or chunk_size is not None or composite is not None
+    if init_values is not None and (not chunked or createonly != 0):
+        for i in range(t_fh.RasterCount):
+            t_fh.GetRasterBand(i + 1).Fill(init_values[i])
 
     # Copy data from source files into output file.
+    t_geotransform = t_fh.GetGeoTransform()
+    t_x0 = t_geotransform[0]
+    t_x1 = t_geotransform[0] + t_fh.RasterXSize * t_geotransform[1]
+    t_y0 = t_geotransform[3]
+    t_y1 = t_geotransform[3] + t_fh.RasterYSize * t_geotransform[5]
+    file_index = FootprintIndex(file_infos)
+    intersecting_file_infos = set(
+        file_index.query(
+            min(t_x0, t_x1), min(t_y0, t_y1), max(t_x0, t_x1), max(t_y0, t_y1)
+        )
+    )
+
+    if chunked:
+        if createonly != 0:
+            return 0
+
+        copies = []
+        t_band = 1
+        for fi in file_infos:
+            if separate == 0:
+                for band in range(1, bands + 1):
+                    copies.append((fi, band, band))
+            else:
+                for band in range(1, fi.bands + 1):
+                    copies.append((fi, band, t_band))
+                    t_band = t_band + 1
+
+        if quiet == 0 and verbose == 0:
+            progress(0.0)
+        copy_by_chunks(
+            copies,
+            t_fh,
+            nodata,
+            num_threads=num_threads or 1,
+            chunk_size=chunk_size or 1024,
+            progress_callback=progress if quiet == 0 and verbose == 0 else None,
+            verbose=verbose,
+            file_index=file_index,
+            composite=composite or "last",
+            init_values=init_values,
+        )
+
+        # Force file to be closed.
+        t_fh = None
+        return 0
+
     t_band = 1
 
     if quiet == 0 and verbose == 0:
@@ -637,11 +1326,13 @@ def _gdal_merge(argv=None):
             fi.report()
 
         if separate == 0:
-            for band in range(1, bands + 1):
-                fi.copy_into(t_fh, band, band, nodata, verbose)
+            if fi in intersecting_file_infos:
+                for band in range(1, bands + 1):
+                    fi.copy_into(t_fh, band, band, nodata, verbose)
         else:
             for band in range(1, fi.bands + 1):
-                fi.copy_into(t_fh, band, t_band, nodata, verbose)
+                if fi in intersecting_file_infos:
+                    fi.copy_into(t_fh, band, t_band, nodata, verbose)
                 t_band = t_band + 1
 
         fi_processed = fi_processed + 1
@@ -11,11 +11,14 @@
 #
 # SPDX-License-Identifier: MIT
 ###############################################################################
+import collections
+import concurrent.futures
 import os
 import sys
+import threading
 
 from osgeo import gdal, ogr, osr
-from osgeo_utils.auxiliary.util import enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import enable_gdal_exceptions, get_num_threads
 
 progress = gdal.TermProgress_nocb
 
@@ -51,36 +54,6 @@ class AffineTransformDecorator:
         return [xlist, ylist]
 
 
-class DataSetCache:
-    """A class for caching source tiles"""
-
-    def __init__(self):
-        self.cacheSize = 8
-        self.queue = []
-        self.dict = {}
-
-    def get(self, name):
-
-        if name in self.dict:
-            return self.dict[name]
-        result = gdal.Open(name)
-        if result is None:
-            print("Error opening: %s" % NameError, file=sys.stderr)
-            return 1
-        if len(self.queue) == self.cacheSize:
-            toRemove = self.queue.pop(0)
-            del self.dict[toRemove]
-        self.queue.append(name)
-        self.dict[name] = result
-        return result
-
-    def __del__(self):
-        for dataset in self.dict.values():
-            del dataset
-        del self.queue
-        del self.dict
-
-
 class tile_info:
     """A class holding info how to tile"""
 
@@ -121,9 +94,8 @@ class mosaic_info:
         inputDS -- OGR DataSet representing the tile index
 
         """
-        self.TempDriver = gdal.GetDriverByName("MEM")
         self.filename = filename
-        self.cache = DataSetCache()
+        self.mosaicDS = None
         self.ogrTileIndexDS = inputDS
 
         self.ogrTileIndexDS.GetLayer().ResetReading()
@@ -133,7 +105,7 @@ class mosaic_info:
         imgLocation = feature.GetField(0)
 
         # get the first tile that exists, extract metadata abut mosaic
-        fhInputTile = self.cache.get(imgLocation)
+        fhInputTile = gdal.Open(imgLocation)
 
         self.bands = fhInputTile.RasterCount
         self.band_type = fhInputTile.GetRasterBand(1).DataType
@@ -164,145 +136,57 @@ class mosaic_info:
         self.ysize = abs(int(round((self.uly - self.lry) / self.scaleY)))
 
     def __del__(self):
-        del self.cache
+        del self.mosaicDS
         del self.ogrTileIndexDS
 
     def getDataSet(self, minx, miny, maxx, maxy):
         """
         Find a gdal dataset representing a subset of a mosaic, based on a bounding box. Might overlap multiple tiles of the mosaic
 
+        The returned dataset is a VRT window over a VRT of the whole mosaic,
+        so pixels are only read from the tiles when the dataset is read. The
+        tiles are opened through the dataset pool of the VRT driver, which
+        keeps the most recently used ones opened across calls, within the
+        limits set by the GDAL_MAX_DATASET_POOL_SIZE and
+        GDAL_MAX_DATASET_POOL_RAM_USAGE configuration options.
+
         returns GDALDataset or None
         """
-        self.ogrTileIndexDS.GetLayer().ResetReading()
-        self.ogrTileIndexDS.GetLayer().SetSpatialFilterRect(minx, miny, maxx, maxy)
-        features = []
-        envelope = None
-        # Find the envelope of all features in the dataset
-        while True:
-            feature = self.ogrTileIndexDS.GetLayer().GetNextFeature()
-            if feature is None:
-                break
-            features.append(feature)
-            # on first iteration get envelope of the first feature
-            if envelope is None:
-                envelope = feature.GetGeometryRef().GetEnvelope()
-            else:
-                featureEnv = feature.GetGeometryRef().GetEnvelope()
-                # then expand the envelop as needed based on other features
-                envelope = (
-                    min(featureEnv[0], envelope[0]),
-                    max(featureEnv[1], envelope[1]),
-                    min(featureEnv[2], envelope[2]),
-                    max(featureEnv[3], envelope[3]),
-                )
+        layer = self.ogrTileIndexDS.GetLayer()
+        layer.ResetReading()
+        layer.SetSpatialFilterRect(minx, miny, maxx, maxy)
+        feature = layer.GetNextFeature()
+        layer.SetSpatialFilter(None)
 
-        if envelope is None:
+        if feature is None:
             return None
 
-        # get overlap
-        envelope = (
-            min(minx, envelope[0]),
-            max(maxx, envelope[1]),
-            min(miny, envelope[2]),
-            max(maxy, envelope[3]),
-        )
-
-        self.ogrTileIndexDS.GetLayer().SetSpatialFilter(None)
-
-        # merge tiles
-
-        resultSizeX = int((maxx - minx) / self.scaleX + 0.5)
-        resultSizeY = int((miny - maxy) / self.scaleY + 0.5)
-
-        resultDS = self.TempDriver.Create(
-            "TEMP", resultSizeX, resultSizeY, self.bands, self.band_type, []
-        )
-        resultDS.SetGeoTransform([minx, self.scaleX, 0, maxy, 0, self.scaleY])
-
-        for bandNr in range(1, self.bands + 1):
-            t_band = resultDS.GetRasterBand(bandNr)
-            if self.nodata is not None:
-                t_band.Fill(self.nodata)
-                t_band.SetNoDataValue(self.nodata)
-
-        # for each tile in the index, find its overlap (if any) with the requested bbox, then add it to the returned GDAL dataset if needed.
-        for feature in features:
-            featureName = feature.GetField(0)
-            sourceDS = self.cache.get(featureName)
-            dec = AffineTransformDecorator(sourceDS.GetGeoTransform())
-
-            dec.lrx = dec.ulx + sourceDS.RasterXSize * dec.scaleX
-            dec.lry = dec.uly + sourceDS.RasterYSize * dec.scaleY
-
-            # Find the intersection region
-            tgw_ulx = max(dec.ulx, minx)
-            tgw_lrx = min(dec.lrx, maxx)
-            if self.scaleY < 0:
-                tgw_uly = min(dec.uly, maxy)
-                tgw_lry = max(dec.lry, miny)
-            else:
-                tgw_uly = max(dec.uly, maxy)
-                tgw_lry = min(dec.lry, miny)
-
-            # Compute source window in pixel coordinates.
-            sw_xoff = int((tgw_ulx - dec.ulx) / dec.scaleX + 0.5)
-            sw_yoff = int((tgw_uly - dec.uly) / dec.scaleY + 0.5)
-            sw_xsize = (
-                min(sourceDS.RasterXSize, int((tgw_lrx - dec.ulx) / dec.scaleX + 0.5))
-                - sw_xoff
+        if self.mosaicDS is None:
+            # tiles are read in the order of the index, the last one winning
+            # where they overlap, and the area not covered by any tile is set
+            # to nodata
+            layer.ResetReading()
+            self.mosaicDS = gdal.BuildVRT(
+                "",
+                [f.GetField(0) for f in layer],
+                xRes=self.scaleX,
+                yRes=abs(self.scaleY),
+                srcNodata="None",
+                VRTNodata=self.nodata,
             )
-            sw_ysize = (
-                min(sourceDS.RasterYSize, int((tgw_lry - dec.uly) / dec.scaleY + 0.5))
-                - sw_yoff
-            )
-            if sw_xsize <= 0 or sw_ysize <= 0:
-                continue
-
-            # Compute target window in pixel coordinates
-            tw_xoff = int((tgw_ulx - minx) / self.scaleX + 0.5)
-            tw_yoff = int((tgw_uly - maxy) / self.scaleY + 0.5)
-            tw_xsize = (
-                min(resultDS.RasterXSize, int((tgw_lrx - minx) / self.scaleX + 0.5))
-                - tw_xoff
-            )
-            tw_ysize = (
-                min(resultDS.RasterYSize, int((tgw_lry - maxy) / self.scaleY + 0.5))
-                - tw_yoff
-            )
-            if tw_xsize <= 0 or tw_ysize <= 0:
-                continue
-
-            assert tw_xoff >= 0
-            assert tw_yoff >= 0
-            assert sw_xoff >= 0
-            assert sw_yoff >= 0
 
-            for bandNr in range(1, self.bands + 1):
-                s_band = sourceDS.GetRasterBand(bandNr)
-                t_band = resultDS.GetRasterBand(bandNr)
-                if self.ct is not None:
-                    t_band.SetRasterColorTable(self.ct)
-                t_band.SetRasterColorInterpretation(self.ci[bandNr - 1])
-
-                data = s_band.ReadRaster(
-                    sw_xoff,
-                    sw_yoff,
-                    sw_xsize,
-                    sw_ysize,
-                    tw_xsize,
-                    tw_ysize,
-                    self.band_type,
-                )
-                if data is None:
-                    print(gdal.GetLastErrorMsg())
-
-                t_band.WriteRaster(tw_xoff, tw_yoff, tw_xsize, tw_ysize, data)
-
-        return resultDS
+        return gdal.BuildVRT(
+            "",
+            [self.mosaicDS],
+            outputBounds=(minx, miny, maxx, maxy),
+            xRes=self.scaleX,
+            yRes=abs(self.scaleY),
+            srcNodata="None",
+            VRTNodata=self.nodata,
+        )
 
     def closeDataSet(self, memDS):
         del memDS
-        # self.TempDriver.Delete("TEMP")
 
     def report(self):
         print("Filename: " + self.filename)
@@ -383,11 +267,39 @@ def getTargetDir(g, level=-1):
     return g.TargetDir + str(level) + os.sep
 
 
-def tileImage(g, minfo, ti):
+def getTiles(g, minfo, ti, level):
+    """
+    Iterate over the tiles of a level, as
+    (offsetX, offsetY, width, height, tilename, feature_only) tuples
+    """
+    for yIndex in range(1, ti.countTilesY + 1):
+        for xIndex in range(1, ti.countTilesX + 1):
+            offsetY = (yIndex - 1) * (ti.tileHeight - ti.overlap)
+            offsetX = (xIndex - 1) * (ti.tileWidth - ti.overlap)
+            height = ti.tileHeight
+            width = ti.tileWidth
+            if level > 0 or g.UseDirForEachRow:
+                tilename = getTileName(g, minfo, ti, xIndex, yIndex, level)
+            else:
+                tilename = getTileName(g, minfo, ti, xIndex, yIndex)
+
+            if offsetX + width > ti.width:
+                width = ti.width - offsetX
+            if offsetY + height > ti.height:
+                height = ti.height - offsetY
+
+            feature_only = g.Resume and os.path.exists(tilename)
+            yield offsetX, offsetY, width, height, tilename, feature_only
+
+
+def tileImage(g, minfo, ti, pyramidStream=None):
     """
 
     Tile image in mosaicinfo minfo  based on tileinfo ti
 
+    If pyramidStream is not None, the created tiles are given to it to build
+    the first pyramid level.
+
     returns list of created tiles
 
     """
@@ -401,38 +313,28 @@ def tileImage(g, minfo, ti):
         g.TileIndexDriverTyp,
     )
 
-    yRange = list(range(1, ti.countTilesY + 1))
-    xRange = list(range(1, ti.countTilesX + 1))
-
-    if not g.Quiet and not g.Verbose:
-        progress(0.0)
-        processed = 0
-        total = len(xRange) * len(yRange)
-
-    for yIndex in yRange:
-        for xIndex in xRange:
-            offsetY = (yIndex - 1) * (ti.tileHeight - ti.overlap)
-            offsetX = (xIndex - 1) * (ti.tileWidth - ti.overlap)
-            height = ti.tileHeight
-            width = ti.tileWidth
-            if g.UseDirForEachRow:
-                tilename = getTileName(g, minfo, ti, xIndex, yIndex, 0)
-            else:
-                tilename = getTileName(g, minfo, ti, xIndex, yIndex)
-
-            if offsetX + width > ti.width:
-                width = ti.width - offsetX
-            if offsetY + height > ti.height:
-                height = ti.height - offsetY
+    showProgress = not g.Quiet and not g.Verbose
+    total = ti.countTilesX * ti.countTilesY
 
-            feature_only = g.Resume and os.path.exists(tilename)
-            createTile(
-                g, minfo, offsetX, offsetY, width, height, tilename, OGRDS, feature_only
-            )
+    def tileDone(processed):
+        if showProgress:
+            progress(processed / float(total))
 
-            if not g.Quiet and not g.Verbose:
-                processed += 1
-                progress(processed / float(total))
+    if showProgress:
+        progress(0.0)
+    if pyramidStream is None:
+        createTiles(g, minfo, getTiles(g, minfo, ti, 0), OGRDS, createTile, tileDone)
+    else:
+        createTiles(
+            g,
+            minfo,
+            getTiles(g, minfo, ti, 0),
+            OGRDS,
+            createTile,
+            tileDone,
+            pyramidStream.addTile,
+        )
+        pyramidStream.finish()
 
     if g.TileIndexName is not None:
         if g.UseDirForEachRow and not g.PyramidOnly:
@@ -520,13 +422,24 @@ def _renameDataset(g, oldName, newName):
 
 
 def createPyramidTile(
-    g, levelMosaicInfo, offsetX, offsetY, width, height, tileName, OGRDS, feature_only
+    g,
+    levelMosaicInfo,
+    offsetX,
+    offsetY,
+    width,
+    height,
+    tileName,
+    OGRDS,
+    feature_only,
+    tileData=None,
 ):
     """
     Create an individual tile for the pyramids.
 
     The levelMosaicInfo object contains data about the mosaic at a given pyramid level.
 
+    If tileData is a list, the pixels of the created tile are appended to it.
+
     Returns None if successful and return 1 if there is an error
     """
     temp_tilename = _createTempFileName(tileName)
@@ -604,6 +517,9 @@ def createPyramidTile(
 
     levelMosaicInfo.closeDataSet(s_fh)
 
+    if tileData is not None:
+        tileData.append(t_fh.ReadRaster())
+
     # move the temporary dataset to the final location and path
     if g.MemDriver is None:
         t_fh.FlushCache()
@@ -631,7 +547,16 @@ def createPyramidTile(
 
 
 def createTile(
-    g, minfo, offsetX, offsetY, width, height, tilename, OGRDS, feature_only
+    g,
+    minfo,
+    offsetX,
+    offsetY,
+    width,
+    height,
+    tilename,
+    OGRDS,
+    feature_only,
+    tileData=None,
 ):
     """
     Create add a vector feature representing the tile to the index, then recreate the
@@ -646,6 +571,7 @@ def createTile(
         tilename (str): The name of the tile.
         OGRDS (DataSource): The OGR DataSource object containing the tile index
         feature_only (bool): Whether to only generate features.
+        tileData (list): If not None, the pixels of the created tile are appended to it.
 
     """
     temp_tilename = _createTempFileName(tilename)
@@ -721,6 +647,9 @@ def createTile(
 
     minfo.closeDataSet(s_fh)
 
+    if tileData is not None:
+        tileData.append(t_fh.ReadRaster())
+
     if g.MemDriver is None:
         t_fh.FlushCache()
     else:
@@ -746,6 +675,98 @@ def createTile(
         )
 
 
+class PendingTileIndex:
+    """
+    Stand-in for the tile index passed to createTile() and createPyramidTile()
+    by worker threads, collecting the features of the created tiles, so that
+    they are added to the shared tile index by the main thread
+    """
+
+    def __init__(self):
+        self.features = []
+
+
+def createTiles(
+    g, minfo, tiles, OGRDS, createFunction, tileDone=None, tileCreated=None
+):
+    """
+    Create tiles with createTile() or createPyramidTile()
+
+    Args:
+        g (RetileGlobals): object with global script variables
+        minfo (mosaic_info): mosaic_info object of the source tiles
+        tiles (iterable): (offsetX, offsetY, width, height, tilename, feature_only) tuples
+        OGRDS (DataSource): The OGR DataSource object containing the tile index
+        createFunction (callable): createTile or createPyramidTile
+        tileDone (callable): called with the number of processed tiles
+        tileCreated (callable): called with each tile and the list of the
+            pixels of the created tile, empty if it was not created
+
+    With several threads (-threads), tiles are created concurrently, each
+    thread reading the source tiles through its own mosaic_info, that is its
+    own copy of their tile index and its own cache of opened datasets. The
+    features of the created tiles are added to OGRDS by the calling thread,
+    in the order of the tiles.
+    """
+
+    if g.Threads <= 1:
+        for processed, tile in enumerate(tiles, 1):
+            tileData = [] if tileCreated else None
+            createFunction(g, minfo, *tile[0:5], OGRDS, tile[5], tileData)
+            if tileCreated:
+                tileCreated(tile, tileData)
+            if tileDone:
+                tileDone(processed)
+        return
+
+    thread_data = threading.local()
+    lock = threading.Lock()
+
+    @enable_gdal_exceptions
+    def createTileInThread(tile):
+        thread_minfo = getattr(thread_data, "minfo", None)
+        if thread_minfo is None:
+            with lock:
+                tileIndexDS = ogr.GetDriverByName(g.TileIndexDriverTyp).CopyDataSource(
+                    minfo.ogrTileIndexDS, ""
+                )
+            thread_minfo = mosaic_info(minfo.filename, tileIndexDS)
+            thread_data.minfo = thread_minfo
+        pendingTileIndex = PendingTileIndex()
+        tileData = [] if tileCreated else None
+        createFunction(g, thread_minfo, *tile[0:5], pendingTileIndex, tile[5], tileData)
+        return tile, pendingTileIndex.features, tileData
+
+    def addFeatures(future):
+        tile, features, tileData = future.result()
+        for location, xlist, ylist in features:
+            addFeature(g.TileIndexFieldName, OGRDS, location, xlist, ylist)
+        if tileCreated:
+            tileCreated(tile, tileData)
+
+    # limit the number of tiles waiting for their features to be added
+    max_pending = 2 * g.Threads
+    processed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=g.Threads) as executor:
+        pending = collections.deque()
+        try:
+            for tile in tiles:
+                pending.append(executor.submit(createTileInThread, tile))
+                while pending and (len(pending) >= max_pending or pending[0].done()):
+                    addFeatures(pending.popleft())
+                    processed += 1
+                    if tileDone:
+                        tileDone(processed)
+            while pending:
+                addFeatures(pending.popleft())
+                processed += 1
+                if tileDone:
+                    tileDone(processed)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
 def createTileIndex(Verbose, dsName, fieldName, srs, driverName):
     with gdal.ExceptionMgr(useExceptions=False):
         OGRDriver = ogr.GetDriverByName(driverName)
@@ -784,6 +805,10 @@ def createTileIndex(Verbose, dsName, fieldName, srs, driverName):
 
 
 def addFeature(TileIndexFieldName, OGRDataSource, location, xlist, ylist):
+    if isinstance(OGRDataSource, PendingTileIndex):
+        OGRDataSource.features.append((location, xlist, ylist))
+        return
+
     OGRLayer = OGRDataSource.GetLayer()
     OGRFeature = ogr.Feature(OGRLayer.GetLayerDefn())
     if OGRFeature is None:
@@ -817,7 +842,24 @@ def closeTileIndex(OGRDataSource):
     OGRDataSource.Close()
 
 
-def buildPyramid(g, minfo, createdTileIndexDS, tileWidth, tileHeight, overlap):
+def buildPyramid(
+    g, minfo, createdTileIndexDS, tileWidth, tileHeight, overlap, pyramidStream=None
+):
+    if pyramidStream is not None:
+        # the levels are built by pyramidStream from the tiles of the level
+        # read from the source, which are the base tiles unless -pyramidOnly
+        if g.PyramidOnly:
+            levelOutputTileInfo = tile_info(
+                int(minfo.xsize / 2),
+                int(minfo.ysize / 2),
+                tileWidth,
+                tileHeight,
+                overlap,
+            )
+            g.LastRowIndx = -1
+            buildPyramidLevel(g, minfo, levelOutputTileInfo, 1, pyramidStream)
+        return
+
     inputDS = createdTileIndexDS
     for level in range(1, g.Levels + 1):
         g.LastRowIndx = -1
@@ -832,13 +874,15 @@ def buildPyramid(g, minfo, createdTileIndexDS, tileWidth, tileHeight, overlap):
         inputDS = buildPyramidLevel(g, levelMosaicInfo, levelOutputTileInfo, level)
 
 
-def buildPyramidLevel(g, levelMosaicInfo, levelOutputTileInfo, level):
+def buildPyramidLevel(
+    g, levelMosaicInfo, levelOutputTileInfo, level, pyramidStream=None
+):
     """
     Build the pyramids at level N and returns an OGR dataset of the tile index at that level
-    """
-    yRange = list(range(1, levelOutputTileInfo.countTilesY + 1))
-    xRange = list(range(1, levelOutputTileInfo.countTilesX + 1))
 
+    If pyramidStream is not None, the created tiles are given to it to build
+    the next level.
+    """
     OGRDS = createTileIndex(
         g.Verbose,
         "TileResult_" + str(level),
@@ -847,48 +891,360 @@ def buildPyramidLevel(g, levelMosaicInfo, levelOutputTileInfo, level):
         g.TileIndexDriverTyp,
     )
 
-    for yIndex in yRange:
-        for xIndex in xRange:
-            offsetY = (yIndex - 1) * (
-                levelOutputTileInfo.tileHeight - levelOutputTileInfo.overlap
-            )
-            offsetX = (xIndex - 1) * (
-                levelOutputTileInfo.tileWidth - levelOutputTileInfo.overlap
-            )
-            height = levelOutputTileInfo.tileHeight
-            width = levelOutputTileInfo.tileWidth
+    tiles = getTiles(g, levelMosaicInfo, levelOutputTileInfo, level)
+    if pyramidStream is None:
+        createTiles(g, levelMosaicInfo, tiles, OGRDS, createPyramidTile)
+    else:
+        createTiles(
+            g,
+            levelMosaicInfo,
+            tiles,
+            OGRDS,
+            createPyramidTile,
+            tileCreated=pyramidStream.addTile,
+        )
+        pyramidStream.finish()
 
-            if offsetX + width > levelOutputTileInfo.width:
-                width = levelOutputTileInfo.width - offsetX
-            if offsetY + height > levelOutputTileInfo.height:
-                height = levelOutputTileInfo.height - offsetY
+    if g.TileIndexName is not None:
+        shapeName = getTargetDir(g, level) + g.TileIndexName
+        copyTileIndexToDisk(g, OGRDS, shapeName)
 
-            tilename = getTileName(
-                g, levelMosaicInfo, levelOutputTileInfo, xIndex, yIndex, level
+    if g.CsvFileName is not None:
+        csvName = getTargetDir(g, level) + g.CsvFileName
+        copyTileIndexToCSV(g, OGRDS, csvName)
+
+    return OGRDS
+
+
+def planTileIndex(g, minfo, ti, level, scale, sourceIndexDS):
+    """
+    Create the tile index of a level as createTile() or createPyramidTile()
+    fill it, but without creating the tiles
+
+    The tiles are cut from the mosaic minfo, whose pixels are scale times
+    smaller than the ones of the tiles, and whose tile index is sourceIndexDS.
+    """
+    OGRDS = createTileIndex(
+        g.Verbose,
+        "TilePlan_" + str(level),
+        g.TileIndexFieldName,
+        g.Source_SRS,
+        g.TileIndexDriverTyp,
+    )
+    sourceLayer = sourceIndexDS.GetLayer()
+    sx = minfo.scaleX * scale
+    sy = minfo.scaleY * scale
+
+    g.LastRowIndx = -1
+    for offsetX, offsetY, width, height, tilename, feature_only in getTiles(
+        g, minfo, ti, level
+    ):
+        dec = AffineTransformDecorator(
+            [minfo.ulx + offsetX * sx, sx, 0, minfo.uly + offsetY * sy, 0, sy]
+        )
+        if not feature_only:
+            # same test as getDataSet(), tiles without data are not created
+            sourceLayer.SetSpatialFilterRect(
+                dec.ulx,
+                dec.uly + height * dec.scaleY,
+                dec.ulx + width * dec.scaleX,
+                dec.uly,
             )
+            sourceLayer.ResetReading()
+            if sourceLayer.GetNextFeature() is None:
+                continue
+        points = dec.pointsFor(width, height)
+        addFeature(g.TileIndexFieldName, OGRDS, tilename, points[0], points[1])
+    sourceLayer.SetSpatialFilter(None)
 
-            feature_only = g.Resume and os.path.exists(tilename)
+    return OGRDS
+
+
+class PyramidLevelStream:
+    """
+    Build a pyramid level from the tiles of the previous level as they are
+    created, instead of reading them back once that level is complete.
+
+    The tiles of the previous level are given to addTile() in the order they
+    are created, and their rows of pixels are kept in memory only until the
+    tiles of this level covering them are created. The object stands for
+    the mosaic_info of the previous level in createPyramidTile().
+    """
+
+    def __init__(
+        self, g, level, filename, gridUlx, gridUly, scaleX, scaleY, sourceIndexDS
+    ):
+        """
+        Initialize the stream of a pyramid level
+
+        g -- object with global script variables
+        level -- pyramid level to build
+        filename -- name of the mosaic, used to name the tiles
+        gridUlx, gridUly -- origin of the offsets of the tiles given to addTile()
+        scaleX, scaleY -- pixel size of the tiles given to addTile()
+        sourceIndexDS -- planned tile index of the previous level
+
+        """
+        self.g = g
+        self.level = level
+        self.filename = filename
+        self.scaleX = scaleX
+        self.scaleY = scaleY
+        self.sourceIndexDS = sourceIndexDS
+        self.nextStream = None
+
+        extent = sourceIndexDS.GetLayer().GetExtent()
+        self.ulx = extent[0]
+        self.uly = extent[3]
+        self.lrx = extent[1]
+        self.lry = extent[2]
+
+        self.xsize = int(round((self.lrx - self.ulx) / self.scaleX))
+        self.ysize = abs(int(round((self.uly - self.lry) / self.scaleY)))
+        self.gridOffsetX = int(round((gridUlx - self.ulx) / self.scaleX))
+        self.gridOffsetY = int(round((gridUly - self.uly) / self.scaleY))
+
+        self.tileInfo = tile_info(
+            int(self.xsize / 2),
+            int(self.ysize / 2),
+            g.TileWidth,
+            g.TileHeight,
+            g.Overlap,
+        )
+        self.plannedIndexDS = planTileIndex(
+            g, self, self.tileInfo, level, 2, sourceIndexDS
+        )
+        self.OGRDS = createTileIndex(
+            g.Verbose,
+            "TileResult_" + str(level),
+            g.TileIndexFieldName,
+            g.Source_SRS,
+            g.TileIndexDriverTyp,
+        )
+
+        # properties of the previous level, read from its first tile
+        self.bands = None
+        self.band_type = None
+        self.projection = None
+        self.nodata = None
+        self.ct = None
+        self.ci = None
+        self.emptyRow = None
+
+        # rows of pixels of the previous level, by row index
+        self.rows = {}
+        # rows of the previous level that no tile given anymore can cover
+        self.completeRows = 0
+        self.tiles = getTiles(g, self, self.tileInfo, level)
+        self.nextTile = next(self.tiles, None)
+
+    def readProperties(self, tilename):
+        fhInputTile = gdal.Open(tilename)
+        self.bands = fhInputTile.RasterCount
+        self.band_type = fhInputTile.GetRasterBand(1).DataType
+        self.projection = fhInputTile.GetProjection()
+        self.nodata = fhInputTile.GetRasterBand(1).GetNoDataValue()
+        ct = fhInputTile.GetRasterBand(1).GetRasterColorTable()
+        if ct is not None:
+            self.ct = ct.Clone()
+        self.ci = [
+            fhInputTile.GetRasterBand(iband + 1).GetRasterColorInterpretation()
+            for iband in range(self.bands)
+        ]
+
+        rowDS = gdal.GetDriverByName("MEM").Create(
+            "", self.xsize, 1, self.bands, self.band_type
+        )
+        if self.nodata is not None:
+            for bandNr in range(1, self.bands + 1):
+                rowDS.GetRasterBand(bandNr).Fill(self.nodata)
+        self.emptyRow = rowDS.ReadRaster()
+
+    def addTile(self, tile, tileData):
+        """
+        Add a tile of the previous level, with the list of its pixels, and
+        create the tiles of this level that it completes
+        """
+        offsetX, offsetY, width, height, tilename, feature_only = tile
+        data = None
+        if tileData:
+            data = tileData[0]
+        elif feature_only:
+            data = gdal.Open(tilename).ReadRaster()
+        if data is not None and self.bands is None:
+            self.readProperties(tilename)
+
+        xoff = self.gridOffsetX + offsetX
+        yoff = self.gridOffsetY + offsetY
+
+        # tiles are given row by row, so the rows above this tile are complete
+        self.completeRows = max(self.completeRows, yoff)
+        self.createTiles()
+
+        if data is not None:
+            self.writeTile(xoff, yoff, width, height, data)
+
+    def writeTile(self, xoff, yoff, width, height, data):
+        dataTypeSize = gdal.GetDataTypeSizeBytes(self.band_type)
+        startX = max(xoff, 0)
+        endX = min(xoff + width, self.xsize)
+        if startX >= endX:
+            return
+        rowSize = (endX - startX) * dataTypeSize
+        for y in range(max(yoff, 0), min(yoff + height, self.ysize)):
+            row = self.rows.get(y)
+            if row is None:
+                row = bytearray(self.emptyRow)
+                self.rows[y] = row
+            for band in range(self.bands):
+                src = (
+                    (band * height + y - yoff) * width + startX - xoff
+                ) * dataTypeSize
+                dst = (band * self.xsize + startX) * dataTypeSize
+                row[dst : dst + rowSize] = data[src : src + rowSize]
+
+    def createTiles(self):
+        """Create the tiles of this level whose rows are complete"""
+        while self.nextTile is not None:
+            tile = self.nextTile
+            offsetX, offsetY, width, height, tilename, feature_only = tile
+            if 2 * (offsetY + height) > self.completeRows:
+                break
+
+            tileData = []
             createPyramidTile(
-                g,
-                levelMosaicInfo,
+                self.g,
+                self,
                 offsetX,
                 offsetY,
                 width,
                 height,
                 tilename,
-                OGRDS,
+                self.OGRDS,
                 feature_only,
+                tileData,
             )
+            if self.nextStream is not None:
+                self.nextStream.addTile(tile, tileData)
 
-    if g.TileIndexName is not None:
-        shapeName = getTargetDir(g, level) + g.TileIndexName
-        copyTileIndexToDisk(g, OGRDS, shapeName)
+            self.nextTile = next(self.tiles, None)
+            if self.nextTile is None:
+                self.rows.clear()
+            else:
+                for y in [y for y in self.rows if y < 2 * self.nextTile[1]]:
+                    del self.rows[y]
 
-    if g.CsvFileName is not None:
-        csvName = getTargetDir(g, level) + g.CsvFileName
-        copyTileIndexToCSV(g, OGRDS, csvName)
+    def finish(self):
+        """Create the remaining tiles, once all tiles of the previous level were given"""
+        self.completeRows = self.ysize
+        self.createTiles()
 
-    return OGRDS
+        g = self.g
+        if g.TileIndexName is not None:
+            shapeName = getTargetDir(g, self.level) + g.TileIndexName
+            copyTileIndexToDisk(g, self.OGRDS, shapeName)
+
+        if g.CsvFileName is not None:
+            csvName = getTargetDir(g, self.level) + g.CsvFileName
+            copyTileIndexToCSV(g, self.OGRDS, csvName)
+
+        if self.nextStream is not None:
+            self.nextStream.finish()
+
+    def getDataSet(self, minx, miny, maxx, maxy):
+        """
+        Return a MEM dataset with the pixels of the previous level in a
+        bounding box, or None if no tile of the previous level overlaps it
+        """
+        layer = self.sourceIndexDS.GetLayer()
+        layer.SetSpatialFilterRect(minx, miny, maxx, maxy)
+        layer.ResetReading()
+        found = layer.GetNextFeature() is not None
+        layer.SetSpatialFilter(None)
+        if not found:
+            return None
+
+        xoff = int((minx - self.ulx) / self.scaleX + 0.5)
+        yoff = int((maxy - self.uly) / self.scaleY + 0.5)
+        resultSizeX = int((maxx - minx) / self.scaleX + 0.5)
+        resultSizeY = int((miny - maxy) / self.scaleY + 0.5)
+        dataTypeSize = gdal.GetDataTypeSizeBytes(self.band_type)
+
+        resultDS = gdal.GetDriverByName("MEM").Create(
+            "", resultSizeX, resultSizeY, self.bands, self.band_type
+        )
+        resultDS.SetGeoTransform([minx, self.scaleX, 0, maxy, 0, self.scaleY])
+        resultDS.SetProjection(self.projection)
+        for band in range(self.bands):
+            start = (band * self.xsize + xoff) * dataTypeSize
+            end = start + resultSizeX * dataTypeSize
+            data = b"".join(
+                self.rows.get(y, self.emptyRow)[start:end]
+                for y in range(yoff, yoff + resultSizeY)
+            )
+            t_band = resultDS.GetRasterBand(band + 1)
+            if self.nodata is not None:
+                t_band.SetNoDataValue(self.nodata)
+            if self.ct is not None:
+                t_band.SetRasterColorTable(self.ct)
+            t_band.SetRasterColorInterpretation(self.ci[band])
+            t_band.WriteRaster(0, 0, resultSizeX, resultSizeY, data)
+
+        return resultDS
+
+    def closeDataSet(self, memDS):
+        del memDS
+
+
+def createPyramidStream(g, minfo, ti):
+    """
+    Plan the tiles read from the source, that are the base tiles, or the
+    tiles of the first pyramid level with -pyramidOnly, and return the
+    PyramidLevelStream building the next levels from them, or None if no
+    level is left to build.
+    """
+    if g.PyramidOnly:
+        level = 1
+        scale = 2
+        levelTileInfo = tile_info(
+            int(minfo.xsize / 2),
+            int(minfo.ysize / 2),
+            g.TileWidth,
+            g.TileHeight,
+            g.Overlap,
+        )
+    else:
+        level = 0
+        scale = 1
+        levelTileInfo = ti
+    if level >= g.Levels:
+        return None
+
+    indexDS = planTileIndex(g, minfo, levelTileInfo, level, scale, minfo.ogrTileIndexDS)
+    gridUlx = minfo.ulx
+    gridUly = minfo.uly
+    scaleX = minfo.scaleX * scale
+    scaleY = minfo.scaleY * scale
+
+    firstStream = None
+    previousStream = None
+    for level in range(level + 1, g.Levels + 1):
+        stream = PyramidLevelStream(
+            g, level, minfo.filename, gridUlx, gridUly, scaleX, scaleY, indexDS
+        )
+        if previousStream is None:
+            firstStream = stream
+        else:
+            previousStream.nextStream = stream
+        previousStream = stream
+
+        indexDS = stream.plannedIndexDS
+        gridUlx = stream.ulx
+        gridUly = stream.uly
+        scaleX = stream.scaleX * 2
+        scaleY = stream.scaleY * 2
+
+    return firstStream
 
 
 def getTileName(g, minfo, ti, xIndex, yIndex, level=-1):
@@ -956,7 +1312,10 @@ def Usage(isError):
     print("        [-csv <fileName> [-csvDelim <delimiter>]]", file=f)
     print("        [-s_srs <srs_def>]  [-pyramidOnly] -levels <numberoflevels>", file=f)
     print("        [-r {near|bilinear|cubic|cubicspline|lanczos}]", file=f)
-    print("        [-useDirForEachRow] [-resume]", file=f)
+    print(
+        "        [-useDirForEachRow] [-resume] [-threads <n>|ALL_CPUS] [-streamPyramid]",
+        file=f,
+    )
     print("        -targetDir <TileDirectory> <input_file> [<input_file>]...", file=f)
     return 2 if isError else 0
 
@@ -1072,6 +1431,11 @@ def main(args=None, g=None):
             g.UseDirForEachRow = True
         elif arg == "-resume":
             g.Resume = True
+        elif arg == "-threads":
+            i += 1
+            g.Threads = get_num_threads(argv[i])
+        elif arg == "-streamPyramid":
+            g.StreamPyramid = True
         elif arg[:1] == "-":
             print("Unrecognized command option: %s" % arg, file=sys.stderr)
             return Usage(isError=True)
@@ -1147,14 +1511,26 @@ def main(args=None, g=None):
         minfo.report()
         ti.report()
 
+    pyramidStream = None
+    if g.StreamPyramid:
+        pyramidStream = createPyramidStream(g, minfo, ti)
+
     if not g.PyramidOnly:
-        dsCreatedTileIndex = tileImage(g, minfo, ti)
+        dsCreatedTileIndex = tileImage(g, minfo, ti, pyramidStream)
         tileIndexDS.Close()
     else:
         dsCreatedTileIndex = tileIndexDS
 
     if g.Levels > 0:
-        buildPyramid(g, minfo, dsCreatedTileIndex, g.TileWidth, g.TileHeight, g.Overlap)
+        buildPyramid(
+            g,
+            minfo,
+            dsCreatedTileIndex,
+            g.TileWidth,
+            g.TileHeight,
+            g.Overlap,
+            pyramidStream,
+        )
 
     if g.Verbose:
         print("FINISHED")
@@ -1188,6 +1564,8 @@ class RetileGlobals:
         "LastRowIndx",
         "UseDirForEachRow",
         "Resume",
+        "Threads",
+        "StreamPyramid",
     ]
 
     def __init__(self):
@@ -1218,6 +1596,8 @@ class RetileGlobals:
         self.LastRowIndx = -1
         self.UseDirForEachRow = False
         self.Resume = False
+        self.Threads = 1
+        self.StreamPyramid = False
 
 
 if __name__ == "__main__":
@@ -29,7 +29,7 @@ Usage: ogr_layer_algebra [--help] [--help-general]
                             -input_ds <path> [-input_lyr <name>]
                             -method_ds <path> [-method_lyr <name>]
                             -output_ds <path> [-output_lyr name] [-overwrite]
-                            [-opt <NAME>=<VALUE>]...
+                            [-opt <NAME>=<VALUE>]... [-threads <n>|ALL_CPUS]
                             [-f <format_name>] [-dsco <NAME>=<VALUE>]... [-lco <NAME>=<VALUE>]...
                             [-input_fields {NONE|ALL|<fld1>,<fl2>,...<fldN>}] [-method_fields {NONE|ALL|<fld1>,<fl2>,...<fldN>}]
                             [-nlt <geom_type>] [-a_srs <srs_def>]""",
@@ -247,6 +247,10 @@ def main(argv=sys.argv):
             i = i + 1
             opt.append(argv[i])
 
+        elif arg == "-threads" and i + 1 < len(argv):
+            i = i + 1
+            opt.append("NUM_THREADS=" + argv[i])
+
         elif arg == "-nlt" and i + 1 < len(argv):
             i = i + 1
             val = argv[i]
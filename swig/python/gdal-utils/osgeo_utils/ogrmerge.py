@@ -13,15 +13,23 @@
 # SPDX-License-Identifier: MIT
 ###############################################################################
 
+import collections
+import concurrent.futures
 import glob
 import os
 import os.path
+import queue
 import sys
-from typing import Optional, Sequence
+import threading
+from typing import Optional, Sequence, Union
 
 from osgeo import gdal, ogr, osr
 from osgeo_utils.auxiliary.base import PathLikeOrStr
-from osgeo_utils.auxiliary.util import GetOutputDriverFor, enable_gdal_exceptions
+from osgeo_utils.auxiliary.util import (
+    GetOutputDriverFor,
+    enable_gdal_exceptions,
+    get_num_threads,
+)
 
 
 def Usage(isError):
@@ -33,7 +41,8 @@ def Usage(isError):
     print("            [-src_geom_type <geom_type_name>[,<geom_type_name>]...]", file=f)
     print("            [-dsco <NAME>=<VALUE>]... [-lco <NAME>=<VALUE>]...", file=f)
     print("            [-s_srs <srs_def>] [-t_srs <srs_def>|-a_srs <srs_def>]", file=f)
-    print("            [-progress] [-skipfailures] [--help-general]", file=f)
+    print("            [-progress] [-skipfailures] [-threads <n>|ALL_CPUS]", file=f)
+    print("            [--help-general]", file=f)
     print("", file=f)
     print("Options specific to -single:", file=f)
     print("            [-field_strategy {FirstLayer|Union|Intersection}]", file=f)
@@ -180,6 +189,7 @@ def process(argv, progress=None, progress_arg=None):
     t_srs = None
     dsco = []
     lco = []
+    num_threads = None
     # WARNING: if adding a new option, make sure to update _gpkg_ogrmerge()
     # optimized code path, or use the general case.
 
@@ -255,6 +265,9 @@ def process(argv, progress=None, progress_arg=None):
         elif arg == "-lco" and i + 1 < len(argv):
             i = i + 1
             lco.append(argv[i])
+        elif arg == "-threads" and i + 1 < len(argv):
+            i = i + 1
+            num_threads = argv[i]
         elif arg == "-src_geom_type" and i + 1 < len(argv):
             i = i + 1
             src_geom_type_names = argv[i].split(",")
@@ -303,6 +316,7 @@ def process(argv, progress=None, progress_arg=None):
         lco=lco,
         progress_callback=progress,
         progress_arg=progress_arg,
+        num_threads=num_threads,
     )
 
 
@@ -838,6 +852,319 @@ def _gpkg_ogrmerge(
     return 0
 
 
+#############################################################################
+
+
+def _put_until_stopped(q, item, stop):
+    """Put an item in a bounded queue, unless stop is set while it is full"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            pass
+
+
+@enable_gdal_exceptions
+def _read_arrow_batches(src_dsname, src_layers, batches, stop):
+    """
+    Read layers of a source dataset as Arrow batches, and put them in the
+    batches queue as (dst_lyr_idx, schema, array, write_options, stream)
+    tuples, followed by None once all the layers have been read.
+    """
+
+    try:
+        src_ds = ogr.Open(src_dsname)
+        for src_lyr_idx, dst_lyr_idx, ignored_fields in src_layers:
+            src_lyr = src_ds.GetLayer(src_lyr_idx)
+            if ignored_fields:
+                src_lyr.SetIgnoredFields(ignored_fields)
+            write_options = []
+            if src_lyr.GetGeomType() != ogr.wkbNone:
+                write_options.append(
+                    "GEOMETRY_NAME=" + (src_lyr.GetGeometryColumn() or "wkb_geometry")
+                )
+            stream = src_lyr.GetArrowStream(["INCLUDE_FID=NO"])
+            schema = stream.GetSchema()
+            while not stop.is_set():
+                array = stream.GetNextRecordBatch()
+                if array is None:
+                    break
+                # The stream is kept alive until the array has been written,
+                # as some drivers require it.
+                _put_until_stopped(
+                    batches,
+                    (dst_lyr_idx, schema, array, write_options, (src_ds, stream)),
+                    stop,
+                )
+    finally:
+        _put_until_stopped(batches, None, stop)
+
+
+def _arrow_ogrmerge(
+    dst_ds,
+    src_datasets: Sequence[str],
+    single_layer: bool,
+    layer_name_template: str,
+    skip_failures: bool,
+    src_geom_types: Sequence[int],
+    field_strategy: Optional[str],
+    a_srs: Optional[str],
+    lco: Sequence[str],
+    num_threads: int,
+    progress_callback: Optional = None,
+    progress_arg: Optional = None,
+):
+    """
+    Merge the source layers into dst_ds, with num_threads threads reading
+    the source datasets concurrently as Arrow batches, and the calling thread
+    writing them in the destination layers, in the order of the sources.
+    """
+
+    # Collect the source layers to merge
+    src_layers = []
+    for src_ds_idx, src_dsname in enumerate(src_datasets):
+        src_ds = ogr.Open(src_dsname)
+        if src_ds is None:
+            print("ERROR: Cannot open %s" % src_dsname, file=sys.stderr)
+            if skip_failures:
+                continue
+            return 1
+        for src_lyr_idx, src_lyr in enumerate(src_ds):
+            if src_geom_types:
+                gt = ogr.GT_Flatten(src_lyr.GetGeomType())
+                if gt not in src_geom_types:
+                    continue
+
+            if src_lyr.GetLayerDefn().GetGeomFieldCount() > 1:
+                print(
+                    "ERROR: Layer %s of %s has several geometry columns, "
+                    "which is not supported with several threads"
+                    % (src_lyr.GetName(), src_dsname),
+                    file=sys.stderr,
+                )
+                return 1
+
+            src_layers.append(
+                (
+                    src_ds_idx,
+                    src_dsname,
+                    src_lyr_idx,
+                    src_lyr.GetName(),
+                    src_lyr.GetLayerDefn(),
+                    src_lyr.GetGeomType(),
+                    src_lyr.GetGeometryColumn(),
+                    src_lyr.GetSpatialRef(),
+                    src_lyr.GetMetadata(),
+                )
+            )
+
+    creation_options = dst_ds.GetDriver().GetMetadataItem("DS_LAYER_CREATIONOPTIONLIST")
+    can_set_geometry_name = (
+        creation_options is not None
+        and '"GEOMETRY_NAME"' in creation_options
+        and not any(opt.upper().startswith("GEOMETRY_NAME=") for opt in lco)
+    )
+
+    def create_layer(layer_name, geom_type, geom_column, srs, field_defns, md):
+        if can_set_geometry_name and geom_type != ogr.wkbNone and geom_column:
+            modified_lco = ["GEOMETRY_NAME=" + geom_column] + lco
+        else:
+            modified_lco = lco
+        if a_srs and geom_type != ogr.wkbNone:
+            srs = osr.SpatialReference()
+            srs.SetFromUserInput(a_srs)
+        lyr = dst_ds.CreateLayer(
+            layer_name, geom_type=geom_type, srs=srs, options=modified_lco
+        )
+        if lyr is None:
+            return None
+        for field_defn in field_defns:
+            if lyr.CreateField(field_defn) != ogr.OGRERR_NONE:
+                return None
+            # Arrow columns are matched by name to the destination fields
+            if lyr.GetLayerDefn().GetFieldIndex(field_defn.GetName()) < 0:
+                print(
+                    "ERROR: Field %s has been renamed in layer %s, which is "
+                    "not supported with several threads"
+                    % (field_defn.GetName(), layer_name),
+                    file=sys.stderr,
+                )
+                return None
+        if md:
+            lyr.SetMetadata(md)
+        return lyr
+
+    def get_field_defns(defn):
+        return [defn.GetFieldDefn(i) for i in range(defn.GetFieldCount())]
+
+    # Create the destination layers, and assign each source layer to one
+    dst_layers = []
+    src_layers_per_ds = {}
+    if single_layer:
+        if not src_layers:
+            return 0
+
+        field_defns = []
+        if field_strategy is not None and EQUAL(field_strategy, "FirstLayer"):
+            field_defns = get_field_defns(src_layers[0][4])
+        elif field_strategy is not None and EQUAL(field_strategy, "Intersection"):
+            common_names = None
+            for src_layer in src_layers:
+                names = set(
+                    field_defn.GetName().lower()
+                    for field_defn in get_field_defns(src_layer[4])
+                )
+                common_names = names if common_names is None else common_names & names
+            field_defns = [
+                field_defn
+                for field_defn in get_field_defns(src_layers[0][4])
+                if field_defn.GetName().lower() in common_names
+            ]
+        else:
+            names = set()
+            for src_layer in src_layers:
+                for field_defn in get_field_defns(src_layer[4]):
+                    if field_defn.GetName().lower() not in names:
+                        names.add(field_defn.GetName().lower())
+                        field_defns.append(field_defn)
+
+        geom_types = set(src_layer[5] for src_layer in src_layers)
+        geom_type = geom_types.pop() if len(geom_types) == 1 else ogr.wkbUnknown
+        geom_column = ""
+        for src_layer in src_layers:
+            if src_layer[5] != ogr.wkbNone:
+                geom_column = src_layer[6]
+                break
+
+        lyr = create_layer(
+            layer_name_template,
+            geom_type,
+            geom_column,
+            src_layers[0][7],
+            field_defns,
+            None,
+        )
+        if lyr is None:
+            print(
+                "ERROR: Cannot create layer %s" % layer_name_template, file=sys.stderr
+            )
+            return 1
+        dst_layers.append(lyr)
+
+        dst_names = set(field_defn.GetName().lower() for field_defn in field_defns)
+        for src_ds_idx, src_dsname, src_lyr_idx, _, defn, _, _, _, _ in src_layers:
+            ignored_fields = [
+                field_defn.GetName()
+                for field_defn in get_field_defns(defn)
+                if field_defn.GetName().lower() not in dst_names
+            ]
+            src_layers_per_ds.setdefault((src_ds_idx, src_dsname), []).append(
+                (src_lyr_idx, 0, ignored_fields)
+            )
+    else:
+        for (
+            src_ds_idx,
+            src_dsname,
+            src_lyr_idx,
+            src_lyr_name,
+            defn,
+            geom_type,
+            geom_column,
+            srs,
+            md,
+        ) in src_layers:
+            layer_name = _build_layer_name_non_single_mode(
+                layer_name_template,
+                src_ds_idx,
+                src_dsname,
+                src_lyr_idx,
+                src_lyr_name,
+                skip_failures,
+            )
+            if layer_name is None:
+                return 1
+            lyr = create_layer(
+                layer_name, geom_type, geom_column, srs, get_field_defns(defn), md
+            )
+            if lyr is None:
+                print("ERROR: Cannot create layer %s" % layer_name, file=sys.stderr)
+                if skip_failures:
+                    continue
+                return 1
+            src_layers_per_ds.setdefault((src_ds_idx, src_dsname), []).append(
+                (src_lyr_idx, len(dst_layers), [])
+            )
+            dst_layers.append(lyr)
+
+    # Read the sources in parallel, and write their batches in order.
+    # Each source has its own bounded queue of batches, so that memory use is
+    # limited whatever the size of the sources.
+    stop = threading.Event()
+
+    def write_batches(src_dsname, future, batches):
+        item = None
+        error = None
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            dst_lyr_idx, schema, array, write_options, _ = item
+            try:
+                if not dst_layers[dst_lyr_idx].WriteArrowBatch(
+                    schema, array, write_options
+                ):
+                    error = gdal.GetLastErrorMsg()
+            except Exception as e:
+                error = str(e)
+            del item, array
+            if error is not None:
+                # drain the batches that the reader may still produce
+                while batches.get() is not None:
+                    pass
+                break
+        if error is None:
+            try:
+                future.result()
+            except Exception as e:
+                error = str(e)
+        if error is not None:
+            print("ERROR: %s: %s" % (src_dsname, error), file=sys.stderr)
+            return skip_failures
+        return True
+
+    sources = list(src_layers_per_ds.items())
+    max_pending = 2 * num_threads
+    processed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending = collections.deque()
+        try:
+            for (_, src_dsname), layers in sources:
+                batches = queue.Queue(maxsize=2)
+                future = executor.submit(
+                    _read_arrow_batches, src_dsname, layers, batches, stop
+                )
+                pending.append((src_dsname, future, batches))
+                while pending and (len(pending) >= max_pending or pending[0][1].done()):
+                    if not write_batches(*pending.popleft()):
+                        return 1
+                    processed += 1
+                    if progress_callback:
+                        progress_callback(processed / len(sources), "", progress_arg)
+            while pending:
+                if not write_batches(*pending.popleft()):
+                    return 1
+                processed += 1
+                if progress_callback:
+                    progress_callback(processed / len(sources), "", progress_arg)
+        finally:
+            stop.set()
+            for _, future, _ in pending:
+                future.cancel()
+
+    return 0
+
+
 def ogrmerge(
     src_datasets: Optional[Sequence[str]] = None,
     dst_filename: Optional[PathLikeOrStr] = None,
@@ -860,6 +1187,7 @@ def ogrmerge(
     lco: Optional[Sequence[str]] = None,
     progress_callback: Optional = None,
     progress_arg: Optional = None,
+    num_threads: Optional[Union[int, str]] = None,
 ):
 
     src_datasets = src_datasets or []
@@ -909,8 +1237,20 @@ def ogrmerge(
         with gdal.ExceptionMgr(useExceptions=False), gdal.quiet_errors():
             return gdal.OpenEx(filename, gdal.OF_VECTOR | gdal.OF_UPDATE)
 
+    # Sources can be read concurrently as Arrow batches when they are written
+    # as they are into new layers
+    num_threads = get_num_threads(num_threads)
+    read_in_parallel = (
+        num_threads > 1
+        and not EQUAL(driver_name, "VRT")
+        and not update
+        and t_srs is None
+        and src_layer_field_name is None
+    )
+
     if (
-        not single_layer
+        not read_in_parallel
+        and not single_layer
         and EQUAL(driver_name, "GPKG")
         and get_vector_file_in_update_no_exception(dst_filename) is None
         and EQUAL(gdal.GetConfigOption("OGR_MERGE_ENABLE_GPKG_OPTIM", "YES"), "YES")
@@ -990,6 +1330,22 @@ def ogrmerge(
             if dst_ds is None:
                 return 1
 
+        if read_in_parallel:
+            return _arrow_ogrmerge(
+                dst_ds,
+                src_datasets,
+                single_layer,
+                layer_name_template,
+                skip_failures,
+                src_geom_types,
+                field_strategy,
+                a_srs,
+                lco,
+                num_threads,
+                progress_callback,
+                progress_arg,
+            )
+
         vrt_filename = "/vsimem/_ogrmerge_.vrt"
     else:
         if gdal.VSIStatL(dst_filename) and not overwrite_ds:
@@ -17,6 +17,9 @@ simply prefixed with "gdalvsi://". For example:
 :since: GDAL 3.11
 """
 
+import bisect
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
 
 from fsspec.registry import register_implementation
@@ -27,7 +30,18 @@ from osgeo import gdal
 
 
 class VSIFileSystem(AbstractFileSystem):
-    """Implementation of AbstractFileSystem for a GDAL Virtual File System"""
+    """Implementation of AbstractFileSystem for a GDAL Virtual File System
+
+    Directory listings can be cached by passing use_listings_cache=True,
+    optionally with listings_expiry_time (in seconds) and max_paths
+    (see fsspec.dircache.DirCache). The cache is disabled by default,
+    since files may be modified through GDAL outside of this object.
+    """
+
+    def __init__(self, *args, use_listings_cache=False, **storage_options):
+        super().__init__(
+            *args, use_listings_cache=use_listings_cache, **storage_options
+        )
 
     @classmethod
     def _get_gdal_path(cls, path):
@@ -58,9 +72,132 @@ class VSIFileSystem(AbstractFileSystem):
     ):
         """Implements AbstractFileSystem._open()"""
 
+        if any(c in mode for c in "wax+"):
+            self.invalidate_cache(path)
         path = self._get_gdal_path(path)
         return gdal.VSIFile(path, mode)
 
+    def _read_ranges(self, path, ranges):
+        """Read a list of (start, end) byte ranges of a single file.
+
+        start and end follow the conventions of AbstractFileSystem.cat_file():
+        they may be None or negative, and are clipped to the file size.
+        The ranges are sorted, and overlapping ones are coalesced, so that
+        all of them are read with a single VSIFReadMultiRangeL() call,
+        which network file systems turn into merged and concurrent
+        range requests.
+        """
+
+        gdal_path = self._get_gdal_path(path)
+        fp = gdal.VSIFOpenL(gdal_path, "rb")
+        if fp is None:
+            raise FileNotFoundError(path)
+        try:
+            if gdal.VSIFSeekL(fp, 0, os.SEEK_END) != 0:
+                raise IOError(f"Cannot get size of {path}")
+            size = gdal.VSIFTellL(fp)
+
+            resolved_ranges = []
+            for start, end in ranges:
+                if start is None:
+                    start = 0
+                elif start < 0:
+                    start = max(size + start, 0)
+                if end is None:
+                    end = size
+                elif end < 0:
+                    end = size + end
+                start = min(start, size)
+                end = max(start, min(end, size))
+                resolved_ranges.append((start, end))
+
+            merged_ranges = []
+            for start, end in sorted(set(resolved_ranges)):
+                if start == end:
+                    continue
+                if merged_ranges and start <= merged_ranges[-1][1]:
+                    merged_ranges[-1][1] = max(merged_ranges[-1][1], end)
+                else:
+                    merged_ranges.append([start, end])
+            if not merged_ranges:
+                return [b""] * len(resolved_ranges)
+
+            data = gdal.VSIFReadMultiRangeL(
+                [start for start, _ in merged_ranges],
+                [end - start for start, end in merged_ranges],
+                fp,
+            )
+            if data is None:
+                raise IOError(f"Cannot read {path}")
+        finally:
+            gdal.VSIFCloseL(fp)
+
+        merged_starts = [start for start, _ in merged_ranges]
+        ret = []
+        for start, end in resolved_ranges:
+            if start == end:
+                ret.append(b"")
+                continue
+            idx = bisect.bisect_right(merged_starts, start) - 1
+            offset = start - merged_starts[idx]
+            ret.append(data[idx][offset : offset + end - start])
+        return ret
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        """Implements AbstractFileSystem.cat_file()"""
+
+        return self._read_ranges(path, [(start, end)])[0]
+
+    def cat_ranges(
+        self, paths, starts, ends, max_gap=None, on_error="return", **kwargs
+    ):
+        """Implements AbstractFileSystem.cat_ranges()
+
+        The ranges of a given file are read with a single VSIFReadMultiRangeL()
+        call, and different files are read concurrently. max_gap is ignored:
+        merging of close ranges is done by GDAL network file systems (see the
+        GDAL_HTTP_MULTIRANGE and GDAL_HTTP_MERGE_CONSECUTIVE_RANGES
+        configuration options).
+        """
+
+        if not isinstance(paths, list):
+            raise TypeError("paths must be a list")
+        if not isinstance(starts, (list, tuple)):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, (list, tuple)):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError("paths, starts and ends must have the same length")
+
+        # Group the ranges by file, keeping track of their index in the output
+        ranges_per_path = {}
+        for idx, (path, start, end) in enumerate(zip(paths, starts, ends)):
+            ranges_per_path.setdefault(path, []).append((idx, start, end))
+
+        def read_path(item):
+            path, path_ranges = item
+            try:
+                data = self._read_ranges(path, [(s, e) for _, s, e in path_ranges])
+            except Exception as e:
+                if on_error != "return":
+                    raise
+                data = [e] * len(path_ranges)
+            return [(idx, d) for (idx, _, _), d in zip(path_ranges, data)]
+
+        if len(ranges_per_path) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(ranges_per_path), gdal.GetNumCPUs())
+            ) as executor:
+                results = list(executor.map(read_path, ranges_per_path.items()))
+        else:
+            results = [read_path(item) for item in ranges_per_path.items()]
+
+        out = [None] * len(paths)
+        for result in results:
+            for idx, data in result:
+                out[idx] = data
+        return out
+
     def info(self, path, **kwargs):
         """Implements AbstractFileSystem.info()"""
 
@@ -96,41 +233,246 @@ class VSIFileSystem(AbstractFileSystem):
 
         return datetime.datetime.fromtimestamp(stat.mtime)
 
-    def ls(self, path, detail=True, **kwargs):
+    @staticmethod
+    def _dir_entry_to_dict(fs_path, entry):
+        """Convert a gdal.DirEntry to a fsspec info dictionary"""
+
+        ret_entry = {
+            "name": fs_path + "/" + entry.name,
+            "type": (
+                "file"
+                if (entry.mode & 32768) != 0
+                else "directory" if (entry.mode & 16384) != 0 else None
+            ),
+        }
+        if ret_entry["type"] == "file":
+            ret_entry["size"] = entry.size if entry.sizeKnown else None
+        if entry.mtimeKnown:
+            ret_entry["mtime"] = entry.mtime
+        return ret_entry
+
+    def ls(self, path, detail=True, refresh=False, **kwargs):
         """Implements AbstractFileSystem.ls()"""
 
         fs_path = self._strip_protocol(path)
+        ret = None
+        if not refresh:
+            try:
+                ret = [dict(entry) for entry in self.dircache[fs_path]]
+            except KeyError:
+                pass
+
+        if ret is None:
+            gdal_path = self._get_gdal_path(path)
+            ret = []
+            directory = gdal.OpenDir(gdal_path, 0)
+            if directory is None:
+                stat = gdal.VSIStatL(gdal_path)
+                if stat is None:
+                    raise FileNotFoundError(path)
+                return [fs_path]
+
+            try:
+                while True:
+                    entry = gdal.GetNextDirEntry(directory)
+                    if entry is None:
+                        break
+                    ret.append(self._dir_entry_to_dict(fs_path, entry))
+            finally:
+                gdal.CloseDir(directory)
+            if self.dircache.use_listings_cache:
+                self.dircache[fs_path] = [dict(entry) for entry in ret]
+
+        if not detail:
+            return [entry["name"] for entry in ret]
+        return ret
+
+    def _list_tree_from_cache(self, fs_path, maxdepth):
+        """Return the directory tree rooted at fs_path from the listings cache,
+        or None if any of its directories is missing from it."""
+
+        tree = {}
+        stack = [(fs_path, 1)]
+        while stack:
+            dirname, depth = stack.pop()
+            try:
+                listing = self.dircache[dirname]
+            except KeyError:
+                return None
+            tree[dirname] = listing
+            if maxdepth is None or depth < maxdepth:
+                stack.extend(
+                    (entry["name"], depth + 1)
+                    for entry in listing
+                    if entry["type"] == "directory"
+                )
+        return tree
+
+    def _list_tree(self, path, maxdepth=None, refresh=False):
+        """Return a dictionary mapping each directory of the tree rooted at
+        path, down to maxdepth levels, to the list of its entries, or None if
+        path is not a directory.
+
+        The tree is listed with a single recursive gdal.OpenDir() call, which
+        on /vsis3/ and similar file systems is a flat paginated listing of
+        all objects under the prefix.
+        """
+
+        fs_path = self._strip_protocol(path)
+        if not refresh:
+            tree = self._list_tree_from_cache(fs_path, maxdepth)
+            if tree is not None:
+                return tree
+
         gdal_path = self._get_gdal_path(path)
-        ret = []
-        directory = gdal.OpenDir(gdal_path)
+        directory = gdal.OpenDir(gdal_path, -1 if maxdepth is None else maxdepth - 1)
         if directory is None:
-            stat = gdal.VSIStatL(gdal_path)
-            if stat is None:
-                raise FileNotFoundError(path)
-            return [fs_path]
+            return None
+
+        tree = {fs_path: []}
+        dir_entries = {}
+
+        def add_directory(rel_name, ret_entry):
+            # Only directories less than maxdepth levels deep are listed
+            if maxdepth is not None and rel_name.count("/") + 1 >= maxdepth:
+                return
+            name = fs_path + "/" + rel_name
+            if name in tree:
+                # Directory already implied by one of its children
+                dir_entries[name].update(ret_entry)
+                return
+            tree[name] = []
+            parent = rel_name.rpartition("/")[0]
+            if parent:
+                # Flat listings may not report intermediate directories
+                add_directory(parent, {"name": fs_path + "/" + parent})
+                parent_entries = tree[fs_path + "/" + parent]
+            else:
+                parent_entries = tree[fs_path]
+            dir_entries[name] = {"name": name, "type": "directory"}
+            dir_entries[name].update(ret_entry)
+            parent_entries.append(dir_entries[name])
 
         try:
             while True:
                 entry = gdal.GetNextDirEntry(directory)
                 if entry is None:
                     break
-
-                ret_entry = {
-                    "name": fs_path + "/" + entry.name,
-                    "type": (
-                        "file"
-                        if (entry.mode & 32768) != 0
-                        else "directory" if (entry.mode & 16384) != 0 else None
-                    ),
-                }
-                if ret_entry["type"] == "file":
-                    ret_entry["size"] = entry.size if entry.sizeKnown else None
-                if entry.mtimeKnown:
-                    ret_entry["mtime"] = entry.mtime
-                ret.append(ret_entry)
+                ret_entry = self._dir_entry_to_dict(fs_path, entry)
+                if ret_entry["type"] == "directory":
+                    add_directory(entry.name, ret_entry)
+                    if ret_entry["name"] in tree:
+                        continue
+                parent = entry.name.rpartition("/")[0]
+                if parent:
+                    add_directory(parent, {"name": fs_path + "/" + parent})
+                    tree[fs_path + "/" + parent].append(ret_entry)
+                else:
+                    tree[fs_path].append(ret_entry)
         finally:
             gdal.CloseDir(directory)
-        return ret
+
+        if self.dircache.use_listings_cache:
+            for dirname, listing in tree.items():
+                self.dircache[dirname] = [dict(entry) for entry in listing]
+        return tree
+
+    def find(self, path, maxdepth=None, withdirs=False, detail=False, **kwargs):
+        """Implements AbstractFileSystem.find()
+
+        All files under path are listed with a single recursive listing
+        (see _list_tree()). AbstractFileSystem.glob() relies on this method.
+        """
+
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+
+        fs_path = self._strip_protocol(path)
+        out = {}
+        tree = self._list_tree(path, maxdepth, refresh=kwargs.get("refresh", False))
+        if tree is None:
+            try:
+                info = self.info(path)
+            except FileNotFoundError:
+                info = None
+            if info and info["type"] == "file":
+                out[fs_path] = info
+        else:
+            if withdirs and fs_path:
+                out[fs_path] = {"name": fs_path, "size": 0, "type": "directory"}
+            for listing in tree.values():
+                for entry in listing:
+                    if withdirs or entry["type"] != "directory":
+                        out[entry["name"]] = entry
+
+        names = sorted(out)
+        if not detail:
+            return names
+        return {name: out[name] for name in names}
+
+    def walk(self, path, maxdepth=None, topdown=True, on_error="omit", **kwargs):
+        """Implements AbstractFileSystem.walk()
+
+        The tree is listed once with a single recursive listing (see
+        _list_tree()), instead of one listing per directory. When topdown
+        is True, directories removed from the yielded dirs are not walked.
+        """
+
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+
+        detail = kwargs.pop("detail", False)
+        tree = self._list_tree(path, maxdepth, refresh=kwargs.get("refresh", False))
+        if tree is None:
+            if on_error == "raise":
+                raise FileNotFoundError(path)
+            if callable(on_error):
+                on_error(FileNotFoundError(path))
+            return
+
+        def walk_tree(dirname):
+            dirs = {}
+            files = {}
+            for entry in tree[dirname]:
+                name = entry["name"].rsplit("/", 1)[-1]
+                if entry["type"] == "directory":
+                    dirs[name] = entry
+                else:
+                    files[name] = entry
+
+            if not detail:
+                dirs = list(dirs)
+                files = list(files)
+
+            if topdown:
+                yield dirname, dirs, files
+
+            for name in list(dirs):
+                subdir = dirname + "/" + name
+                if subdir in tree:
+                    yield from walk_tree(subdir)
+
+            if not topdown:
+                yield dirname, dirs, files
+
+        yield from walk_tree(self._strip_protocol(path))
+
+    def invalidate_cache(self, path=None):
+        """Implements AbstractFileSystem.invalidate_cache()"""
+
+        if path is None:
+            self.dircache.clear()
+            return
+
+        path = self._strip_protocol(path)
+        for key in [k for k in self.dircache if k.startswith(path + "/")]:
+            self.dircache.pop(key, None)
+        while path:
+            self.dircache.pop(path, None)
+            parent = self._parent(path)
+            if parent == path:
+                break
+            path = parent
 
     def mkdir(self, path, create_parents=True, **kwargs):
         """Implements AbstractFileSystem.mkdir()"""
@@ -145,6 +487,7 @@ class VSIFileSystem(AbstractFileSystem):
         gdal_path = self._get_gdal_path(path)
         if gdal.VSIStatL(gdal_path):
             raise FileExistsError(path)
+        self.invalidate_cache(path)
         if create_parents:
             ret = gdal.MkdirRecursive(gdal_path, 0o755)
         else:
@@ -167,6 +510,7 @@ class VSIFileSystem(AbstractFileSystem):
         """Implements AbstractFileSystem._rm()"""
 
         gdal_path = self._get_gdal_path(path)
+        self.invalidate_cache(path)
         ret = -1
         try:
             ret = gdal.Unlink(gdal_path)
@@ -181,6 +525,7 @@ class VSIFileSystem(AbstractFileSystem):
         """Implements AbstractFileSystem.rmdir()"""
 
         gdal_path = self._get_gdal_path(path)
+        self.invalidate_cache(path)
         ret = -1
         try:
             ret = gdal.Rmdir(gdal_path)
@@ -196,6 +541,8 @@ class VSIFileSystem(AbstractFileSystem):
 
         old_path = self._get_gdal_path(path1)
         new_path = self._get_gdal_path(path2)
+        self.invalidate_cache(path1)
+        self.invalidate_cache(path2)
         try:
             if gdal.MoveFile(old_path, new_path) != 0:
                 if gdal.VSIStatL(old_path) is None:
@@ -213,6 +560,7 @@ class VSIFileSystem(AbstractFileSystem):
 
         old_path = self._get_gdal_path(path1)
         new_path = self._get_gdal_path(path2)
+        self.invalidate_cache(path2)
         try:
             if gdal.CopyFile(old_path, new_path) != 0:
                 if gdal.VSIStatL(old_path) is None: